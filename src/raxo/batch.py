@@ -0,0 +1,254 @@
+"""
+Batch Module
+
+This module runs offline question→SQL(→result) jobs over large question lists.
+
+Input is streamed from a JSONL file of {"question": ..., "namespace": ...?} objects or from a CSV
+file with a `question` column, and processed with bounded concurrency. Every finished item is
+appended to the JSONL output as soon as it completes, with the hash of its input line. Re-running
+the same job on the same output resumes it: lines whose hash already has a successful record
+are skipped, so a crash at item 40,000 does not pay again for the first 39,999 LLM calls. An
+item answered without usable SQL, or whose SQL failed to execute, is recorded with an error so
+that a resumed run retries it.
+
+Executed query results are written like the server returns them: at most `max_result_rows` rows,
+with the full `row_count` and a `truncated` flag. Results spilled to disk are only read back for
+that page and closed as soon as it is taken.
+
+Classes:
+    BatchRunner: Runs a batch job with checkpointing, retries and progress reporting.
+
+Usage Example:
+    summary = BatchRunner(raxo, concurrency=16, retries=2).run("questions.jsonl", "results.jsonl")
+
+    # or from the command line, see `raxo.cli`
+    raxo batch --factory myapp.raxo:build questions.csv results.jsonl --concurrency 16
+"""
+
+import csv
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator
+
+from .utils.exceptions import NoTextProvided
+from .utils.result_set import ResultSet, json_default
+from .utils.tracing import RootSpanHook
+
+logger = logging.getLogger(__name__)
+
+# Request outcomes for which `ask` returns an explanation instead of SQL or rows
+_FAILED_OUTCOMES = ("no_sql", "execution_error")
+
+
+def line_hash(line: str) -> str:
+    """Return the checkpoint key of an input line."""
+    return hashlib.sha256(line.strip().encode("utf-8")).hexdigest()[:32]
+
+
+def _read_items(path: str) -> Iterator[dict]:
+    """Yield {"key", "line", "question", "namespace"} items from a JSONL or CSV file."""
+    with open(path, encoding="utf-8", newline="") as file:
+        if path.lower().endswith(".csv"):
+            reader = csv.reader(file)
+            header = next(reader, None) or []
+            if "question" not in header:
+                raise ValueError(f"{path} has no `question` column")
+            for number, row in enumerate(reader, start=2):
+                if not any(row):
+                    continue
+                record = dict(zip(header, row))
+                namespace = json.loads(record["namespace"]) if record.get("namespace") else None
+                yield {"key": line_hash(",".join(row)), "line": number, "question": record["question"],
+                       "namespace": namespace}
+            return
+        for number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if isinstance(record, str):
+                record = {"question": record}
+            yield {"key": line_hash(line), "line": number, "question": record.get("question"),
+                   "namespace": record.get("namespace")}
+
+
+def _count_items(path: str) -> int:
+    with open(path, encoding="utf-8") as file:
+        count = sum(1 for line in file if line.strip())
+    return count - 1 if path.lower().endswith(".csv") and count else count
+
+
+def load_checkpoint(path: str) -> set:
+    """
+    Return the input line hashes already completed in an output file.
+
+    Records with an error are not part of the checkpoint, so they are retried on resume. A last
+    line truncated by a crash is ignored.
+
+    Args:
+        path (str): The JSONL output file.
+
+    Returns:
+        set: The hashes of the completed input lines.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("error") is None:
+                done.add(record["key"])
+    return done
+
+
+class BatchRunner:
+    """
+    Runs a batch job with checkpointing, retries and progress reporting.
+
+    Attributes:
+        raxo (Raxo): The instance answering the questions.
+        concurrency (int): The number of items processed at once.
+        retries (int): The retries of an item raising an exception.
+        backoff (float): The delay before the first retry, doubled for each next retry.
+        progress_interval (float): Seconds between progress log lines.
+        max_result_rows (int): The most rows of an executed query written per item.
+    """
+
+    def __init__(self, raxo, concurrency: int = 8, retries: int = 2, backoff: float = 1.0,
+                 progress_interval: float = 10.0, max_result_rows: int = 10_000):
+        """
+        Initialize an instance of the BatchRunner class.
+
+        Args:
+            raxo (Raxo): The instance answering the questions.
+            concurrency (int): The number of items processed at once. Default is 8.
+            retries (int): The retries of an item raising an exception. Default is 2.
+            backoff (float): Seconds before the first retry, doubled for each next one. Default is 1.
+            progress_interval (float): Seconds between progress log lines. Default is 10.
+            max_result_rows (int): The most rows of an executed query written per item; larger
+                results are truncated and flagged. Default is 10,000.
+        """
+        self.raxo = raxo
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.progress_interval = progress_interval
+        self.max_result_rows = max_result_rows
+        self._hook = RootSpanHook()
+
+    def _process(self, item: dict) -> dict:
+        raxo = self.raxo.with_namespace(item["namespace"]) if item["namespace"] else self.raxo
+        start = time.perf_counter()
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            self._hook.take()
+            try:
+                result = raxo.ask(item["question"])
+                error = None
+                span = self._hook.take()
+                outcome = span.attributes.get("outcome") if span is not None else None
+                if outcome in _FAILED_OUTCOMES:
+                    # Not retried now, the same question would likely fail again; a resumed run retries it
+                    error = f"{outcome}: {result}"
+                break
+            except NoTextProvided as e:
+                # Retrying an empty question cannot succeed
+                result, error = None, f"{type(e).__name__}: {e}"
+                break
+            except Exception as e:
+                logger.warning("Line %s failed (attempt %s): %s", item["line"], attempt + 1, e)
+                result, error = None, f"{type(e).__name__}: {e}"
+        record = {"key": item["key"], "line": item["line"], "question": item["question"],
+                  "namespace": item["namespace"], "result": result, "error": error, "attempts": attempt + 1,
+                  "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)}
+        if isinstance(result, ResultSet):
+            # Only the written page is read back from a spilled result, which is closed right after
+            with result:
+                record.update(result=result.page(0, self.max_result_rows), row_count=len(result),
+                              truncated=len(result) > self.max_result_rows)
+        return record
+
+    def run(self, input_path: str, output_path: str, resume: bool = True) -> dict:
+        """
+        Process every item of an input file not yet completed in the output file.
+
+        Args:
+            input_path (str): The JSONL or CSV question list.
+            output_path (str): The JSONL output, appended to.
+            resume (bool): Whether to skip the items already completed in the output. Default is True.
+
+        Returns:
+            dict: The number of items processed, skipped and failed, the elapsed seconds and the
+            throughput in items per second.
+        """
+        # Reads the outcome of each item's request
+        self.raxo.tracer.add_hook(self._hook)
+        try:
+            return self._run(input_path, output_path, resume)
+        finally:
+            self.raxo.tracer.hooks.remove(self._hook)
+
+    def _run(self, input_path: str, output_path: str, resume: bool) -> dict:
+        done = load_checkpoint(output_path) if resume else set()
+        total = _count_items(input_path)
+        remaining = max(total - len(done), 0)
+        logger.info("%s items, %s already done", total, len(done))
+        self.raxo.warm_up()
+
+        counts = {"processed": 0, "skipped": 0, "failed": 0}
+        start = last_report = time.perf_counter()
+        mode = "a" if resume else "w"
+        if resume and os.path.exists(output_path) and os.path.getsize(output_path):
+            with open(output_path, "rb") as file:
+                file.seek(-1, os.SEEK_END)
+                truncated = file.read(1) != b"\n"
+            if truncated:
+                # Terminate a record cut by a crash, so the next one starts on its own line
+                with open(output_path, "a", encoding="utf-8") as file:
+                    file.write("\n")
+        with open(output_path, mode, encoding="utf-8") as output, \
+                ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="raxo-batch") as executor:
+            pending = set()
+
+            def collect(futures):
+                nonlocal last_report
+                for future in futures:
+                    # Records are only written from this thread
+                    record = future.result()
+                    output.write(json.dumps(record, default=json_default) + "\n")
+                    counts["processed"] += 1
+                    counts["failed"] += record["error"] is not None
+                output.flush()
+                now = time.perf_counter()
+                if now - last_report >= self.progress_interval:
+                    last_report = now
+                    rate = counts["processed"] / (now - start)
+                    eta = (remaining - counts["processed"]) / rate if rate else float("inf")
+                    logger.info("%s/%s items, %.2f items/s, ETA %.0fs, %s failed", counts["processed"], remaining,
+                                rate, eta, counts["failed"])
+
+            for item in _read_items(input_path):
+                if item["key"] in done:
+                    counts["skipped"] += 1
+                    continue
+                # A bounded window of submitted items keeps memory flat on large inputs
+                if len(pending) >= self.concurrency * 2:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                pending.add(executor.submit(self._process, item))
+            collect(wait(pending).done)
+
+        elapsed = time.perf_counter() - start
+        summary = {**counts, "total": total, "elapsed_seconds": round(elapsed, 3),
+                   "items_per_second": round(counts["processed"] / elapsed, 3) if elapsed else None}
+        logger.info("Batch finished: %s", summary)
+        return summary
@@ -0,0 +1,22 @@
+"""
+Benchmarks Module
+
+This module provides an offline benchmark suite for Raxo. Scenarios run against the fakes in
+`raxo.testing`, with configurable latency and jitter injected into the LLM and embedding calls,
+over synthetic schemas from 10 to 100k tables. Results are written to JSON so runs can be compared.
+
+Modules:
+    schema: Synthetic schema and question generators.
+    scenarios: The train, ask, retrieval and memory scenarios.
+    stats: Percentile helpers used to summarize latencies.
+    runner: Runs scenarios, writes JSON results and compares runs.
+    evaluation: Scores configurations for execution-match accuracy, latency and cost.
+
+Usage Example:
+    python -m raxo.benchmarks --output before.json
+    # ... change the code ...
+    python -m raxo.benchmarks --output after.json --compare before.json
+    python -m raxo.benchmarks.evaluation --gold gold.jsonl --database warehouse.db --configs configs.json
+"""
+
+from .runner import run_benchmarks
@@ -0,0 +1,316 @@
+"""
+Evaluation Module
+
+This module measures accuracy against latency and cost for Raxo configurations. A gold set of
+questions with their expected SQL (or expected result rows) is run through Raxo in parallel,
+every generated query is executed, and execution-match accuracy is reported next to latency
+percentiles, prompt tokens and cost for each configuration.
+
+Classes:
+    EvaluationReport: The scores of one configuration.
+
+Functions:
+    load_gold_set: Read a JSONL gold set.
+    results_match: Compare two result sets.
+    evaluate: Score one Raxo instance against a gold set.
+    evaluate_configurations: Score several configurations and pick the fastest accurate one.
+
+Usage Example:
+    from raxo.benchmarks.evaluation import evaluate_configurations, load_gold_set
+    from raxo.testing import SQLiteDatabase
+
+    database = SQLiteDatabase("warehouse.db")
+    database.connect()
+    reports = evaluate_configurations(
+        factory=lambda config: make_raxo(**config),
+        configurations={"k3": {"n_result_ddl": 3}, "k10": {"n_result_ddl": 10}},
+        gold=load_gold_set("gold.jsonl"),
+        database=database,
+    )
+    for report in reports:
+        print(report.as_dict())
+
+    # or from the command line, with a `module:callable` factory
+    python -m raxo.benchmarks.evaluation --gold gold.jsonl --database warehouse.db \\
+        --factory my_app.raxo:make_raxo --configs configs.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from .stats import percentile
+from ..utils.imports import import_object
+from ..utils.tracing import Span, TraceHook
+
+
+class _UsageHook(TraceHook):
+    """Sums the token usage of every `llm` span into the root span of its request."""
+
+    def on_end(self, span: Span):
+        if span.name != "llm" or span.parent is None:
+            return
+        root = span.root
+        for key in ("prompt_tokens", "completion_tokens", "cached_tokens"):
+            value = span.attributes.get(key)
+            if value:
+                root.incr(key, value)
+        root.incr("llm_calls")
+
+
+class EvaluationReport:
+    """
+    The scores of one configuration.
+
+    Attributes:
+        name (str): The configuration name.
+        config (dict): The configuration.
+        items (list[dict]): Per-question outcomes.
+    """
+
+    def __init__(self, name: str, config: dict, items: List[dict], prompt_price: float = 0.0,
+                 completion_price: float = 0.0):
+        self.name = name
+        self.config = config
+        self.items = items
+        self.prompt_price = prompt_price
+        self.completion_price = completion_price
+
+    @property
+    def accuracy(self) -> float:
+        """The fraction of questions whose generated SQL returned the expected result."""
+        return sum(item["correct"] for item in self.items) / len(self.items) if self.items else 0.0
+
+    def latency(self, q: float) -> float | None:
+        """The q-th percentile of SQL generation latency, in milliseconds."""
+        value = percentile([item["latency"] for item in self.items], q)
+        return value * 1000 if value is not None else None
+
+    @property
+    def prompt_tokens(self) -> int:
+        """The total number of prompt tokens."""
+        return sum(item["prompt_tokens"] for item in self.items)
+
+    @property
+    def completion_tokens(self) -> int:
+        """The total number of completion tokens."""
+        return sum(item["completion_tokens"] for item in self.items)
+
+    @property
+    def cost(self) -> float:
+        """The total cost, from the configured prices per 1k prompt and completion tokens."""
+        return (self.prompt_tokens * self.prompt_price + self.completion_tokens * self.completion_price) / 1000
+
+    def as_dict(self) -> dict:
+        """
+        Summarize the report.
+
+        Returns:
+            dict: The accuracy, p50/p95 latency, token counts and cost of the configuration.
+        """
+        count = len(self.items) or 1
+        return {
+            "name": self.name,
+            "config": self.config,
+            "questions": len(self.items),
+            "accuracy": self.accuracy,
+            "p50_ms": self.latency(50),
+            "p95_ms": self.latency(95),
+            "prompt_tokens_per_question": self.prompt_tokens / count,
+            "completion_tokens_per_question": self.completion_tokens / count,
+            "cost": self.cost,
+            "cost_per_question": self.cost / count,
+            "errors": sum(1 for item in self.items if item["error"]),
+        }
+
+
+def load_gold_set(path: str) -> List[dict]:
+    """
+    Read a JSONL gold set.
+
+    Every line holds a `question` and either the expected `sql` or the expected `result` rows.
+
+    Args:
+        path (str): The JSONL file.
+
+    Returns:
+        list[dict]: The gold items.
+    """
+    with open(path, encoding="utf-8") as file:
+        gold = [json.loads(line) for line in file if line.strip()]
+    for item in gold:
+        if "question" not in item or ("sql" not in item and "result" not in item):
+            raise ValueError(f"Gold items need a `question` and an expected `sql` or `result`: {item}")
+    return gold
+
+
+def _normalize_row(row) -> tuple:
+    return tuple(round(value, 6) if isinstance(value, float) else value for value in row)
+
+
+def results_match(expected, actual, ordered: bool = False) -> bool:
+    """
+    Compare two result sets.
+
+    Args:
+        expected (list): The expected rows.
+        actual (list): The rows returned by the generated SQL.
+        ordered (bool): Whether row order matters. Default is False.
+
+    Returns:
+        bool: True when both contain the same rows (as multisets unless `ordered`).
+    """
+    if expected is None or actual is None:
+        return expected is actual
+    expected = [_normalize_row(row) for row in expected]
+    actual = [_normalize_row(row) for row in actual]
+    if ordered:
+        return expected == actual
+    return sorted(expected, key=repr) == sorted(actual, key=repr)
+
+
+def _evaluate_item(raxo, item: dict, database) -> dict:
+    outcome = {"question": item["question"], "sql": None, "correct": False, "error": None,
+               "prompt_tokens": 0, "completion_tokens": 0, "llm_calls": 0}
+    start = time.perf_counter()
+    with raxo.tracer.span("evaluate") as span:
+        try:
+            response = raxo.generate_sql(item["question"])
+        except Exception as e:
+            response, outcome["error"] = None, f"generation failed: {e}"
+    outcome["latency"] = time.perf_counter() - start
+    for key in ("prompt_tokens", "completion_tokens", "llm_calls"):
+        outcome[key] = span.attributes.get(key, 0)
+
+    sql = response.get("sql") if isinstance(response, dict) else None
+    outcome["sql"] = sql
+    if not sql:
+        outcome["error"] = outcome["error"] or "no sql generated"
+        return outcome
+    expected_sql = item.get("sql")
+    try:
+        expected = item["result"] if "result" in item else database.execute_query(expected_sql)
+        actual = database.execute_query(sql)
+    except Exception as e:
+        outcome["error"] = f"execution failed: {e}"
+        return outcome
+    ordered = bool(item.get("ordered", expected_sql and "order by" in expected_sql.lower()))
+    outcome["correct"] = results_match(expected, actual, ordered=ordered)
+    return outcome
+
+
+def evaluate(raxo, gold: List[dict], database, concurrency: int = 8, name: str = "default",
+             config: dict | None = None, prompt_price: float = 0.0, completion_price: float = 0.0) -> EvaluationReport:
+    """
+    Score one Raxo instance against a gold set.
+
+    Args:
+        raxo (Raxo): The instance under test. Its tracer gets a hook recording token usage.
+        gold (list[dict]): The gold items, see `load_gold_set`.
+        database: A connector (e.g. SQLiteDatabase) on which expected and generated SQL are executed.
+        concurrency (int): The number of questions evaluated in parallel. Default is 8.
+        name (str): The configuration name used in the report. Default is "default".
+        config (dict | None): The configuration recorded in the report. Default is None.
+        prompt_price (float): The price per 1k prompt tokens. Default is 0.
+        completion_price (float): The price per 1k completion tokens. Default is 0.
+
+    Returns:
+        EvaluationReport: The per-question outcomes and summary scores.
+    """
+    if not any(isinstance(hook, _UsageHook) for hook in raxo.tracer.hooks):
+        raxo.tracer.add_hook(_UsageHook())
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        items = list(executor.map(lambda item: _evaluate_item(raxo, item, database), gold))
+    return EvaluationReport(name, config or {}, items, prompt_price=prompt_price, completion_price=completion_price)
+
+
+def evaluate_configurations(factory: Callable[[dict], object], configurations: dict, gold: List[dict],
+                            database, concurrency: int = 8, prompt_price: float = 0.0,
+                            completion_price: float = 0.0) -> List[EvaluationReport]:
+    """
+    Score several configurations against the same gold set.
+
+    Args:
+        factory (Callable[[dict], Raxo]): Builds a Raxo instance from a configuration.
+        configurations (dict): Configurations keyed by name. A configuration may override the
+            prices with `prompt_price` and `completion_price` keys.
+        gold (list[dict]): The gold items, see `load_gold_set`.
+        database: A connector on which expected and generated SQL are executed.
+        concurrency (int): The number of questions evaluated in parallel. Default is 8.
+        prompt_price (float): The default price per 1k prompt tokens. Default is 0.
+        completion_price (float): The default price per 1k completion tokens. Default is 0.
+
+    Returns:
+        list[EvaluationReport]: One report per configuration, in the given order.
+    """
+    reports = []
+    for name, config in configurations.items():
+        config = dict(config)
+        prices = {"prompt_price": config.pop("prompt_price", prompt_price),
+                  "completion_price": config.pop("completion_price", completion_price)}
+        reports.append(evaluate(factory(config), gold, database, concurrency=concurrency, name=name,
+                                config=config, **prices))
+    return reports
+
+
+def best_configuration(reports: List[EvaluationReport], tolerance: float = 0.0) -> EvaluationReport | None:
+    """
+    Pick the fastest configuration whose accuracy is within `tolerance` of the most accurate one.
+
+    Args:
+        reports (list[EvaluationReport]): The reports to choose from.
+        tolerance (float): The accepted accuracy loss, e.g. 0.01 for one point. Default is 0.
+
+    Returns:
+        EvaluationReport | None: The chosen report, or None if there are none.
+    """
+    if not reports:
+        return None
+    target = max(report.accuracy for report in reports) - tolerance
+    candidates = [report for report in reports if report.accuracy >= target]
+    return min(candidates, key=lambda report: (report.latency(50) or 0.0, report.cost))
+
+
+def main(argv=None):
+    """Entry point of `python -m raxo.benchmarks.evaluation`."""
+    parser = argparse.ArgumentParser(prog="raxo.benchmarks.evaluation",
+                                     description="Score Raxo configurations for accuracy, latency and cost.")
+    parser.add_argument("--gold", required=True, help="JSONL file of {question, sql | result} items")
+    parser.add_argument("--database", required=True, help="SQLite database file the SQL is executed on")
+    parser.add_argument("--factory", required=True,
+                        help="`module:callable` building a Raxo trained on the database schema from a config dict")
+    parser.add_argument("--configs", help="JSON file of configurations keyed by name")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--prompt-price", type=float, default=0.0, help="price per 1k prompt tokens")
+    parser.add_argument("--completion-price", type=float, default=0.0, help="price per 1k completion tokens")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="accepted accuracy loss for the pick")
+    parser.add_argument("--output", help="where to write the JSON report")
+    args = parser.parse_args(argv)
+
+    from ..testing import SQLiteDatabase
+
+    database = SQLiteDatabase(args.database)
+    database.connect()
+    factory = import_object(args.factory)
+    configurations = {"default": {}}
+    if args.configs:
+        with open(args.configs, encoding="utf-8") as file:
+            configurations = json.load(file)
+
+    reports = evaluate_configurations(factory, configurations, load_gold_set(args.gold), database,
+                                      concurrency=args.concurrency, prompt_price=args.prompt_price,
+                                      completion_price=args.completion_price)
+    best = best_configuration(reports, tolerance=args.tolerance)
+    summary = {"configurations": [report.as_dict() for report in reports], "best": best.name if best else None}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({**summary, "items": {report.name: report.items for report in reports}}, file, indent=2)
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
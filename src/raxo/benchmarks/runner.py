@@ -0,0 +1,122 @@
+"""
+Benchmark Runner Module
+
+This module runs benchmark scenarios and writes their results to a JSON file, so that runs made
+before and after a change can be compared.
+
+Usage Example:
+    python -m raxo.benchmarks --scenario ask --scenario retrieval --llm-latency 0.3 \\
+        --llm-jitter 0.05 --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+from .scenarios import DEFAULT_CONFIG, SCENARIOS
+from .. import __version__
+
+
+def run_benchmarks(scenarios=None, config: dict | None = None, options: dict | None = None) -> dict:
+    """
+    Run benchmark scenarios.
+
+    Args:
+        scenarios (list[str] | None): Names from SCENARIOS to run. Default is all of them.
+        config (dict | None): Overrides of DEFAULT_CONFIG shared by all scenarios.
+        options (dict | None): Per-scenario keyword arguments, keyed by scenario name.
+
+    Returns:
+        dict: Run metadata plus the result of every scenario.
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    options = options or {}
+    results = {}
+    for name in scenarios or SCENARIOS:
+        results[name] = SCENARIOS[name](config, **options.get(name, {}))
+    return {
+        "raxo_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": config,
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, prefix: str = "") -> list:
+    """
+    Compare the numeric results of two runs.
+
+    Args:
+        baseline (dict): The results of the reference run.
+        current (dict): The results of the new run.
+        prefix (str): The key path of the compared dicts, used when recursing.
+
+    Returns:
+        list[tuple]: (key path, baseline value, current value, relative change) tuples.
+    """
+    rows = []
+    for key, value in current.items():
+        path = f"{prefix}{key}"
+        before = baseline.get(key) if isinstance(baseline, dict) else None
+        if isinstance(value, dict):
+            rows.extend(compare(before or {}, value, f"{path}."))
+        elif isinstance(value, (int, float)) and isinstance(before, (int, float)) and not isinstance(value, bool):
+            change = (value - before) / before if before else None
+            rows.append((path, before, value, change))
+    return rows
+
+
+def main(argv=None):
+    """Entry point of `python -m raxo.benchmarks`."""
+    parser = argparse.ArgumentParser(prog="raxo.benchmarks", description="Run offline Raxo benchmarks.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run, may be repeated (default: all)")
+    parser.add_argument("--tables", type=int, help="number of synthetic tables for train/ask/memory")
+    parser.add_argument("--questions", type=int, help="number of questions for ask/memory")
+    parser.add_argument("--concurrency", type=int, default=1, help="concurrent callers for ask")
+    parser.add_argument("--sizes", type=lambda text: tuple(int(size) for size in text.split(",")),
+                        help="comma-separated corpus sizes for retrieval, e.g. 10,1000,100000")
+    parser.add_argument("--llm-latency", type=float, default=DEFAULT_CONFIG["llm_latency"])
+    parser.add_argument("--llm-jitter", type=float, default=DEFAULT_CONFIG["llm_jitter"])
+    parser.add_argument("--embedding-latency", type=float, default=DEFAULT_CONFIG["embedding_latency"])
+    parser.add_argument("--embedding-jitter", type=float, default=DEFAULT_CONFIG["embedding_jitter"])
+    parser.add_argument("--vector", choices=("memory", "chroma"), default=DEFAULT_CONFIG["vector"])
+    parser.add_argument("--seed", type=int, default=DEFAULT_CONFIG["seed"])
+    parser.add_argument("--output", default="bench_output.json", help="where to write the JSON results")
+    parser.add_argument("--compare", help="a previous JSON results file to compare against")
+    args = parser.parse_args(argv)
+
+    config = {
+        "llm_latency": args.llm_latency,
+        "llm_jitter": args.llm_jitter,
+        "embedding_latency": args.embedding_latency,
+        "embedding_jitter": args.embedding_jitter,
+        "vector": args.vector,
+        "seed": args.seed,
+    }
+    options = {"train": {}, "ask": {"concurrency": args.concurrency}, "retrieval": {}, "memory": {}}
+    if args.tables:
+        for name in ("train", "ask", "memory"):
+            options[name]["n_tables"] = args.tables
+    if args.questions:
+        for name in ("ask", "memory"):
+            options[name]["n_questions"] = args.questions
+    if args.sizes:
+        options["retrieval"]["sizes"] = args.sizes
+
+    report = run_benchmarks(args.scenario, config, options)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    json.dump(report["results"], sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        for path, before, after, change in compare(baseline.get("results", {}), report["results"]):
+            change = f"{change:+.1%}" if change is not None else "n/a"
+            sys.stdout.write(f"{path}: {before:.4g} -> {after:.4g} ({change})\n")
@@ -0,0 +1,195 @@
+"""
+Scenarios Module
+
+This module contains the benchmark scenarios. Each scenario builds a Raxo instance from the
+fakes in `raxo.testing`, drives it with a synthetic schema and returns a JSON-serializable dict.
+
+Functions:
+    build_raxo: Build a Raxo instance backed by fakes.
+    train_throughput: Measure how fast DDL is trained.
+    ask_latency: Measure end-to-end `ask` latency percentiles, optionally with concurrent callers.
+    retrieval_latency: Measure DDL retrieval latency as the corpus grows.
+    memory_usage: Measure peak Python heap usage while training and asking.
+"""
+
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from .schema import generate_tables, generate_questions, table_ddl
+from .stats import summarize
+from ..core import Raxo
+from ..testing import FakeEmbedding, FakeLlm, InMemoryVectorStore
+
+DEFAULT_CONFIG = {
+    "llm_latency": 0.0,
+    "llm_jitter": 0.0,
+    "embedding_latency": 0.0,
+    "embedding_jitter": 0.0,
+    "embedding_dimensions": 256,
+    "vector": "memory",
+    "n_result_ddl": 5,
+    # Repeated synthetic questions would otherwise be served by the SQL cache
+    "cache_size": 0,
+    "seed": 0,
+}
+
+
+def build_raxo(config: dict | None = None, **raxo_kwargs) -> Raxo:
+    """
+    Build a Raxo instance backed by fakes.
+
+    Args:
+        config (dict | None): Overrides of DEFAULT_CONFIG. `vector` is "memory" for the
+            InMemoryVectorStore or "chroma" for a ChromaStore in a temporary directory.
+        **raxo_kwargs: Extra keyword arguments passed to Raxo.
+
+    Returns:
+        Raxo: The Raxo instance.
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    embedding = FakeEmbedding(dimensions=config["embedding_dimensions"], latency=config["embedding_latency"],
+                              jitter=config["embedding_jitter"], seed=config["seed"])
+    if config["vector"] == "chroma":
+        from ..vector.chroma_db import ChromaStore
+        vector_db = ChromaStore(path=tempfile.mkdtemp(prefix="raxo-bench-"), persistent=True,
+                                em_function=embedding, n_result_ddl=config["n_result_ddl"])
+    else:
+        vector_db = InMemoryVectorStore(n_result_ddl=config["n_result_ddl"])
+    llm = FakeLlm(latency=config["llm_latency"], jitter=config["llm_jitter"], seed=config["seed"])
+    raxo_kwargs.setdefault("cache_size", config["cache_size"])
+    return Raxo(llm=llm, vector_db=vector_db, em_function=embedding, **raxo_kwargs)
+
+
+def _train(raxo: Raxo, tables: list):
+    for table in tables:
+        raxo.train(ddl=table_ddl(table))
+
+
+def train_throughput(config: dict | None = None, n_tables: int = 1000) -> dict:
+    """
+    Measure how fast DDL is trained.
+
+    Args:
+        config (dict | None): Overrides of DEFAULT_CONFIG.
+        n_tables (int): The number of synthetic tables to train. Default is 1000.
+
+    Returns:
+        dict: The number of tables, elapsed seconds and tables per second.
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    raxo = build_raxo(config)
+    tables = list(generate_tables(n_tables, seed=config["seed"]))
+    start = time.perf_counter()
+    _train(raxo, tables)
+    elapsed = time.perf_counter() - start
+    return {"tables": n_tables, "seconds": elapsed, "tables_per_second": n_tables / elapsed if elapsed else None}
+
+
+def ask_latency(config: dict | None = None, n_tables: int = 200, n_questions: int = 200,
+                concurrency: int = 1) -> dict:
+    """
+    Measure end-to-end `ask` latency.
+
+    Args:
+        config (dict | None): Overrides of DEFAULT_CONFIG.
+        n_tables (int): The number of synthetic tables trained beforehand. Default is 200.
+        n_questions (int): The number of questions asked. Default is 200.
+        concurrency (int): The number of concurrent callers. Default is 1.
+
+    Returns:
+        dict: Latency percentiles in milliseconds plus the overall throughput.
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    raxo = build_raxo(config)
+    tables = list(generate_tables(n_tables, seed=config["seed"]))
+    _train(raxo, tables)
+    questions = [item["question"] for item in generate_questions(tables, n_questions, seed=config["seed"])]
+
+    def timed_ask(question):
+        start = time.perf_counter()
+        raxo.ask(question)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(timed_ask, questions))
+    elapsed = time.perf_counter() - start
+    return {**summarize(latencies), "concurrency": concurrency, "tables": n_tables,
+            "questions_per_second": n_questions / elapsed if elapsed else None}
+
+
+def retrieval_latency(config: dict | None = None, sizes=(10, 100, 1000, 10000), n_queries: int = 100) -> dict:
+    """
+    Measure DDL retrieval latency as the corpus grows.
+
+    The corpus is grown incrementally, and at each size `n_queries` pre-computed question
+    embeddings are looked up, so only the vector store is timed.
+
+    Args:
+        config (dict | None): Overrides of DEFAULT_CONFIG.
+        sizes (tuple[int]): The corpus sizes to measure at. Default is (10, 100, 1000, 10000).
+        n_queries (int): The number of lookups per size. Default is 100.
+
+    Returns:
+        dict: Latency percentiles in milliseconds keyed by corpus size.
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    raxo = build_raxo(config)
+    tables = list(generate_tables(max(sizes), seed=config["seed"]))
+    embeddings = [raxo.em_function.create_embedding(item["question"])
+                  for item in generate_questions(tables, n_queries, seed=config["seed"])]
+    results = {}
+    trained = 0
+    for size in sorted(sizes):
+        _train(raxo, tables[trained:size])
+        trained = size
+        latencies = []
+        for embedding in embeddings:
+            start = time.perf_counter()
+            raxo.vector_db.get_ddl(embedding)
+            latencies.append(time.perf_counter() - start)
+        results[str(size)] = summarize(latencies)
+    return results
+
+
+def memory_usage(config: dict | None = None, n_tables: int = 1000, n_questions: int = 100) -> dict:
+    """
+    Measure peak Python heap usage while training and asking.
+
+    Only allocations made by Python code are traced, so native memory held by ChromaDB's
+    SQLite or HNSW index is not included.
+
+    Args:
+        config (dict | None): Overrides of DEFAULT_CONFIG.
+        n_tables (int): The number of synthetic tables trained. Default is 1000.
+        n_questions (int): The number of questions asked. Default is 100.
+
+    Returns:
+        dict: Peak traced bytes during training and during asking.
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    tables = list(generate_tables(n_tables, seed=config["seed"]))
+    questions = [item["question"] for item in generate_questions(tables, n_questions, seed=config["seed"])]
+    tracemalloc.start()
+    try:
+        raxo = build_raxo(config)
+        _train(raxo, tables)
+        _, train_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for question in questions:
+            raxo.ask(question)
+        current, ask_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"tables": n_tables, "train_peak_bytes": train_peak, "ask_peak_bytes": ask_peak,
+            "retained_bytes": current}
+
+
+SCENARIOS = {
+    "train": train_throughput,
+    "ask": ask_latency,
+    "retrieval": retrieval_latency,
+    "memory": memory_usage,
+}
@@ -0,0 +1,128 @@
+"""
+Synthetic Schema Module
+
+This module generates reproducible synthetic warehouse schemas for benchmarks: CREATE TABLE
+statements with a mix of key, categorical, numeric and date columns, foreign keys to earlier
+tables, and natural language questions targeting those tables.
+
+Functions:
+    generate_tables: Yield synthetic table definitions.
+    generate_ddl: Yield the CREATE TABLE statements of a synthetic schema.
+    generate_questions: Build questions that each target one synthetic table.
+
+Usage Example:
+    from raxo.benchmarks.schema import generate_ddl
+
+    for ddl in generate_ddl(1000, seed=7):
+        raxo.train(ddl=ddl)
+"""
+
+import random
+from typing import Iterator, List
+
+_SUBJECTS = ("sales", "orders", "customers", "invoices", "shipments", "payments", "products", "stores",
+             "employees", "campaigns", "tickets", "sessions", "refunds", "inventory", "suppliers", "regions")
+_QUALIFIERS = ("daily", "monthly", "archived", "staging", "regional", "online", "retail", "partner",
+               "forecast", "audit", "summary", "raw")
+_CATEGORIES = ("region", "country", "channel", "status", "segment", "category", "currency", "tier")
+_MEASURES = ("amount", "quantity", "revenue", "cost", "discount", "tax", "margin", "duration")
+_DATES = ("created_at", "updated_at", "order_date", "ship_date", "closed_at")
+
+
+def generate_tables(n_tables: int, min_columns: int = 4, max_columns: int = 12, seed: int = 0) -> Iterator[dict]:
+    """
+    Yield synthetic table definitions.
+
+    Args:
+        n_tables (int): The number of tables to generate, from a handful to 100k+.
+        min_columns (int): The minimum number of columns per table. Default is 4.
+        max_columns (int): The maximum number of columns per table. Default is 12.
+        seed (int): The seed making the schema reproducible. Default is 0.
+
+    Yields:
+        dict: {"name": str, "columns": [(name, type)], "foreign_keys": [(column, table)]}.
+    """
+    rng = random.Random(seed)
+    names = []
+    for index in range(n_tables):
+        name = f"{rng.choice(_QUALIFIERS)}_{rng.choice(_SUBJECTS)}_{index}"
+        columns = [("id", "INT")]
+        foreign_keys = []
+        if names and rng.random() < 0.6:
+            parent = names[rng.randrange(max(0, len(names) - 50), len(names))]
+            columns.append((f"{parent}_id", "INT"))
+            foreign_keys.append((f"{parent}_id", parent))
+        for _ in range(rng.randint(min_columns, max_columns) - len(columns)):
+            kind = rng.random()
+            if kind < 0.35:
+                column = (rng.choice(_CATEGORIES), "VARCHAR(50)")
+            elif kind < 0.8:
+                column = (rng.choice(_MEASURES), "DECIMAL(12,2)")
+            else:
+                column = (rng.choice(_DATES), "DATE")
+            if column[0] not in (existing for existing, _ in columns):
+                columns.append(column)
+        names.append(name)
+        yield {"name": name, "columns": columns, "foreign_keys": foreign_keys}
+
+
+def table_ddl(table: dict) -> str:
+    """
+    Render a synthetic table definition as a CREATE TABLE statement.
+
+    Args:
+        table (dict): A definition produced by `generate_tables`.
+
+    Returns:
+        str: The CREATE TABLE statement.
+    """
+    lines = [f"    {name} {column_type}" for name, column_type in table["columns"]]
+    lines.append("    PRIMARY KEY (id)")
+    lines.extend(f"    FOREIGN KEY ({column}) REFERENCES {parent}(id)" for column, parent in table["foreign_keys"])
+    return f"CREATE TABLE {table['name']} (\n" + ",\n".join(lines) + "\n)"
+
+
+def generate_ddl(n_tables: int, min_columns: int = 4, max_columns: int = 12, seed: int = 0) -> Iterator[str]:
+    """
+    Yield the CREATE TABLE statements of a synthetic schema.
+
+    Args:
+        n_tables (int): The number of tables to generate.
+        min_columns (int): The minimum number of columns per table. Default is 4.
+        max_columns (int): The maximum number of columns per table. Default is 12.
+        seed (int): The seed making the schema reproducible. Default is 0.
+
+    Yields:
+        str: One CREATE TABLE statement per table.
+    """
+    for table in generate_tables(n_tables, min_columns, max_columns, seed):
+        yield table_ddl(table)
+
+
+def generate_questions(tables: List[dict], n_questions: int, seed: int = 0) -> List[dict]:
+    """
+    Build natural language questions that each target one synthetic table.
+
+    Args:
+        tables (list[dict]): Definitions produced by `generate_tables`.
+        n_questions (int): The number of questions to build.
+        seed (int): The seed making the questions reproducible. Default is 0.
+
+    Returns:
+        list[dict]: {"question": str, "table": str} items.
+    """
+    rng = random.Random(seed)
+    questions = []
+    for _ in range(n_questions):
+        table = rng.choice(tables)
+        measures = [name for name, column_type in table["columns"] if column_type.startswith("DECIMAL")]
+        categories = [name for name, column_type in table["columns"] if column_type.startswith("VARCHAR")]
+        subject = table["name"].replace("_", " ")
+        if measures and categories:
+            question = f"total {rng.choice(measures)} by {rng.choice(categories)} in {subject}"
+        elif measures:
+            question = f"total {rng.choice(measures)} in {subject}"
+        else:
+            question = f"how many rows are in {subject}"
+        questions.append({"question": question, "table": table["name"]})
+    return questions
@@ -0,0 +1,53 @@
+"""
+Statistics Module
+
+This module contains the small set of statistics used to report benchmark and evaluation runs.
+
+Functions:
+    percentile: Compute a percentile with linear interpolation.
+    summarize: Summarize a list of latencies in milliseconds.
+"""
+
+from typing import List
+
+
+def percentile(values: List[float], q: float) -> float | None:
+    """
+    Compute a percentile with linear interpolation between the closest ranks.
+
+    Args:
+        values (list[float]): The samples.
+        q (float): The percentile, between 0 and 100.
+
+    Returns:
+        float | None: The percentile, or None when there are no samples.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(latencies: List[float]) -> dict:
+    """
+    Summarize latencies measured in seconds.
+
+    Args:
+        latencies (list[float]): Latencies in seconds.
+
+    Returns:
+        dict: The count, mean, p50, p95, p99 and max, in milliseconds.
+    """
+    if not latencies:
+        return {"count": 0}
+    return {
+        "count": len(latencies),
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
@@ -0,0 +1,185 @@
+"""
+CLI Module
+
+This module provides the `raxo` command line entry point.
+
+Commands:
+    serve: Serve a long-lived Raxo instance over HTTP, see `raxo.server`.
+    batch: Answer a JSONL or CSV question list with checkpointing, see `raxo.batch`.
+    replay: Re-drive a query log against a Raxo instance, see `raxo.replay`.
+
+Usage Example:
+    raxo serve --factory myapp.raxo:build --config config.json --port 8000 --workers 8 --queue-size 32
+    raxo serve --fake --fake-tables 50   # fake LLM, embeddings and vector store, for local testing
+    raxo batch --factory myapp.raxo:build questions.csv results.jsonl --concurrency 16 --retries 2
+    raxo serve --factory myapp.raxo:build --query-log queries.jsonl   # record requests for replay
+    raxo serve --factory myapp.raxo:build --profile-dir profiles --profile-sample 0.01
+    raxo replay queries.jsonl --fake --speed 2 --concurrency 16
+"""
+
+import argparse
+import json
+import logging
+import signal
+import sys
+import threading
+
+from .utils.imports import import_object
+
+logger = logging.getLogger(__name__)
+
+
+def _load_config(path: str | None) -> dict:
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def build_fake_raxo(config: dict | None = None, n_tables: int = 20):
+    """
+    Build a Raxo instance backed by fakes and trained on a synthetic schema.
+
+    Args:
+        config (dict | None): Overrides of `raxo.benchmarks.scenarios.DEFAULT_CONFIG`. Default is None.
+        n_tables (int): The number of synthetic tables trained. Default is 20.
+
+    Returns:
+        Raxo: The Raxo instance.
+    """
+    from .benchmarks.schema import generate_ddl
+    from .benchmarks.scenarios import build_raxo
+
+    config = dict(config or {})
+    raxo = build_raxo(config, cache_size=config.pop("cache_size", 1024))
+    for ddl in generate_ddl(n_tables, seed=config.get("seed", 0)):
+        raxo.train(ddl=ddl)
+    return raxo
+
+
+def _build(args):
+    config = _load_config(args.config)
+    if args.fake:
+        raxo = build_fake_raxo(config, n_tables=args.fake_tables)
+    elif not args.factory:
+        raise SystemExit(f"raxo {args.command}: one of --factory or --fake is required")
+    else:
+        raxo = import_object(args.factory)(config)
+    if args.query_log:
+        from .utils.query_log import QueryLog
+
+        raxo.tracer.add_hook(QueryLog(args.query_log, sample_rate=args.query_log_sample))
+    if args.profile_dir or args.profile_sample:
+        from .utils.profiling import ProfilingHook
+
+        raxo.tracer.add_hook(ProfilingHook(output_dir=args.profile_dir, sample_rate=args.profile_sample,
+                                           mode=args.profile_mode, min_duration=args.profile_min_duration))
+    return raxo
+
+
+def serve(args):
+    """Run the `serve` command until SIGINT or SIGTERM."""
+    from .server import RaxoServer
+
+    server = RaxoServer(_build(args), host=args.host, port=args.port, workers=args.workers,
+                        queue_size=args.queue_size, queue_timeout=args.queue_timeout)
+
+    def stop(signum, frame):
+        logger.info("Received signal %s, draining", signum)
+        # shutdown() waits for serve_forever to return, so it cannot run on the serving thread
+        threading.Thread(target=server.shutdown, kwargs={"drain_timeout": args.drain_timeout}).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    server.serve_forever()
+
+
+def batch(args):
+    """Run the `batch` command and print its summary."""
+    from .batch import BatchRunner
+
+    raxo = _build(args)
+    try:
+        runner = BatchRunner(raxo, concurrency=args.concurrency, retries=args.retries, backoff=args.backoff,
+                             progress_interval=args.progress_interval, max_result_rows=args.max_result_rows)
+        summary = runner.run(args.input, args.output, resume=not args.restart)
+    finally:
+        raxo.close()
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+def replay(args):
+    """Run the `replay` command and print its report."""
+    from .replay import Replayer
+    from .utils.query_log import read_query_log
+
+    raxo = _build(args)
+    try:
+        report = Replayer(raxo, speed=args.speed, concurrency=args.concurrency,
+                          kinds=tuple(args.kinds.split(","))).run(read_query_log(args.log), limit=args.limit)
+    finally:
+        raxo.close()
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+def _add_factory_arguments(parser):
+    parser.add_argument("--factory", help="`module:callable` building a Raxo from the config dict")
+    parser.add_argument("--config", help="JSON file passed to the factory")
+    parser.add_argument("--fake", action="store_true", help="use fake backends trained on a synthetic schema")
+    parser.add_argument("--fake-tables", type=int, default=20)
+    parser.add_argument("--query-log", help="JSONL, or .db/.sqlite for SQLite, file recording each request")
+    parser.add_argument("--query-log-sample", type=float, default=1.0, help="fraction of requests recorded")
+    parser.add_argument("--profile-dir", help="directory of per-request profiles, see raxo.utils.profiling")
+    parser.add_argument("--profile-sample", type=float, default=0.0, help="fraction of ask requests profiled")
+    parser.add_argument("--profile-mode", choices=("sample", "cprofile"), default="sample")
+    parser.add_argument("--profile-min-duration", type=float, default=0.0,
+                        help="seconds below which a profile is not written")
+
+
+def main(argv=None):
+    """Entry point of the `raxo` command."""
+    parser = argparse.ArgumentParser(prog="raxo", description="Raxo command line tools.")
+    parser.add_argument("--log-level", default="INFO")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="serve ask, train and follow-up endpoints over HTTP")
+    _add_factory_arguments(serve_parser)
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("--workers", type=int, default=8, help="requests running the pipeline at once")
+    serve_parser.add_argument("--queue-size", type=int, default=32, help="requests waiting before 503 responses")
+    serve_parser.add_argument("--queue-timeout", type=float, default=30.0)
+    serve_parser.add_argument("--drain-timeout", type=float, default=30.0)
+    serve_parser.set_defaults(handler=serve)
+
+    batch_parser = commands.add_parser("batch", help="answer a JSONL or CSV question list with checkpointing")
+    batch_parser.add_argument("input", help="JSONL of {question, namespace?} objects or CSV with a question column")
+    batch_parser.add_argument("output", help="JSONL results, appended to and used as the checkpoint")
+    _add_factory_arguments(batch_parser)
+    batch_parser.add_argument("--concurrency", type=int, default=8)
+    batch_parser.add_argument("--retries", type=int, default=2, help="retries of an item raising an exception")
+    batch_parser.add_argument("--backoff", type=float, default=1.0, help="seconds before the first retry")
+    batch_parser.add_argument("--progress-interval", type=float, default=10.0)
+    batch_parser.add_argument("--max-result-rows", type=int, default=10_000,
+                              help="most rows of an executed query written per item")
+    batch_parser.add_argument("--restart", action="store_true", help="ignore and overwrite the existing output")
+    batch_parser.set_defaults(handler=batch)
+
+    replay_parser = commands.add_parser("replay", help="re-drive a query log and report latency and cache hits")
+    replay_parser.add_argument("log", help="query log written with --query-log or QueryLog")
+    _add_factory_arguments(replay_parser)
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="rate multiplier, 0 for as fast as possible")
+    replay_parser.add_argument("--concurrency", type=int, default=16)
+    replay_parser.add_argument("--kinds", default="ask", help="comma separated request kinds: ask, train")
+    replay_parser.add_argument("--limit", type=int, help="largest number of requests replayed")
+    replay_parser.set_defaults(handler=replay)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
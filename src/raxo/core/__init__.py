@@ -1 +1,7 @@
 from .base import Raxo
+from .examples import ExampleSelector
+from .join_graph import JoinGraph
+from .prompt_builder import PromptBuilder
+from .retrieval_depth import AdaptiveTopK
+from .template_cache import TemplateCache
+from .value_index import ColumnValueIndex
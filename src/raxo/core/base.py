@@ -1,75 +1,606 @@
+import copy
 import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
-from ..utils.exceptions import NoTextProvided
-from ..utils.prompts import NLQ_SYSTEM_PROMPT, RELATED_QUESTION_SYSTEM_PROMPT
-from ..utils.sql_utils import extract_output
+from ..utils.cache import LRUCache, namespace_scope
+from ..utils.ddl import compact_ddl, parse_create_tables
+from ..utils.exceptions import NoTextProvided, QueryExecutionError
+from ..utils.normalize import canonicalize
+from ..utils.prompts import PARSE_RETRY_PROMPT, RELATED_QUESTION_SYSTEM_PROMPT, REPAIR_PROMPT
+from ..utils.result_set import ResultSet
+from ..utils.sql_utils import ParseResult, parse_llm_output
+from ..utils.tokens import estimate_tokens
+from ..utils.tracing import Tracer
 from ..models.llms import Llm
 from ..vector.chroma_db import ChromaStore
+from .examples import ExampleSelector
+from .join_graph import JoinGraph
+from .prompt_builder import PromptBuilder
+from .retrieval_depth import AdaptiveTopK
+from .template_cache import TemplateCache
+from .value_index import ColumnValueIndex
+
+logger = logging.getLogger(__name__)
 
 
 class Raxo:
-    def __init__(self, llm: Llm, database=None, vector_db=None, em_function=None, execute_query: bool = False):
+    def __init__(self, llm: Llm, database=None, vector_db=None, em_function=None, execute_query: bool = False,
+                 tracer: Tracer | None = None, prompt_builder: PromptBuilder | None = None,
+                 value_index: ColumnValueIndex | None = None, parse_retries: int = 1,
+                 repair_attempts: int = 1, repair_timeout: float | None = 60.0, namespace: dict | None = None,
+                 example_selector: ExampleSelector | None = None, follow_up_workers: int = 2,
+                 follow_up_cache_size: int = 256, cache_size: int = 1024,
+                 template_cache: TemplateCache | None = None, retrieval_depth: AdaptiveTopK | None = None,
+                 join_graph: JoinGraph | None = None, compact_ddl: bool = False):
         self.llm = llm
         self.database = database
         self.vector_db = vector_db or ChromaStore()
         self.execute_query = execute_query
         self.em_function = em_function
         self.dialect = self.database.dialect if self.database else "MySQL"
+        self.tracer = tracer or Tracer()
+        self.prompt_builder = prompt_builder or PromptBuilder()
+        self.value_index = value_index
+        self.parse_retries = parse_retries
+        self.repair_attempts = repair_attempts
+        self.repair_timeout = repair_timeout
+        self.repair_stats = {"failures": 0, "attempts": 0, "repaired": 0, "exhausted": 0}
+        self._stats_lock = threading.Lock()
+        self.namespace = namespace
+        self.example_selector = example_selector or ExampleSelector()
+        self._follow_up_cache = LRUCache(follow_up_cache_size)
+        # Generated SQL keyed by canonical question, see `raxo.utils.normalize`
+        self.sql_cache = LRUCache(cache_size)
+        self.template_cache = template_cache or TemplateCache()
+        # None retrieves the vector store's fixed `n_result_ddl`
+        self.retrieval_depth = retrieval_depth
+        self.join_graph = join_graph
+        # Trained DDL is stored and prompted in its compact form, the original is kept as metadata
+        self.compact_ddl = compact_ddl
+        # Created eagerly so namespace views share it; threads are only started on first use
+        self._executor = ThreadPoolExecutor(max_workers=follow_up_workers, thread_name_prefix="raxo-follow-up")
 
-    @staticmethod
-    def _get_prompt(user_query, tables, database_type):
-        system_prompt = NLQ_SYSTEM_PROMPT.format(database=database_type, table=tables)
-        prompt = [{"role": "system", "content": system_prompt},
-                  {"role": "user", "content": f"{user_query}"}]
-        return prompt
+    def with_namespace(self, namespace: dict):
+        """
+        Return a view of this instance scoped to another namespace.
 
-    def generate_sql(self, user_query):
-        embedding = self.em_function.create_embedding(user_query)
-        ddl = self.vector_db.get_ddl(embedding)
+        The view shares the LLM, embedding, vector store and database clients, so serving many
+        tenants does not multiply clients or vector store files.
+
+        Args:
+            namespace (dict): The namespace, e.g. {"tenant": "acme", "database": "sales"}.
+
+        Returns:
+            Raxo: The scoped instance.
+        """
+        scoped = copy.copy(self)
+        scoped.namespace = namespace
+        return scoped
 
-        # Extracting documents only
-        ddl = ddl['documents'][0]
-        prompt = self._get_prompt(user_query, ddl, self.dialect)
+    @property
+    def _scope(self) -> frozenset:
+        return namespace_scope(self.namespace)
 
-        response = self.llm.invoke_prompt(prompt)
-        response = extract_output(response)
+    def _namespace_kwargs(self) -> dict:
+        # Only pass the namespace when set, so vector stores without namespace support keep working
+        return {"namespace": self.namespace} if self.namespace else {}
+
+    def _get_prompt(self, user_query, tables, database_type, values=None, examples=None):
+        return self.prompt_builder.build(user_query, tables, database_type, examples=examples, values=values)
+
+    def _invoke_llm(self, prompt, structured: bool = False):
+        kwargs = {}
+        if structured and getattr(self.llm, "json_mode", False):
+            kwargs["response_format"] = {"type": "json_object"}
+        with self.tracer.span("llm") as span:
+            response = self.llm.invoke_prompt(prompt, **kwargs)
+            usage = getattr(self.llm, "last_usage", None)
+            if usage:
+                span.set_attributes(**{key: value for key, value in usage.items() if value is not None})
         return response
 
-    def generate_related_question(self, query, follow_up_count):
+    def _parse(self, response) -> ParseResult:
+        with self.tracer.span("parse") as span:
+            result = parse_llm_output(response)
+            if not result.ok:
+                span.set_attributes(parse_failed=True, reason=result.reason)
+            elif result.recovered_from:
+                span.set("recovered_from", result.recovered_from)
+        return result
+
+    def _complete(self, prompt):
+        """Invoke the LLM and parse its answer, returning the extended conversation and the result."""
+        response = self._invoke_llm(prompt, structured=True)
+        result = self._parse(response)
+        for _ in range(self.parse_retries):
+            if result.ok:
+                break
+            # Re-ask within the same conversation, so the retrieved context is not rebuilt
+            prompt = prompt + [{"role": "assistant", "content": response or ""},
+                               {"role": "user", "content": PARSE_RETRY_PROMPT.format(reason=result.reason)}]
+            response = self._invoke_llm(prompt, structured=True)
+            result = self._parse(response)
+        return prompt + [{"role": "assistant", "content": response or ""}], result
+
+    def _match_values(self, user_query, ddl):
+        with self.tracer.span("values") as span:
+            tables = [table["name"] for table in parse_create_tables(";\n".join(ddl))]
+            matches = self.value_index.match(user_query, tables=tables, **self._namespace_kwargs())
+            span.set("matches", len(matches))
+        return ColumnValueIndex.format_matches(matches)
+
+    def _select_examples(self, embedding):
+        if not hasattr(self.vector_db, "get_similar_question_sql") or self.example_selector.k <= 0:
+            return []
+        with self.tracer.span("examples") as span:
+            candidates = self.vector_db.get_similar_question_sql(
+                embedding, n_results=self.example_selector.n_candidates, **self._namespace_kwargs())
+            examples = self.example_selector.select(embedding, candidates)
+            span.set_attributes(candidates=len(candidates["documents"][0]), examples=len(examples))
+        return examples
+
+    def _lookup(self, user_query):
+        """Return the canonical question, its cache key and its cached generation, if any."""
+        with self.tracer.span("normalize") as span:
+            entities = ([match["value"] for match in self.value_index.match(user_query, **self._namespace_kwargs())]
+                        if self.value_index is not None else None)
+            canonical = canonicalize(user_query, entities=entities)
+            key = self._scope, canonical.key, canonical.values
+            cached = self.sql_cache.get(key)
+            span.set_attributes(slots=len(canonical.slots), cache_hit=cached is not None)
+        return canonical, key, cached
+
+    def _generate(self, user_query, on_retrieved=None, use_templates=True):
+        """
+        Generate SQL for a question, from the caches when possible.
+
+        Returns the conversation, the parse result, the template binding and the cache entry. For
+        SQL bound from a template, the binding holds the template, the slot values to execute it
+        with parameters and the cache key, and the conversation is None. The cache entry holds
+        the cache key, the canonical question, the DDL and whether the SQL came from the SQL cache;
+        generated SQL is only cached by `_remember` once it is known to work.
+        """
+        canonical = key = cached = None
+        if self.sql_cache.maxsize > 0 or self.template_cache.enabled:
+            canonical, key, cached = self._lookup(user_query)
+        if cached is not None:
+            conversation, result, ddl = cached
+            if on_retrieved is not None:
+                on_retrieved(ddl)
+            return conversation, result, None, (key, canonical, ddl, True)
+        if canonical is not None and canonical.slots and use_templates:
+            with self.tracer.span("template") as span:
+                template = self.template_cache.lookup(key[1], canonical, scope=key[0])
+                span.set("hit", template is not None)
+            if template is not None:
+                result = ParseResult({"sql": template.render(canonical.values), "error": None})
+                return None, result, (template, canonical.values, key), None
+        conversation, result, ddl = self._generate_uncached(user_query, on_retrieved)
+        return conversation, result, None, (key, canonical, ddl, False) if key is not None else None
+
+    def _remember(self, entry, conversation, result, replace: bool = False):
+        """Cache SQL known to work, and its template, under the cache entry from `_generate`."""
+        if entry is None or (entry[3] and not replace) or not result.ok or not result.sql:
+            return
+        key, canonical, ddl, _ = entry
+        self.sql_cache.put(key, (conversation, result, ddl))
+        if self.template_cache.enabled and canonical.slots:
+            self.template_cache.add_ddl(ddl, scope=key[0])
+            self.template_cache.store(key[1], canonical, result.sql, scope=key[0])
+
+    def _forget(self, entry):
+        """Evict cached SQL that failed to execute."""
+        if entry is not None and entry[3]:
+            self.sql_cache.discard(entry[0])
+
+    def _generate_uncached(self, user_query, on_retrieved=None):
+        with self.tracer.span("embed"):
+            embedding = self.em_function.create_embedding(user_query)
+        with self.tracer.span("retrieve") as span:
+            if self.retrieval_depth is None:
+                ddl = self.vector_db.get_ddl(embedding, **self._namespace_kwargs())
+            else:
+                candidates = self.vector_db.get_ddl(embedding, n_results=self.retrieval_depth.n_candidates,
+                                                    **self._namespace_kwargs())
+                ddl = self.retrieval_depth.select(candidates)
+                span.set_attributes(candidates=len(candidates["documents"][0]), k=len(ddl["documents"][0]))
+                logger.debug("Kept %s of %s DDL candidates", len(ddl["documents"][0]),
+                             len(candidates["documents"][0]))
+
+            if self.tracer.hooks and ddl.get("ids"):
+                span.set("ids", ddl["ids"][0])
+            # Extracting documents only
+            ddl = ddl['documents'][0]
+            span.set("documents", len(ddl))
+        if self.join_graph is not None:
+            with self.tracer.span("joins") as span:
+                ddl, bridges = self.join_graph.expand(ddl, **self._namespace_kwargs())
+                span.set("bridges", len(bridges))
+        if on_retrieved is not None:
+            on_retrieved(ddl)
+        examples = self._select_examples(embedding)
+        values = self._match_values(user_query, ddl) if self.value_index is not None else None
+        with self.tracer.span("prompt") as span:
+            prompt = self._get_prompt(user_query, ddl, self.dialect, values=values, examples=examples)
+            if self.tracer.hooks:
+                span.set_attributes(**self.prompt_builder.describe(prompt, self.dialect))
+        conversation, result = self._complete(prompt)
+        return conversation, result, ddl
+
+    def generate_sql(self, user_query):
+        conversation, result, _, entry = self._generate(user_query)
+        self._remember(entry, conversation, result)
+        return result.data if result.ok else result.raw
+
+    def generate_related_question(self, query, follow_up_count, tables=None):
         prompt = RELATED_QUESTION_SYSTEM_PROMPT.format(n=follow_up_count)
-        tables = ""
+        tables = "\n\n".join(self.prompt_builder.schema_blocks(tables)) if tables else ""
         prompt = [{"role": "system", "content": prompt},
                   {"role": "user", "content": f"""Previous_question - {query}
                                             Tables - {tables}"""}]
-        response = self.llm.invoke_prompt(prompt)
+        response = self._invoke_llm(prompt)
         return response
 
-    def ask(self, query):
-        sql, error = None, None
+    def ask(self, query, profile: bool = False):
         if not query:
             raise NoTextProvided("Please provide a valid input!")
-        response = self.generate_sql(query)
-        if isinstance(response, dict):
-            sql = response["sql"]
-            error = response['error']
+        # Picked up by a registered `raxo.utils.profiling.ProfilingHook`
+        with self.tracer.span("ask", **({"profile": True} if profile else {})):
+            self._annotate(question=query, namespace=self.namespace)
+            return self._ask(query)
+
+    def ask_with_follow_ups(self, query, count=3, profile: bool = False):
+        """
+        Answer a question while generating follow-up questions in the background.
+
+        Follow-ups are requested as soon as the schema is retrieved, reusing it as their context,
+        so their LLM call overlaps the SQL generation instead of following it.
+
+        Args:
+            query (str): The user question.
+            count (int): The number of follow-up questions. Default is 3.
+            profile (bool): Whether a registered ProfilingHook profiles this request. Default is False.
+
+        Returns:
+            tuple: The `ask` result and a Future resolving to the follow-up questions.
+        """
+        if not query:
+            raise NoTextProvided("Please provide a valid input!")
+        futures = []
+        with self.tracer.span("ask", **({"profile": True} if profile else {})):
+            self._annotate(question=query, namespace=self.namespace)
+            result = self._ask(query, on_retrieved=lambda ddl: futures.append(
+                self._submit_follow_ups(query, count, ddl)))
+        if not futures:
+            futures.append(self._submit_follow_ups(query, count, None))
+        return result, futures[0]
+
+    def _annotate(self, **attributes):
+        """Record request fields, such as the question or the generated SQL, on the root span."""
+        if not self.tracer.hooks:
+            return
+        span = self.tracer.current_span
+        if span is not None:
+            span.root.set_attributes(**attributes)
+
+    def _follow_up_key(self, text, count, tables):
+        # The tables are part of the prompt, so follow-ups generated with other tables differ
+        return json.dumps(self.namespace, sort_keys=True, default=str), text.strip(), count, tuple(tables or ())
+
+    def _submit_follow_ups(self, text, count, tables, inline: bool = False) -> Future:
+        """
+        Return the future follow-up questions of a text, starting their generation if no caller
+        has: on the follow-up workers, or on the calling thread with `inline`.
+        """
+        key = self._follow_up_key(text, count, tables)
+        started = []
+
+        def start():
+            future = Future() if inline else self._executor.submit(self._follow_ups, text, count, tables)
+            started.append(future)
+            return future
+
+        # The pending future is cached too, so concurrent callers share one LLM call
+        future = self._follow_up_cache.setdefault(key, start)
+        if started and inline and future.set_running_or_notify_cancel():
+            try:
+                future.set_result(self._follow_ups(text, count, tables))
+            except Exception as e:
+                future.set_exception(e)
+        future.add_done_callback(
+            lambda done: self._follow_up_cache.discard(key, done) if done.exception() is not None else None)
+        return future
+
+    def _follow_ups(self, text, count, tables):
+        with self.tracer.span("follow_up"):
+            return self.generate_related_question(text, count, tables=tables)
+
+    def sessions(self) -> list:
+        """Return the distinct provider sessions of the LLM and embedding clients."""
+        sessions = {}
+        for component in (self.llm, self.em_function):
+            session = getattr(component, "session", None)
+            if session is not None:
+                sessions[id(session)] = session
+        return list(sessions.values())
+
+    def warm_up(self) -> int:
+        """
+        Open provider connections ahead of the first question.
+
+        Returns:
+            int: The number of endpoints reached.
+        """
+        with self.tracer.span("warm_up") as span:
+            reached = sum(session.warm_up() for session in self.sessions())
+            span.set("endpoints", reached)
+        return reached
+
+    def close(self):
+        """
+        Shut down the background follow-up workers, waiting for pending generations, then the
+        embedding and the trace hooks owning resources, such as a QueryLog.
+        """
+        self._executor.shutdown(wait=True)
+        for component in (self.em_function, *self.tracer.hooks):
+            close = getattr(component, "close", None)
+            if close is not None:
+                close()
+
+    def _execute(self, sql, params=None):
+        with self.tracer.span("execute") as span:
+            # Connectors without parameter support keep working for generated SQL
+            result = self.database.execute_query(sql, params) if params else self.database.execute_query(sql)
+            if isinstance(result, ResultSet):
+                span.set_attributes(rows=len(result), result_bytes=result.nbytes, spilled=result.spilled)
+            elif isinstance(result, list):
+                span.set("rows", len(result))
+        return result
+
+    def _record_repair(self, **counts):
+        with self._stats_lock:
+            for key, value in counts.items():
+                self.repair_stats[key] += value
+
+    def _execute_with_repair(self, conversation, sql):
+        """
+        Execute SQL, feeding database errors back to the LLM for at most `repair_attempts` fixes.
+
+        The conversation already holds the retrieved context, so a repair costs one LLM call and
+        no embedding or retrieval. Repairs stop once `repair_timeout` seconds have elapsed.
+
+        Returns the query result or error message, the SQL that executed successfully and its
+        conversation; the SQL is None when every attempt failed.
+        """
+        start = time.perf_counter()
+        attempts = 0
+        while True:
+            try:
+                result = self._execute(sql)
+            except QueryExecutionError as e:
+                if attempts == 0:
+                    self._record_repair(failures=1)
+                timed_out = self.repair_timeout is not None and time.perf_counter() - start >= self.repair_timeout
+                if attempts >= self.repair_attempts or timed_out:
+                    self._record_repair(exhausted=1)
+                    self._annotate(sql=sql, outcome="execution_error")
+                    return f"something went wrong while executing the query -> {e}", None, conversation
+                attempts += 1
+                self._record_repair(attempts=1)
+                with self.tracer.span("repair", attempt=attempts):
+                    conversation, response = self._complete(
+                        conversation + [{"role": "user", "content": REPAIR_PROMPT.format(error=e)}])
+                if not response.sql:
+                    self._record_repair(exhausted=1)
+                    self._annotate(sql=sql, outcome="execution_error")
+                    message = response.error or f"something went wrong, Here is the LLM response -> {response.raw}"
+                    return message, None, conversation
+                sql = response.sql
+                continue
+            if attempts:
+                self._record_repair(repaired=1)
+            self._annotate(sql=sql, outcome="repaired" if attempts else "ok")
+            return result, sql, conversation
+
+    def _ask(self, query, on_retrieved=None):
+        conversation, response, binding, entry = self._generate(query, on_retrieved=on_retrieved)
+        if self.execute_query and binding is not None:
+            template, values, key = binding
+            try:
+                result = self._execute(*template.render(values, getattr(self.database, "paramstyle", "format")))
+                self._annotate(sql=response.sql, outcome="ok")
+                return result
+            except QueryExecutionError as e:
+                # The template does not fit this question after all, drop it and generate the SQL instead
+                logger.warning("SQL bound from a template failed, regenerating: %s", e)
+                self.template_cache.discard(key[1], template, scope=key[0])
+                conversation, response, _, entry = self._generate(query, on_retrieved=on_retrieved,
+                                                                  use_templates=False)
+        sql, error = response.sql, response.error
         if self.execute_query and sql:
-            result = self.database.execute_query(sql)
+            result, working_sql, conversation = self._execute_with_repair(conversation, sql)
+            if working_sql is None:
+                self._forget(entry)
+            elif working_sql == sql:
+                self._remember(entry, conversation, response)
+            else:
+                # The repaired SQL is cached, so repeats of the question do not pay for the repair again
+                self._remember(entry, conversation, ParseResult({"sql": working_sql, "error": None}), replace=True)
         elif sql and not error:
+            self._annotate(sql=sql, outcome="ok")
+            self._remember(entry, conversation, response)
             result = sql
         elif not sql and error:
+            self._annotate(outcome="no_sql")
             result = error
         else:
-            result = f"something went wrong, Here is the LLM response -> {response}"
+            self._annotate(outcome="no_sql")
+            result = f"something went wrong, Here is the LLM response -> {response.raw}"
         return result
 
-    def get_follow_up_questions(self, sql_query, count=3):
+    def get_follow_up_questions(self, sql_query, count=3, tables=None):
         if not sql_query:
             raise NoTextProvided("Please provide a valid input!")
-        questions = self.generate_related_question(sql_query, count)
+        # Served from the cache filled by `ask_with_follow_ups` and earlier calls with the same
+        # tables; otherwise generated on this thread rather than queued behind the follow-up workers
+        return self._submit_follow_ups(sql_query, count, tables, inline=True).result()
+
+    def refresh_value_index(self, max_age: float | None = None) -> int:
+        """
+        Re-harvest the stale columns of the value index through the database connector.
+
+        Args:
+            max_age (float | None): The age in seconds after which a column is stale. Default is
+                the index's `refresh_interval`.
 
-        return questions
+        Returns:
+            int: The number of columns indexed.
+        """
+        if self.value_index is None or self.database is None:
+            return 0
+        with self.tracer.span("refresh_values"):
+            return self.value_index.refresh(self.database, self.dialect, max_age=max_age, **self._namespace_kwargs())
+
+    def harvest_foreign_keys(self) -> int:
+        """
+        Add the foreign keys declared in the database catalog to the join graph.
+
+        Returns:
+            int: The number of foreign key columns read.
+        """
+        if self.join_graph is None or self.database is None:
+            return 0
+        with self.tracer.span("harvest_foreign_keys"):
+            return self.join_graph.harvest(self.database, self.dialect, **self._namespace_kwargs())
+
+    def load_join_graph(self) -> int:
+        """
+        Rebuild the join graph from the DDL stored in the vector store.
+
+        A store trained before a restart, or by another process, holds tables the graph has not
+        seen, and join paths only run through tables with known DDL. Each document is added to the
+        namespace it was trained in, read from its metadata, and the paths are precomputed.
+
+        Returns:
+            int: The number of tables added.
+        """
+        if self.join_graph is None or not hasattr(self.vector_db, "list_ddl"):
+            return 0
+        with self.tracer.span("load_join_graph") as span:
+            stored = self.vector_db.list_ddl(**self._namespace_kwargs())
+            namespaces, added = {}, 0
+            for document, metadata in zip(stored["documents"], stored["metadatas"] or [None] * len(stored["ids"])):
+                namespace = {key: value for key, value in (metadata or {}).items() if key != "original"} or None
+                added += self.join_graph.add_ddl((metadata or {}).get("original") or document, namespace=namespace,
+                                                 compact=document)
+                namespaces[json.dumps(namespace, sort_keys=True, default=str)] = namespace
+            for namespace in namespaces.values():
+                self.join_graph.precompute(namespace)
+            span.set("tables", added)
+        return added
 
     def train(self, question: str = None, sql: str = None, ddl: str = None, documentation: str = None):
+        self._invalidate()
+        trained = self._train_one(question, sql, ddl, documentation)
+        if ddl:
+            self._precompute_join_paths()
+        return trained
+
+    def train_many(self, sql=None, ddl=None, documentation=None) -> list:
+        """
+        Train on many items, embedding them in bulk.
+
+        The texts are embedded with one `create_embeddings` call, which embeddings such as
+        LocalEmbeddings batch and spread across processes, instead of one call per item.
+
+        Args:
+            sql (list | None): SQL queries, or (question, sql) pairs. Default is None.
+            ddl (list[str] | None): DDL statements. Default is None.
+            documentation (list[str] | None): Documentation texts. Default is None.
+
+        Returns:
+            list: The ids of the stored items, SQL first, then DDL, then documentation.
+        """
+        # Empty items are skipped, as `train` ignores them
+        items = [(None, item, None, None) if isinstance(item, str) else (item[0], item[1], None, None)
+                 for item in sql or [] if item and (isinstance(item, str) or item[1])]
+        items += [(None, None, item, None) for item in ddl or [] if item]
+        items += [(None, None, None, item) for item in documentation or [] if item]
+        # Compacted before embedding, so the embedding matches the stored document
+        originals = [item[2] if item[2] and self.compact_ddl else None for item in items]
+        items = [(question, sql, self._compact(original) if original else ddl, documentation)
+                 for (question, sql, ddl, documentation), original in zip(items, originals)]
+        if not items:
+            return []
+        self._invalidate()
+        with self.tracer.span("train_many", items=len(items)):
+            with self.tracer.span("embed", texts=len(items)):
+                embeddings = self.em_function.create_embeddings(
+                    [question or sql or ddl or documentation for question, sql, ddl, documentation in items])
+            ids = [self._train_one(*item, embedding=embedding, original=original)
+                   for item, embedding, original in zip(items, embeddings, originals)]
+            if ddl:
+                self._precompute_join_paths()
+            return ids
+
+    def _precompute_join_paths(self):
+        if self.join_graph is not None:
+            with self.tracer.span("join_paths") as span:
+                span.set("tables", self.join_graph.precompute(**self._namespace_kwargs()))
+
+    def _invalidate(self):
+        # New context can change the SQL generated in this namespace and in the namespaces it
+        # contains, which retrieve its documents; other tenants keep their cached SQL
+        scope = self._scope
+        self.sql_cache.discard_if(lambda key: key[0] <= scope)
+        self.template_cache.invalidate(self.namespace)
+
+    def _compact(self, ddl):
+        with self.tracer.span("compact") as span:
+            compact = compact_ddl(ddl, self.dialect)
+            span.set_attributes(tokens_before=estimate_tokens(ddl), tokens_after=estimate_tokens(compact))
+        return compact
+
+    def _train_one(self, question, sql, ddl, documentation, embedding=None, original=None):
+        if sql:
+            with self.tracer.span("train", kind="sql") as span:
+                if span.parent is None:
+                    self._annotate(question=question, sql=sql, namespace=self.namespace)
+                # Without a question, the SQL itself is embedded and rendered alone as an example
+                if embedding is None:
+                    with self.tracer.span("embed"):
+                        embedding = self.em_function.create_embedding(question or sql)
+                return self.vector_db.add_question_sql(question or sql, sql, embedding, **self._namespace_kwargs())
         if ddl:
-            embedding = self.em_function.create_embedding(ddl)
-            return self.vector_db.add_ddl(ddl, embedding)
+            with self.tracer.span("train", kind="ddl") as span:
+                if span.parent is None:
+                    self._annotate(ddl=original or ddl, namespace=self.namespace)
+                if original is None and self.compact_ddl:
+                    original, ddl = ddl, self._compact(ddl)
+                if embedding is None:
+                    with self.tracer.span("embed"):
+                        embedding = self.em_function.create_embedding(ddl)
+                kwargs = self._namespace_kwargs()
+                if original is not None and original != ddl:
+                    kwargs["original"] = original
+                ddl_id = self.vector_db.add_ddl(ddl, embedding, **kwargs)
+                self.template_cache.add_ddl(ddl, scope=self._scope)
+                # Keys and column lengths are parsed from the statement as written, compaction drops them
+                if self.join_graph is not None:
+                    self.join_graph.add_ddl(original or ddl, compact=ddl, **self._namespace_kwargs())
+                if self.value_index is not None and self.database is not None:
+                    with self.tracer.span("harvest_values") as span:
+                        span.set("columns", self.value_index.harvest(self.database, original or ddl, self.dialect,
+                                                                     **self._namespace_kwargs()))
+                return ddl_id
+        if documentation:
+            with self.tracer.span("train", kind="documentation") as span:
+                if span.parent is None:
+                    self._annotate(documentation=documentation, namespace=self.namespace)
+                if embedding is None:
+                    with self.tracer.span("embed"):
+                        embedding = self.em_function.create_embedding(documentation)
+                return self.vector_db.add_documentation(documentation, embedding, **self._namespace_kwargs())
@@ -0,0 +1,153 @@
+"""
+Example Selection Module
+
+This module provides the ExampleSelector class, which picks few-shot question/SQL examples for the
+prompt. Plain top-k retrieval tends to return near-identical SQL, so candidates are re-ranked with
+maximal marginal relevance (MMR): each pick maximizes its similarity to the question minus its
+highest similarity to the examples already picked. Picking stops at a token budget.
+
+Similarities are computed in one vectorized pass over the candidate embeddings with numpy when it
+is installed, and with plain Python otherwise.
+
+Classes:
+    ExampleSelector: Selects diverse few-shot examples within a token budget.
+
+Usage Example:
+    raxo = Raxo(llm=open_ai, vector_db=chroma, em_function=embed,
+                example_selector=ExampleSelector(k=3, diversity=0.4, token_budget=600))
+    raxo.train(question="total sales per region", sql="SELECT region, SUM(amount) FROM sales GROUP BY region")
+"""
+
+import math
+from typing import List
+
+from ..utils.tokens import estimate_tokens
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _normalize_rows(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _cosine(a, b) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def mmr(query_embedding, candidate_embeddings, k: int, diversity: float = 0.5) -> List[int]:
+    """
+    Rank candidates by maximal marginal relevance.
+
+    Args:
+        query_embedding (list[float]): The question embedding.
+        candidate_embeddings (list[list[float]]): The candidate embeddings.
+        k (int): The number of candidates to pick.
+        diversity (float): The weight of dissimilarity to earlier picks, from 0 (plain relevance)
+            to 1 (maximum diversity). Default is 0.5.
+
+    Returns:
+        list[int]: The indexes of the picked candidates, in pick order.
+    """
+    count = len(candidate_embeddings)
+    k = min(k, count)
+    if k <= 0:
+        return []
+    if np is not None:
+        candidates = _normalize_rows(np.asarray(candidate_embeddings, dtype=np.float32))
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        relevance = candidates @ query
+        similarity = candidates @ candidates.T
+        redundancy = np.full(count, -np.inf, dtype=np.float32)
+        picked = []
+        available = np.ones(count, dtype=bool)
+        for _ in range(k):
+            penalty = np.where(np.isfinite(redundancy), redundancy, 0.0)
+            scores = np.where(available, (1 - diversity) * relevance - diversity * penalty, -np.inf)
+            best = int(np.argmax(scores))
+            picked.append(best)
+            available[best] = False
+            redundancy = np.maximum(redundancy, similarity[best])
+        return picked
+
+    relevance = [_cosine(query_embedding, candidate) for candidate in candidate_embeddings]
+    redundancy = [None] * count
+    picked = []
+    for _ in range(k):
+        best, best_score = None, -math.inf
+        for index in range(count):
+            if index in picked:
+                continue
+            score = (1 - diversity) * relevance[index] - diversity * (redundancy[index] or 0.0)
+            if score > best_score:
+                best, best_score = index, score
+        picked.append(best)
+        for index in range(count):
+            similarity = _cosine(candidate_embeddings[best], candidate_embeddings[index])
+            redundancy[index] = similarity if redundancy[index] is None else max(redundancy[index], similarity)
+    return picked
+
+
+class ExampleSelector:
+    """
+    Selects diverse few-shot examples within a token budget.
+
+    Attributes:
+        k (int): The maximum number of examples.
+        n_candidates (int): The number of nearest examples retrieved before re-ranking.
+        diversity (float): The MMR diversity weight.
+        token_budget (int | None): The maximum number of prompt tokens spent on examples.
+    """
+
+    def __init__(self, k: int = 3, n_candidates: int = 20, diversity: float = 0.5, token_budget: int | None = 800):
+        """
+        Initialize an instance of the ExampleSelector class.
+
+        Args:
+            k (int): The maximum number of examples. Default is 3.
+            n_candidates (int): The number of nearest examples retrieved before re-ranking. Default is 20.
+            diversity (float): The MMR diversity weight, from 0 to 1. Default is 0.5.
+            token_budget (int | None): The maximum number of prompt tokens spent on examples.
+                Default is 800; None means no budget.
+        """
+        self.k = k
+        self.n_candidates = n_candidates
+        self.diversity = diversity
+        self.token_budget = token_budget
+
+    def select(self, question_embedding, candidates: dict) -> List[dict]:
+        """
+        Pick examples among retrieved candidates.
+
+        Args:
+            question_embedding (list[float]): The question embedding.
+            candidates (dict): A Chroma-shaped query result including `embeddings`, where documents
+                are the example questions and metadatas hold their `sql`.
+
+        Returns:
+            list[dict]: {"question", "sql"} examples in pick order; the question is None for
+                examples trained from SQL alone.
+        """
+        documents = (candidates.get("documents") or [[]])[0]
+        embeddings = (candidates.get("embeddings") or [[]])[0]
+        metadatas = (candidates.get("metadatas") or [[]])[0]
+        if not documents or embeddings is None or len(embeddings) == 0:
+            return []
+        examples, spent = [], 0
+        for index in mmr(question_embedding, embeddings, self.k, self.diversity):
+            sql = (metadatas[index] or {}).get("sql", "")
+            # Examples trained without a question store their SQL as the document
+            example = {"question": documents[index] if documents[index] != sql else None, "sql": sql}
+            cost = estimate_tokens(example["question"] or "") + estimate_tokens(sql)
+            if self.token_budget is not None and spent + cost > self.token_budget:
+                break
+            examples.append(example)
+            spent += cost
+        return examples
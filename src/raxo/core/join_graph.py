@@ -0,0 +1,391 @@
+"""
+Join Graph Module
+
+This module provides the JoinGraph class, a graph of the tables of the trained schema connected by
+their foreign keys. Vector retrieval returns the tables closest to a question, which for a
+question spanning two tables often misses the bridge table joining them ("products bought by each
+customer" retrieves `customers` and `products`, not `orders` and `order_items`). The graph adds
+the fewest tables connecting the retrieved ones to the prompt.
+
+Edges come from:
+    - foreign keys declared in the trained DDL, inline (`REFERENCES`) or as table constraints,
+    - foreign keys harvested from the database catalog (`information_schema`, `v_catalog`, SQLite
+      pragmas) with `harvest`,
+    - optionally, naming conventions: a `customer_id` column references the `customer`, `customers`
+      or `customer`-like table with a single-column primary key or an `id` column.
+
+Shortest join paths are computed by breadth-first search, at most `max_hops` edges long, and kept
+per source table until the schema changes; `precompute` fills them for every table at once. At
+question time the retrieved tables are connected by the shortest paths between them, shortest
+first, skipping tables already connected (a minimum spanning tree over the path lengths), and the
+tables on those paths are added, at most `max_bridges` per question.
+
+Graphs are kept per namespace scope (see `raxo.utils.cache.namespace_scope`), so bridge tables
+never come from another tenant's schema. A question sees the tables and edges of every scope
+containing its own, merged into one graph.
+
+Classes:
+    JoinGraph: A foreign key graph expanding retrieved tables with the tables joining them.
+
+Usage Example:
+    graph = JoinGraph(max_hops=3, max_bridges=3)
+    raxo = Raxo(llm=open_ai, database=mysql_connector, vector_db=chroma, em_function=embed, join_graph=graph)
+    raxo.train(ddl="CREATE TABLE orders (id INT PRIMARY KEY, customer_id INT REFERENCES customers(id))")
+    raxo.harvest_foreign_keys()           # declared keys of the live database
+    graph.path("customers", "products")   # ["customers", "orders", "order_items", "products"]
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import List
+
+from ..utils.cache import LRUCache, namespace_scope
+from ..utils.ddl import parse_create_table, split_statements
+
+logger = logging.getLogger(__name__)
+
+_CATALOG_QUERIES = {
+    "mysql": "SELECT TABLE_NAME, COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME "
+             "FROM information_schema.KEY_COLUMN_USAGE "
+             "WHERE REFERENCED_TABLE_NAME IS NOT NULL AND TABLE_SCHEMA = DATABASE()",
+    "vertica": "SELECT table_name, column_name, reference_table_name, reference_column_name "
+               "FROM v_catalog.foreign_keys",
+    "sqlite": "SELECT m.name, p.\"from\", p.\"table\", p.\"to\" "
+              "FROM sqlite_master m JOIN pragma_foreign_key_list(m.name) p WHERE m.type = 'table'",
+}
+
+
+def _table_key(name: str) -> str:
+    return name.split(".")[-1].lower()
+
+
+def _referenced_names(stem: str) -> tuple:
+    """Return the table names an `<stem>_id` column may reference."""
+    names = (stem, stem + "s", stem + "es")
+    return names + (stem[:-1] + "ies",) if stem.endswith("y") else names
+
+
+class _Schema:
+    """The tables and edges of one namespace."""
+
+    def __init__(self):
+        self.ddl = {}
+        self.keys = {}
+        self.edges = {}
+        # Maps a candidate referenced table name to the (table, column) pairs of `*_id` columns
+        self.id_columns = {}
+
+    @classmethod
+    def merge(cls, schemas: list) -> "_Schema":
+        """Return the union of the tables and edges of several schemas."""
+        merged = cls()
+        for schema in schemas:
+            merged.ddl.update(schema.ddl)
+            merged.keys.update(schema.keys)
+            for table, neighbors in schema.edges.items():
+                for target, joins in neighbors.items():
+                    existing = merged.edges.setdefault(table, {}).setdefault(target, [])
+                    existing.extend(join for join in joins if join not in existing)
+        return merged
+
+
+class JoinGraph:
+    """
+    A foreign key graph expanding retrieved tables with the tables joining them.
+
+    Attributes:
+        max_hops (int): The longest join path, in edges.
+        max_bridges (int): The maximum number of tables added to one question.
+        infer (bool): Whether `*_id` columns are linked to tables by naming convention.
+    """
+
+    def __init__(self, max_hops: int = 3, max_bridges: int = 3, infer: bool = True, cache_size: int = 4096):
+        """
+        Initialize an instance of the JoinGraph class.
+
+        Args:
+            max_hops (int): The longest join path, in edges. Default is 3.
+            max_bridges (int): The maximum number of tables added to one question. Default is 3.
+            infer (bool): Whether to link `*_id` columns to tables by naming convention. Default is True.
+            cache_size (int): The number of tables whose shortest paths are kept. Default is 4096.
+        """
+        self.max_hops = max_hops
+        self.max_bridges = max_bridges
+        self.infer = infer
+        self._schemas = {}
+        # Maps a question scope to the merged schema of the scopes containing it
+        self._views = {}
+        self._paths = LRUCache(cache_size)
+        self._lock = threading.Lock()
+
+    def _schema(self, namespace: dict | None) -> _Schema:
+        """Return the schema a namespace is trained into; the lock is held and the views are dropped."""
+        scope = namespace_scope(namespace)
+        schema = self._schemas.get(scope)
+        if schema is None:
+            schema = self._schemas[scope] = _Schema()
+        self._views.clear()
+        return schema
+
+    def _view(self, namespace: dict | None) -> tuple:
+        """Return the scope of a question and the schema it sees, None when nothing was trained in it."""
+        scope = namespace_scope(namespace)
+        with self._lock:
+            view = self._views.get(scope)
+            if view is None:
+                # A question scope sees every scope containing it, like `TemplateCache.tables`
+                schemas = [schema for schema_scope, schema in self._schemas.items() if scope <= schema_scope]
+                if not schemas:
+                    return scope, None
+                view = self._views[scope] = schemas[0] if len(schemas) == 1 else _Schema.merge(schemas)
+        return scope, view
+
+    def _link(self, schema: _Schema, table: str, column: str, referenced_table: str, referenced_column: str,
+              inferred: bool):
+        if table == referenced_table:
+            return
+        condition = (column, referenced_column, inferred)
+        for source, target, join in ((table, referenced_table, condition),
+                                     (referenced_table, table, (referenced_column, column, inferred))):
+            joins = schema.edges.setdefault(source, {}).setdefault(target, [])
+            if join[:2] not in [existing[:2] for existing in joins]:
+                joins.append(join)
+
+    def _infer(self, schema: _Schema, table: str, columns: list):
+        for column in columns:
+            lowered = column.lower()
+            if lowered.endswith("_id") and len(lowered) > 3:
+                for name in _referenced_names(lowered[:-3]):
+                    schema.id_columns.setdefault(name, set()).add((table, column))
+        # Links in both directions: from this table's `*_id` columns, and from earlier tables to this one
+        for name in {table} | {name for column in columns if column.lower().endswith("_id")
+                               for name in _referenced_names(column.lower()[:-3])}:
+            target_key = schema.keys.get(name)
+            if target_key is None:
+                continue
+            for source, column in schema.id_columns.get(name, ()):
+                # A declared key of the column, to this or another table, wins over the convention
+                if not any(join[0] == column for joins in schema.edges.get(source, {}).values() for join in joins):
+                    self._link(schema, source, column, name, target_key, inferred=True)
+
+    def add_ddl(self, ddl: str, namespace: dict | None = None, compact: str | None = None) -> int:
+        """
+        Add the tables and declared foreign keys of DDL statements.
+
+        Args:
+            ddl (str): One or more CREATE TABLE statements, as written.
+            namespace (dict | None): The namespace the tables belong to. Default is None.
+            compact (str | None): The compacted form of the statements, added to prompts instead of
+                `ddl`. Default is None.
+
+        Returns:
+            int: The number of tables added.
+        """
+        prompts = {}
+        for statement in split_statements(compact or ""):
+            table = parse_create_table(statement)
+            if table is not None:
+                prompts[_table_key(table["name"])] = statement.strip()
+        added = 0
+        with self._lock:
+            schema = self._schema(namespace)
+            for statement in split_statements(ddl):
+                table = parse_create_table(statement)
+                if table is None:
+                    continue
+                name = _table_key(table["name"])
+                columns = [column["name"] for column in table["columns"]]
+                schema.ddl[name] = prompts.get(name, statement.strip())
+                if len(table["primary_key"]) == 1:
+                    schema.keys[name] = table["primary_key"][0]
+                elif any(column.lower() == "id" for column in columns):
+                    schema.keys[name] = next(column for column in columns if column.lower() == "id")
+                for foreign_key in table["foreign_keys"]:
+                    referenced = foreign_key["referenced_columns"] or [None] * len(foreign_key["columns"])
+                    for column, referenced_column in zip(foreign_key["columns"], referenced):
+                        self._link(schema, name, column, _table_key(foreign_key["table"]), referenced_column,
+                                   inferred=False)
+                if self.infer:
+                    self._infer(schema, name, columns)
+                added += 1
+        # Cleared outside the graph lock, which path searches take under the cache lock
+        self._paths.clear()
+        return added
+
+    def add_foreign_key(self, table: str, column: str, referenced_table: str, referenced_column: str | None = None,
+                        namespace: dict | None = None):
+        """
+        Add a declared foreign key.
+
+        Args:
+            table (str): The referencing table.
+            column (str): The referencing column.
+            referenced_table (str): The referenced table.
+            referenced_column (str | None): The referenced column. Default is None, unknown.
+            namespace (dict | None): The namespace of the tables. Default is None.
+        """
+        with self._lock:
+            self._link(self._schema(namespace), _table_key(table), column, _table_key(referenced_table),
+                       referenced_column, inferred=False)
+        self._paths.clear()
+
+    def harvest(self, database, dialect: str | None = None, namespace: dict | None = None) -> int:
+        """
+        Add the foreign keys declared in the database catalog.
+
+        Args:
+            database: A connector exposing `execute_query(sql)`.
+            dialect (str | None): "MySQL", "Vertica" or "SQLite". Default is the connector's `dialect`.
+            namespace (dict | None): The namespace of the tables. Default is None.
+
+        Returns:
+            int: The number of foreign key columns read.
+        """
+        dialect = (dialect or getattr(database, "dialect", "MySQL")).lower()
+        query = _CATALOG_QUERIES.get(dialect)
+        if query is None:
+            logger.warning("Foreign keys cannot be harvested from %s databases", dialect)
+            return 0
+        try:
+            rows = database.execute_query(query) or []
+        except Exception as e:
+            logger.warning("Could not harvest foreign keys: %s", e)
+            return 0
+        for table, column, referenced_table, referenced_column in rows:
+            self.add_foreign_key(table, column, referenced_table, referenced_column, namespace=namespace)
+        return len(rows)
+
+    def remove_table(self, table: str, namespace: dict | None = None):
+        """Remove a table and its edges."""
+        name = _table_key(table)
+        with self._lock:
+            schema = self._schema(namespace)
+            schema.ddl.pop(name, None)
+            schema.keys.pop(name, None)
+            for neighbor in schema.edges.pop(name, {}):
+                schema.edges.get(neighbor, {}).pop(name, None)
+        self._paths.clear()
+
+    def _parents(self, schema: _Schema, scope: frozenset, source: str) -> dict:
+        """Return the breadth-first predecessor of every table within `max_hops` of a source."""
+        return self._paths.setdefault((scope, source), lambda: self._search(schema, source))
+
+    def _search(self, schema: _Schema, source: str) -> dict:
+        with self._lock:
+            return self._breadth_first(schema, source)
+
+    def _breadth_first(self, schema: _Schema, source: str) -> dict:
+        parents, queue = {source: None}, deque([(source, 0)])
+        while queue:
+            table, depth = queue.popleft()
+            if depth == self.max_hops:
+                continue
+            neighbors = schema.edges.get(table, {})
+            # Declared keys first, so they win ties against inferred ones
+            for neighbor in sorted(neighbors, key=lambda name: all(join[2] for join in neighbors[name])):
+                # Only tables with known DDL can be shown to the model
+                if neighbor not in parents and neighbor in schema.ddl:
+                    parents[neighbor] = table
+                    queue.append((neighbor, depth + 1))
+        return parents
+
+    def path(self, source: str, target: str, namespace: dict | None = None) -> List[str] | None:
+        """
+        Return the shortest join path between two tables.
+
+        Args:
+            source (str): The first table.
+            target (str): The second table.
+            namespace (dict | None): The namespace of the tables. Default is None.
+
+        Returns:
+            list[str] | None: The tables from source to target, or None when they are not connected
+            within `max_hops` edges.
+        """
+        source, target = _table_key(source), _table_key(target)
+        scope, schema = self._view(namespace)
+        if schema is None or source not in schema.ddl:
+            return None
+        parents = self._parents(schema, scope, source)
+        if target not in parents:
+            return None
+        path = [target]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        return path[::-1]
+
+    def precompute(self, namespace: dict | None = None) -> int:
+        """
+        Compute the shortest paths from every table of a namespace.
+
+        Returns:
+            int: The number of tables searched from.
+        """
+        scope, schema = self._view(namespace)
+        if schema is None:
+            return 0
+        for table in list(schema.ddl):
+            self._parents(schema, scope, table)
+        return len(schema.ddl)
+
+    def expand(self, ddl: List[str], namespace: dict | None = None) -> tuple:
+        """
+        Add the DDL of the fewest tables connecting the retrieved ones.
+
+        Args:
+            ddl (list[str]): The retrieved DDL documents.
+            namespace (dict | None): The namespace of the question. Default is None.
+
+        Returns:
+            tuple: The DDL documents followed by the DDL of the added tables, and the names of the
+            added tables.
+        """
+        _, schema = self._view(namespace)
+        if schema is None or self.max_bridges <= 0:
+            return ddl, []
+        retrieved = []
+        for document in ddl:
+            for statement in split_statements(document):
+                table = parse_create_table(statement)
+                if table is not None and _table_key(table["name"]) in schema.ddl:
+                    retrieved.append(_table_key(table["name"]))
+        retrieved = list(dict.fromkeys(retrieved))
+        if len(retrieved) < 2:
+            return ddl, []
+
+        paths = []
+        for index, source in enumerate(retrieved):
+            for target in retrieved[index + 1:]:
+                path = self.path(source, target, namespace)
+                if path is not None:
+                    paths.append(path)
+        # Kruskal over the metric closure: connect the closest components first
+        component = {table: table for table in retrieved}
+
+        def find(table):
+            while component[table] != table:
+                component[table] = component[component[table]]
+                table = component[table]
+            return table
+
+        known, bridges = set(retrieved), []
+        for path in sorted(paths, key=len):
+            first, last = find(path[0]), find(path[-1])
+            if first == last:
+                continue
+            added = [table for table in path[1:-1] if table not in known]
+            if len(bridges) + len(added) > self.max_bridges:
+                continue
+            component[first] = last
+            bridges += added
+            known.update(added)
+        return ddl + [schema.ddl[table] for table in bridges], bridges
+
+    def stats(self, namespace: dict | None = None) -> dict:
+        """Return the number of tables, of declared and inferred edges and of cached path searches."""
+        schema = self._view(namespace)[1] or _Schema()
+        joins = [join for table, neighbors in schema.edges.items() for target, conditions in neighbors.items()
+                 if table < target for join in conditions]
+        return {"tables": len(schema.ddl), "declared": sum(not join[2] for join in joins),
+                "inferred": sum(join[2] for join in joins), "cached_paths": len(self._paths)}
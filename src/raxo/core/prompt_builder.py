@@ -0,0 +1,142 @@
+"""
+Prompt Builder Module
+
+This module assembles the SQL generation prompt in an order that lets providers cache its prefix.
+Content is laid out from most static to most dynamic: the instructions, then the SQL dialect,
+then the schema blocks (pinned ones first, retrieved ones sorted deterministically), then the
+column values matched in the question, then the retrieved examples and finally the user question.
+Two requests retrieving the same tables, in any order, therefore share their schema prefix, and all
+requests share the instructions.
+
+Classes:
+    PromptBuilder: Builds chat prompts for SQL generation.
+
+Usage Example:
+    builder = PromptBuilder(pinned_schema=["CREATE TABLE calendar (day DATE, fiscal_week INT)"])
+    prompt = builder.build("what are my region sales", tables=retrieved_ddl, dialect="MySQL")
+    raxo = Raxo(llm=open_ai, vector_db=chroma, em_function=embed, prompt_builder=builder)
+"""
+
+from typing import List
+
+from ..utils.prompts import (NLQ_DIALECT_SECTION, NLQ_EXAMPLES_SECTION, NLQ_INSTRUCTIONS, NLQ_TABLES_SECTION,
+                             NLQ_VALUES_SECTION)
+from ..utils.tokens import estimate_prompt_tokens, estimate_tokens
+
+
+class PromptBuilder:
+    """
+    Builds chat prompts for SQL generation with a cache-friendly layout.
+
+    Attributes:
+        instructions (str): The static instructions opening the system prompt.
+        pinned_schema (list[str]): Schema blocks always included, ahead of retrieved ones.
+        sort_schema (bool): Whether retrieved schema blocks are sorted so their order is stable.
+    """
+
+    def __init__(self, instructions: str = NLQ_INSTRUCTIONS, pinned_schema: List[str] | None = None,
+                 sort_schema: bool = True):
+        """
+        Initialize an instance of the PromptBuilder class.
+
+        Args:
+            instructions (str): The static instructions. Default is NLQ_INSTRUCTIONS.
+            pinned_schema (list[str] | None): Schema blocks to include in every prompt, e.g. the
+                tables most questions touch. They extend the cacheable prefix. Default is None.
+            sort_schema (bool): Whether to sort retrieved schema blocks. Default is True.
+        """
+        self.instructions = instructions
+        self.pinned_schema = [block.strip() for block in pinned_schema or []]
+        self.sort_schema = sort_schema
+
+    def static_prefix(self, dialect: str) -> str:
+        """
+        Return the part of the system prompt shared by every request for a dialect.
+
+        Args:
+            dialect (str): The SQL dialect, e.g. "MySQL".
+
+        Returns:
+            str: The instructions followed by the dialect section.
+        """
+        return self.instructions + NLQ_DIALECT_SECTION.format(database=dialect)
+
+    def schema_blocks(self, tables) -> List[str]:
+        """
+        Order schema blocks for the prompt.
+
+        Pinned blocks come first, in their given order, followed by the retrieved blocks not
+        already pinned, de-duplicated and sorted when `sort_schema` is set.
+
+        Args:
+            tables (list[str] | str | None): The retrieved schema blocks.
+
+        Returns:
+            list[str]: The schema blocks to render.
+        """
+        if isinstance(tables, str):
+            tables = [tables]
+        pinned = set(self.pinned_schema)
+        retrieved = []
+        for block in tables or []:
+            block = block.strip()
+            if block and block not in pinned and block not in retrieved:
+                retrieved.append(block)
+        if self.sort_schema:
+            retrieved.sort()
+        return self.pinned_schema + retrieved
+
+    @staticmethod
+    def format_examples(examples) -> str:
+        """
+        Render few-shot examples.
+
+        Args:
+            examples (list[dict]): {"question": str | None, "sql": str} items.
+
+        Returns:
+            str: One question/SQL pair per paragraph.
+        """
+        return "\n\n".join((f"Question: {example['question']}\n" if example.get("question") else "")
+                           + f"SQL: {example['sql']}" for example in examples)
+
+    def build(self, question: str, tables, dialect: str, examples: List[dict] | None = None,
+              values: str | None = None) -> list:
+        """
+        Build the chat prompt for a question.
+
+        Args:
+            question (str): The user question.
+            tables (list[str] | str | None): The retrieved schema blocks.
+            dialect (str): The SQL dialect, e.g. "MySQL".
+            examples (list[dict] | None): Retrieved {"question", "sql"} examples. Default is None.
+            values (str | None): Column values matched in the question, formatted by
+                `ColumnValueIndex.format_matches`. Default is None.
+
+        Returns:
+            list: The system and user messages.
+        """
+        system_prompt = self.static_prefix(dialect)
+        system_prompt += NLQ_TABLES_SECTION.format(tables="\n\n".join(self.schema_blocks(tables)))
+        if values:
+            system_prompt += NLQ_VALUES_SECTION.format(values=values)
+        if examples:
+            system_prompt += NLQ_EXAMPLES_SECTION.format(examples=self.format_examples(examples))
+        return [{"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"{question}"}]
+
+    def describe(self, prompt: list, dialect: str) -> dict:
+        """
+        Measure the layout of a built prompt.
+
+        Args:
+            prompt (list): A prompt returned by `build`.
+            dialect (str): The dialect the prompt was built for.
+
+        Returns:
+            dict: Estimated total tokens and tokens in the static prefix shared by all requests.
+        """
+        return {
+            "prompt_tokens_estimate": estimate_prompt_tokens(prompt),
+            "static_prefix_tokens": estimate_tokens(self.static_prefix(dialect)),
+        }
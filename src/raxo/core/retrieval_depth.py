@@ -0,0 +1,116 @@
+"""
+Retrieval Depth Module
+
+This module provides the AdaptiveTopK class, which picks how many DDL documents to put in the
+prompt from the distances the vector store returns, instead of a fixed `n_result_ddl`.
+
+A pool of `n_candidates` documents, at least twice `max_k`, is fetched. Their distances are
+scaled so that the best candidate is at 0 and the 90th percentile of the pool, which stands for
+the background of unrelated tables, is at 1. Documents are then kept in order until:
+    - a document is farther than `relative_threshold` on that scale, or
+    - the step from the previous document is larger than `max_gap` on that scale,
+always keeping between `min_k` and `max_k` documents. A precise question has one or two tables
+well ahead of the background and keeps only those; a vague one has a gradual distance profile and
+keeps up to `max_k`. A pool smaller than twice `max_k`, as returned by a small schema, has too
+little background to measure it against, and `max_k` documents are kept.
+
+Scaling by the pool makes the thresholds independent of the distance function (squared L2,
+cosine or inner product) and of the embedding model.
+
+Classes:
+    AdaptiveTopK: Chooses the number of retrieved documents from their distances.
+
+Usage Example:
+    raxo = Raxo(llm=open_ai, vector_db=chroma, em_function=embed,
+                retrieval_depth=AdaptiveTopK(min_k=1, max_k=10, n_candidates=20))
+    raxo.ask("total sales per region")  # the `retrieve` span records `k` and `candidates`
+"""
+
+from typing import List
+
+# Keys of a query result holding one nested list of per-document values
+_PER_DOCUMENT_KEYS = ("ids", "documents", "metadatas", "distances", "embeddings")
+
+
+class AdaptiveTopK:
+    """
+    Chooses the number of retrieved documents from their distances.
+
+    Attributes:
+        min_k (int): The minimum number of documents kept.
+        max_k (int): The maximum number of documents kept.
+        n_candidates (int): The number of documents fetched before the cutoff.
+        relative_threshold (float): The largest distance above the best one of a kept document, as
+            a fraction of the distance between the best and the 90th percentile candidates.
+        max_gap (float): The largest step between consecutive distances before the cutoff, as a
+            fraction of the distance between the best and the 90th percentile candidates.
+    """
+
+    def __init__(self, min_k: int = 1, max_k: int = 10, n_candidates: int = 20, relative_threshold: float = 0.8,
+                 max_gap: float = 0.5):
+        """
+        Initialize an instance of the AdaptiveTopK class.
+
+        Args:
+            min_k (int): The minimum number of documents kept. Default is 1.
+            max_k (int): The maximum number of documents kept. Default is 10.
+            n_candidates (int): The number of documents fetched; at least `2 * max_k`. Default is 20.
+            relative_threshold (float): The largest scaled distance above the best document of a
+                kept document. Default is 0.8.
+            max_gap (float): The largest scaled step between consecutive distances. Default is 0.5.
+
+        Raises:
+            ValueError: If the bounds are inconsistent.
+        """
+        if not 0 < min_k <= max_k:
+            raise ValueError(f"Expected 0 < min_k <= max_k, got min_k={min_k} and max_k={max_k}")
+        self.min_k = min_k
+        self.max_k = max_k
+        self.n_candidates = max(n_candidates, 2 * max_k)
+        self.relative_threshold = relative_threshold
+        self.max_gap = max_gap
+
+    def cutoff(self, distances: List[float]) -> int:
+        """
+        Return the number of documents to keep.
+
+        Args:
+            distances (list[float]): The candidate distances, in ascending order.
+
+        Returns:
+            int: The number of leading documents to keep, between `min_k` and `max_k` or the
+            number of candidates when there are fewer.
+        """
+        count = len(distances)
+        if count <= self.min_k:
+            return count
+        if count < 2 * self.max_k:
+            # Too few candidates to tell the relevant documents from the background
+            return min(count, self.max_k)
+        best = distances[0]
+        scale = distances[(count - 1) * 9 // 10] - best
+        if scale <= 1e-9 * max(abs(best), 1.0):
+            # Every candidate is as close as the best one, nothing stands out
+            return min(count, self.max_k)
+        k = 1
+        while k < min(count, self.max_k):
+            if (distances[k] - best) / scale > self.relative_threshold or \
+                    (distances[k] - distances[k - 1]) / scale > self.max_gap:
+                break
+            k += 1
+        return max(k, self.min_k)
+
+    def select(self, result: dict) -> dict:
+        """
+        Trim a Chroma-shaped query result to its adaptive depth.
+
+        Args:
+            result (dict): The query result, with nested `ids`, `documents`, `distances`...
+
+        Returns:
+            dict: The result holding the kept documents only; keys that are not per-document
+            lists, such as `included`, are returned unchanged.
+        """
+        k = self.cutoff(result["distances"][0])
+        return {key: [values[0][:k]] if key in _PER_DOCUMENT_KEYS and values else values
+                for key, values in result.items()}
@@ -0,0 +1,284 @@
+"""
+Template Cache Module
+
+This module provides the TemplateCache class, which re-uses generated SQL for questions that only
+differ in their literals ("sales in 2023" and "sales in 2024", "for region 'EMEA'" and "'APAC'").
+
+When SQL is generated for a question, the literals of the SQL that equal a literal slot of the
+canonical question (see `raxo.utils.normalize`) are replaced by placeholders. The template is
+indexed by the canonical question, where literals are masked. A later question with the same
+canonical key binds its own slot values into the template, without calling the LLM. Bound SQL is
+rendered either inline, or as a query with `%s`/`?` placeholders and its parameters for the
+`params` argument of the database connectors.
+
+Templates are only stored, and only re-used, when every table they read is known to the schema
+catalog, which is kept up to date from trained and retrieved DDL. Templates and catalog are kept
+per namespace scope (see `raxo.utils.cache.namespace_scope`): a scope sees the tables of every
+scope containing it, and training a namespace only invalidates the templates of the scopes that
+retrieve its documents.
+
+Classes:
+    SQLTemplate: A parameterized SQL query.
+    TemplateCache: Stores templates by canonical question and binds new literals into them.
+
+Usage Example:
+    cache = TemplateCache()
+    cache.add_ddl("CREATE TABLE sales (region VARCHAR(10), year INT, amount INT)")
+    first = canonicalize("sales in 2023")
+    cache.store("sales in <num0>", first, "SELECT SUM(amount) FROM sales WHERE year = 2023")
+    template = cache.lookup("sales in <num0>")
+    template.render(canonicalize("sales in 2024").values)            # "... WHERE year = 2024"
+    template.render(canonicalize("sales in 2024").values, "format")  # ("... WHERE year = %s", (2024,))
+"""
+
+import logging
+import re
+from typing import List
+
+from ..utils.cache import LRUCache, namespace_scope
+from ..utils.ddl import parse_create_tables, unquote_identifier
+from ..utils.normalize import CanonicalQuestion
+
+logger = logging.getLogger(__name__)
+
+# String literals, quoted identifiers and comments are matched so that their content is skipped
+_TOKENS = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`[^`]*`|--[^\n]*|/\*.*?\*/|"
+                     r"(?<![\w.])\d+(?:\.\d+)?(?![\w.])", re.DOTALL)
+_TABLE_REFERENCE = re.compile(r"\b(?:FROM|JOIN)\s+((?:[`\"]?[\w$]+[`\"]?\.)*[`\"]?[\w$]+[`\"]?)", re.IGNORECASE)
+_CTE_NAME = re.compile(r"(?:\bWITH(?:\s+RECURSIVE)?|,)\s*([\w$]+)\s+AS\s*\(", re.IGNORECASE)
+
+
+def _literal_value(token: str):
+    if token.startswith("'"):
+        return token[1:-1].replace("''", "'")
+    if token[0].isdigit():
+        return float(token) if "." in token else int(token)
+    return None
+
+
+def referenced_tables(sql: str) -> set:
+    """Return the lower-cased, unqualified names of the tables a query reads, without CTE names."""
+    tables = {unquote_identifier(match.group(1).split(".")[-1]).lower() for match in _TABLE_REFERENCE.finditer(sql)}
+    return tables - {name.lower() for name in _CTE_NAME.findall(sql)}
+
+
+class SQLTemplate:
+    """
+    A parameterized SQL query.
+
+    Attributes:
+        segments (list): SQL text chunks and slot indexes, in order.
+        kinds (tuple): The kinds of the slots of the question the template was built from.
+        tables (set): The tables read by the query.
+    """
+
+    __slots__ = ("segments", "kinds", "tables")
+
+    def __init__(self, segments: list, kinds: tuple, tables: set):
+        self.segments = segments
+        self.kinds = kinds
+        self.tables = tables
+
+    @classmethod
+    def from_sql(cls, sql: str, canonical: CanonicalQuestion):
+        """
+        Parameterize the literals of a query that come from the slots of its question.
+
+        Args:
+            sql (str): The generated SQL.
+            canonical (CanonicalQuestion): The canonical question the SQL answers.
+
+        Returns:
+            SQLTemplate | None: The template, or None when a slot value cannot be located in the
+            SQL unambiguously, e.g. because it is transformed (`'%EMEA%'`), two slots share a value or
+            a slot value appears twice, as in `WHERE id = 1 ORDER BY 1`.
+        """
+        values = canonical.values
+        if len(set(map(repr, values))) != len(values):
+            return None
+        segments, used, position = [], set(), 0
+        for match in _TOKENS.finditer(sql):
+            literal = _literal_value(match.group(0))
+            if literal is None:
+                continue
+            for index, slot in enumerate(canonical.slots):
+                value = slot["value"]
+                # Strings only match string literals and numbers only numeric ones
+                if type(literal) is str and isinstance(value, str) and literal == value or \
+                        type(literal) is not str and not isinstance(value, str) and literal == value:
+                    if index in used:
+                        # The other literal may be a LIMIT, an ORDER BY position or 1=1
+                        return None
+                    segments.append(sql[position:match.start()])
+                    segments.append(index)
+                    used.add(index)
+                    position = match.end()
+                    break
+        segments.append(sql[position:])
+        if len(used) != len(values):
+            return None
+        return cls(segments, tuple(slot["kind"] for slot in canonical.slots), referenced_tables(sql))
+
+    def render(self, values, paramstyle: str | None = None):
+        """
+        Bind slot values into the template.
+
+        Args:
+            values (tuple): The slot values of the new question, see `CanonicalQuestion.values`.
+            paramstyle (str | None): None to inline the values as SQL literals, or the DB-API
+                paramstyle of the connector, "format" (`%s`) or "qmark" (`?`). Default is None.
+
+        Returns:
+            str | tuple: The SQL, or the SQL with placeholders and the tuple of parameters.
+        """
+        if paramstyle is None:
+            return "".join(segment if isinstance(segment, str) else self._inline(values[segment])
+                           for segment in self.segments)
+        placeholder = "%s" if paramstyle == "format" else "?"
+        sql, params = [], []
+        for segment in self.segments:
+            if isinstance(segment, str):
+                # With the format paramstyle a literal % must be doubled
+                sql.append(segment.replace("%", "%%") if paramstyle == "format" else segment)
+            else:
+                sql.append(placeholder)
+                params.append(values[segment])
+        return "".join(sql), tuple(params)
+
+    @staticmethod
+    def _inline(value) -> str:
+        if isinstance(value, str):
+            return "'" + value.replace("'", "''") + "'"
+        return repr(value)
+
+
+class TemplateCache:
+    """
+    Stores SQL templates by canonical question and binds new literals into them.
+
+    Attributes:
+        catalog (dict): Maps namespace scopes to lower-cased table names and their lower-cased
+            column names.
+        templates (LRUCache): The templates by scope and key, with their hit and miss counters.
+        rejected (int): The number of templates refused by the catalog validation at lookup.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize an instance of the TemplateCache class.
+
+        Args:
+            maxsize (int): The maximum number of templates; 0 disables the cache. Default is 1024.
+        """
+        self.catalog = {}
+        self.templates = LRUCache(maxsize)
+        self.rejected = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.templates.maxsize > 0
+
+    def add_ddl(self, ddl: str | List[str], scope: frozenset = frozenset()):
+        """
+        Record the tables of DDL statements in the catalog.
+
+        Args:
+            ddl (str | list[str]): CREATE TABLE statements.
+            scope (frozenset): The namespace scope of the tables. Default is the empty scope.
+        """
+        script = ddl if isinstance(ddl, str) else ";\n".join(ddl)
+        tables = self.catalog.setdefault(scope, {})
+        for table in parse_create_tables(script):
+            name = table["name"].split(".")[-1].lower()
+            tables[name] = {column["name"].lower() for column in table["columns"]}
+
+    def remove_table(self, table: str, scope: frozenset = frozenset()):
+        """Forget a table, invalidating the templates reading it at their next lookup."""
+        self.catalog.get(scope, {}).pop(table.split(".")[-1].lower(), None)
+
+    def tables(self, scope: frozenset = frozenset()) -> set:
+        """Return the tables visible from a scope: those of every scope containing it."""
+        return {name for tables_scope, tables in list(self.catalog.items()) if scope <= tables_scope
+                for name in tables}
+
+    def validate(self, template: SQLTemplate, scope: frozenset = frozenset()) -> bool:
+        """Return whether every table read by a template is in the catalog of a scope."""
+        return bool(template.tables) and template.tables <= self.tables(scope)
+
+    def store(self, key, canonical: CanonicalQuestion, sql: str, scope: frozenset = frozenset()) -> SQLTemplate | None:
+        """
+        Parameterize generated SQL and store it under the canonical key of its question.
+
+        Args:
+            key: The cache key, built from the canonical key of the question.
+            canonical (CanonicalQuestion): The canonical question.
+            sql (str): The SQL generated for the question.
+            scope (frozenset): The namespace scope of the question. Default is the empty scope.
+
+        Returns:
+            SQLTemplate | None: The stored template, or None when the SQL could not be parameterized
+            or reads tables missing from the catalog.
+        """
+        if not self.enabled or not canonical.slots:
+            return None
+        template = SQLTemplate.from_sql(sql, canonical)
+        if template is None or not self.validate(template, scope):
+            return None
+        self.templates.put((scope, key), template)
+        return template
+
+    def lookup(self, key, canonical: CanonicalQuestion | None = None,
+               scope: frozenset = frozenset()) -> SQLTemplate | None:
+        """
+        Find the template of a canonical question, validated against the catalog.
+
+        Args:
+            key: The cache key, built from the canonical key of the question.
+            canonical (CanonicalQuestion | None): The canonical question, to check that its slots
+                have the kinds the template was built from. Default is None.
+            scope (frozenset): The namespace scope of the question. Default is the empty scope.
+
+        Returns:
+            SQLTemplate | None: The template, or None.
+        """
+        if not self.enabled:
+            return None
+        template = self.templates.get((scope, key))
+        if template is None:
+            return None
+        if canonical is not None and tuple(slot["kind"] for slot in canonical.slots) != template.kinds:
+            return None
+        if not self.validate(template, scope):
+            logger.info("Dropping SQL template reading unknown tables %s", sorted(template.tables - self.tables(scope)))
+            self.templates.discard((scope, key), template)
+            self.rejected += 1
+            return None
+        return template
+
+    def discard(self, key, template: SQLTemplate | None = None, scope: frozenset = frozenset()):
+        """Remove the template of a canonical question, e.g. after its SQL failed to execute."""
+        if template is None:
+            self.templates.discard((scope, key))
+        else:
+            self.templates.discard((scope, key), template)
+
+    def invalidate(self, namespace: dict | None = None) -> int:
+        """
+        Remove the templates of the scopes that retrieve documents trained in a namespace.
+
+        Args:
+            namespace (dict | None): The trained namespace. Default is None.
+
+        Returns:
+            int: The number of templates removed.
+        """
+        scope = namespace_scope(namespace)
+        return self.templates.discard_if(lambda key: key[0] <= scope)
+
+    def clear(self):
+        """Remove every template, keeping the catalog and counters."""
+        self.templates.clear()
+
+    def stats(self) -> dict:
+        """Return the size, hits, misses, hit rate and rejections of the cache."""
+        return {**self.templates.stats(), "rejected": self.rejected}
@@ -0,0 +1,277 @@
+"""
+Column Value Index Module
+
+This module provides the ColumnValueIndex class, an index of the distinct values of low-cardinality
+string columns (regions, statuses, channels...). At question time the values mentioned in the
+question are looked up, exactly or fuzzily, and injected into the prompt, so the model can filter
+on `region = 'EMEA'` directly instead of first generating an intermediate `SELECT DISTINCT` query.
+
+Values are harvested through the database connectors and kept per namespace scope (see
+`raxo.utils.cache.namespace_scope`). A question sees the values of every scope containing its own,
+merged into one sorted array of normalized values searched with binary search, so it never matches
+another tenant's values. Columns are harvested incrementally: when a table is trained, and again once they are
+older than the refresh interval.
+
+Classes:
+    ColumnValueIndex: Harvests and matches categorical column values.
+
+Usage Example:
+    index = ColumnValueIndex(max_distinct=100)
+    raxo = Raxo(llm=open_ai, database=mysql_connector, vector_db=chroma, em_function=embed,
+                value_index=index)
+    raxo.train(ddl="CREATE TABLE sales (region VARCHAR(10), amount INT)")  # harvests sales.region
+    index.match("sales in emea")  # [{"table": "sales", "column": "region", "value": "EMEA", ...}]
+"""
+
+import bisect
+import logging
+import re
+import threading
+import time
+from difflib import SequenceMatcher
+from typing import Iterable, List
+
+from ..utils.cache import namespace_scope
+from ..utils.ddl import is_categorical_type, parse_create_tables
+from ..utils.sql_utils import quote_identifier
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[\w][\w&/.'-]*", re.UNICODE)
+_STOP_WORDS = frozenset(("a", "an", "and", "are", "as", "at", "by", "for", "from", "how", "in", "is", "me", "my",
+                         "of", "on", "or", "per", "show", "the", "to", "was", "what", "which", "with"))
+
+
+def _normalize(value: str) -> str:
+    return " ".join(str(value).lower().split())
+
+
+class ColumnValueIndex:
+    """
+    Harvests and matches the values of low-cardinality string columns.
+
+    Attributes:
+        columns (dict): Maps (namespace scope, table, column) to {"values": tuple, "harvested_at": float}.
+            Columns with more than `max_distinct` values are recorded with empty values, so they
+            are not queried again until refreshed.
+    """
+
+    def __init__(self, max_distinct: int = 100, max_value_length: int = 64, sample_rows: int | None = None,
+                 min_similarity: float = 0.85, max_matches: int = 10, refresh_interval: float | None = None):
+        """
+        Initialize an instance of the ColumnValueIndex class.
+
+        Args:
+            max_distinct (int): Columns with more distinct values are not indexed. Default is 100.
+            max_value_length (int): Longer values are not indexed. Default is 64.
+            sample_rows (int | None): Harvest from the first `sample_rows` rows of each table instead
+                of a full scan. Default is None.
+            min_similarity (float): The minimum similarity ratio of a fuzzy match. Default is 0.85.
+            max_matches (int): The maximum number of matches returned per question. Default is 10.
+            refresh_interval (float | None): Seconds after which `refresh` re-harvests a column.
+                Default is None, meaning columns are only harvested once.
+        """
+        self.max_distinct = max_distinct
+        self.max_value_length = max_value_length
+        self.sample_rows = sample_rows
+        self.min_similarity = min_similarity
+        self.max_matches = max_matches
+        self.refresh_interval = refresh_interval
+        self.columns = {}
+        # Maps a question scope to the sorted normalized values it sees and their (table, column, value)
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(entry["values"]) for entry in self.columns.values())
+
+    def _invalidate(self, scope: frozenset):
+        """Drop the merged indexes of the question scopes seeing a changed scope; the lock is held."""
+        for question_scope in [question_scope for question_scope in self._indexes if question_scope <= scope]:
+            del self._indexes[question_scope]
+
+    def add_values(self, table: str, column: str, values: Iterable, namespace: dict | None = None):
+        """
+        Index the values of a column, replacing previously indexed ones.
+
+        Args:
+            table (str): The table name.
+            column (str): The column name.
+            values (Iterable): The distinct values of the column.
+            namespace (dict | None): The namespace the table belongs to. Default is None.
+        """
+        values = tuple(sorted({str(value) for value in values
+                               if value is not None and 0 < len(str(value)) <= self.max_value_length}))
+        scope = namespace_scope(namespace)
+        with self._lock:
+            self.columns[(scope, table, column)] = {"values": values, "harvested_at": time.time()}
+            self._invalidate(scope)
+
+    def remove_table(self, table: str, namespace: dict | None = None):
+        """Drop every indexed column of a table."""
+        scope = namespace_scope(namespace)
+        with self._lock:
+            for key in [key for key in self.columns if key[:2] == (scope, table)]:
+                del self.columns[key]
+            self._invalidate(scope)
+
+    def _harvest_query(self, table: str, column: str, dialect: str) -> str:
+        quoted_table, quoted_column = quote_identifier(table, dialect), quote_identifier(column, dialect)
+        source = quoted_table
+        if self.sample_rows:
+            source = f"(SELECT {quoted_column} FROM {quoted_table} LIMIT {int(self.sample_rows)}) sampled"
+        return (f"SELECT {quoted_column} FROM {source} WHERE {quoted_column} IS NOT NULL "
+                f"GROUP BY {quoted_column} LIMIT {self.max_distinct + 1}")
+
+    def harvest(self, database, ddl: str | List[dict], dialect: str | None = None,
+                namespace: dict | None = None) -> int:
+        """
+        Harvest the categorical columns of the given tables through a database connector.
+
+        Args:
+            database: A connector exposing `execute_query(sql)`.
+            ddl (str | list[dict]): CREATE TABLE statements, or tables parsed by `parse_create_tables`.
+            dialect (str | None): The SQL dialect used to quote identifiers. Default is the
+                connector's `dialect`.
+            namespace (dict | None): The namespace the tables belong to. Default is None.
+
+        Returns:
+            int: The number of columns indexed.
+        """
+        dialect = dialect or getattr(database, "dialect", "MySQL")
+        tables = parse_create_tables(ddl) if isinstance(ddl, str) else ddl
+        indexed = 0
+        for table in tables:
+            for column in table["columns"]:
+                if not is_categorical_type(column["type"], self.max_value_length):
+                    continue
+                if self._harvest_column(database, table["name"], column["name"], dialect, namespace):
+                    indexed += 1
+        return indexed
+
+    def _harvest_column(self, database, table: str, column: str, dialect: str, namespace: dict | None) -> bool:
+        try:
+            rows = database.execute_query(self._harvest_query(table, column, dialect))
+        except Exception as e:
+            logger.warning("Could not harvest values of %s.%s: %s", table, column, e)
+            return False
+        if rows is None:
+            return False
+        if len(rows) > self.max_distinct:
+            self.add_values(table, column, (), namespace=namespace)
+            return False
+        self.add_values(table, column, (row[0] for row in rows), namespace=namespace)
+        return True
+
+    def refresh(self, database, dialect: str | None = None, max_age: float | None = None,
+                namespace: dict | None = None) -> int:
+        """
+        Re-harvest the columns harvested longer than `max_age` seconds ago.
+
+        Args:
+            database: A connector exposing `execute_query(sql)`.
+            dialect (str | None): The SQL dialect used to quote identifiers. Default is the
+                connector's `dialect`.
+            max_age (float | None): The age in seconds after which a column is stale. Default is
+                `refresh_interval`; with neither set every column is refreshed.
+            namespace (dict | None): The namespace whose columns are refreshed. Default is None.
+
+        Returns:
+            int: The number of columns indexed.
+        """
+        dialect = dialect or getattr(database, "dialect", "MySQL")
+        max_age = self.refresh_interval if max_age is None else max_age
+        scope = namespace_scope(namespace)
+        now = time.time()
+        with self._lock:
+            stale = [(table, column) for (key, table, column), entry in self.columns.items()
+                     if key == scope and (max_age is None or now - entry["harvested_at"] >= max_age)]
+        return sum(self._harvest_column(database, table, column, dialect, namespace) for table, column in stale)
+
+    def _index(self, scope: frozenset) -> tuple:
+        with self._lock:
+            index = self._indexes.get(scope)
+            if index is None:
+                # A question scope sees the values of every scope containing it, like `TemplateCache.tables`
+                entries = sorted({(_normalize(value), (table, column, value))
+                                  for (key, table, column), entry in self.columns.items() if scope <= key
+                                  for value in entry["values"]})
+                index = self._indexes[scope] = ([normalized for normalized, _ in entries], [ref for _, ref in entries])
+            return index
+
+    @staticmethod
+    def _phrases(question: str) -> List[str]:
+        words = [word.strip(".'-").lower() for word in _WORD.findall(question)]
+        words = [word for word in words if word]
+        phrases = []
+        for size in (3, 2, 1):
+            for start in range(len(words) - size + 1):
+                phrase = words[start:start + size]
+                if phrase[0] in _STOP_WORDS or phrase[-1] in _STOP_WORDS:
+                    continue
+                phrases.append(" ".join(phrase))
+        return phrases
+
+    def match(self, question: str, tables: Iterable[str] | None = None, namespace: dict | None = None) -> List[dict]:
+        """
+        Find indexed values mentioned in a question.
+
+        Phrases of one to three words are looked up exactly, then fuzzily against the values
+        sharing their first two characters.
+
+        Args:
+            question (str): The user question.
+            tables (Iterable[str] | None): Restrict matches to these tables. Default is None.
+            namespace (dict | None): The namespace of the question. Values indexed in a namespace
+                extending it, e.g. {"tenant": "acme", "database": "sales"} for {"tenant": "acme"},
+                are matched too. Default is None.
+
+        Returns:
+            list[dict]: {"table", "column", "value", "score"} matches, best first.
+        """
+        keys, refs = self._index(namespace_scope(namespace))
+        if not keys:
+            return []
+        tables = set(tables) if tables is not None else None
+        best = {}
+        for phrase in self._phrases(question):
+            if len(phrase) < 2:
+                continue
+            start = bisect.bisect_left(keys, phrase[:2])
+            end = bisect.bisect_left(keys, phrase[:2] + "\uffff", start)
+            for position in range(start, end):
+                key = keys[position]
+                if key == phrase:
+                    score = 1.0
+                elif abs(len(key) - len(phrase)) > max(2, len(phrase) // 3):
+                    continue
+                else:
+                    score = SequenceMatcher(None, phrase, key).ratio()
+                    if score < self.min_similarity:
+                        continue
+                table, column, value = refs[position]
+                if tables is not None and table not in tables:
+                    continue
+                if score > best.get((table, column, value), 0.0):
+                    best[(table, column, value)] = score
+        matches = [{"table": table, "column": column, "value": value, "score": score}
+                   for (table, column, value), score in best.items()]
+        matches.sort(key=lambda item: (-item["score"], item["table"], item["column"], item["value"]))
+        return matches[:self.max_matches]
+
+    @staticmethod
+    def format_matches(matches: List[dict]) -> str:
+        """
+        Render matches for the prompt, one line per column.
+
+        Args:
+            matches (list[dict]): Matches returned by `match`.
+
+        Returns:
+            str: Lines such as `sales.region: 'EMEA', 'APAC'`.
+        """
+        grouped = {}
+        for match in matches:
+            grouped.setdefault(f"{match['table']}.{match['column']}", []).append(match["value"])
+        return "\n".join(f"{column}: " + ", ".join("'" + value.replace("'", "''") + "'" for value in values)
+                         for column, values in sorted(grouped.items()))
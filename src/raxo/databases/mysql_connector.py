@@ -3,7 +3,8 @@ MySQLConnector Module
 
 This module provides the MySQLConnector class for creating and managing MySQL database connections.
 The MySQLConnector class initializes a connection to a MySQL database using provided credentials and
-supports executing SQL queries and closing the connection.
+supports executing SQL queries and closing the connection. Query results are fetched in batches
+into a ResultSet, which spills large results to disk, see `raxo.utils.result_set`.
 
 Classes:
     MySQLConnector: A class to handle MySQL database connections.
@@ -18,12 +19,18 @@ Usage Example:
     )
     mysql_connector.connect()
     results = mysql_connector.execute_query("SELECT * FROM my_table")
+    print(len(results), results.columns, results.page(0, 10))
     mysql_connector.disconnect()
 """
 
+import logging
+
 import mysql.connector
 from mysql.connector import Error
-from ..utils.exceptions import InvalidKeysException
+from ..utils.exceptions import InvalidKeysException, QueryExecutionError, ResultTooLarge
+from ..utils.result_set import ResultSet
+
+logger = logging.getLogger(__name__)
 
 
 class MySQLConnector:
@@ -41,12 +48,18 @@ class MySQLConnector:
         user (str | None): The username to use for authentication. Default is None.
         password (str | None): The password to use for authentication. Default is None.
         connection: The connection object. Default is None.
+        fetch_size (int): The rows fetched per batch.
+        spill_threshold (int | None): The estimated result bytes above which rows are spilled to disk.
+        max_result_bytes (int | None): The estimated result bytes above which a query fails.
+        spill_dir (str | None): The directory of spilled results.
     """
 
     required_keys = ('host', 'database', 'user', 'password')
 
     def __init__(self, host: str | None = None, database: str | None = None,
-                 user: str | None = None, password: str | None = None):
+                 user: str | None = None, password: str | None = None, fetch_size: int = 1000,
+                 spill_threshold: int | None = 64 * 1024 * 1024, max_result_bytes: int | None = None,
+                 spill_dir: str | None = None):
         """
         Initialize the MySQLConnector with the given credentials.
 
@@ -55,6 +68,12 @@ class MySQLConnector:
             database (str | None): The name of the database to connect to. Default is None.
             user (str | None): The username to use for authentication. Default is None.
             password (str | None): The password to use for authentication. Default is None.
+            fetch_size (int): The rows fetched per batch. Default is 1000.
+            spill_threshold (int | None): The estimated result bytes above which rows are spilled to
+                disk; None keeps every result in memory. Default is 64 MiB.
+            max_result_bytes (int | None): The estimated result bytes above which a query fails with
+                ResultTooLarge; None allows any size. Default is None.
+            spill_dir (str | None): The directory of spilled results. Default is the system temporary directory.
 
         Raises:
             InvalidKeysException: If any of the required keys are missing.
@@ -65,6 +84,11 @@ class MySQLConnector:
         self.password = password
         self.connection = None
         self.dialect = "MySQL"
+        self.paramstyle = "format"
+        self.fetch_size = fetch_size
+        self.spill_threshold = spill_threshold
+        self.max_result_bytes = max_result_bytes
+        self.spill_dir = spill_dir
         missing_keys = self.check_missing_keys()
         if missing_keys:
             raise InvalidKeysException(f"Missing keys: {', '.join(missing_keys)}")
@@ -98,9 +122,9 @@ class MySQLConnector:
                 password=self.password
             )
             if self.connection.is_connected():
-                print("Connected to MySQL database")
+                logger.info("Connected to MySQL database")
         except Error as e:
-            print(f"Error: {e}")
+            logger.error("Error connecting to MySQL database: %s", e)
             self.connection = None
 
     def disconnect(self):
@@ -115,7 +139,7 @@ class MySQLConnector:
         """
         if self.connection is not None and self.connection.is_connected():
             self.connection.close()
-            print("MySQL connection is closed")
+            logger.info("MySQL connection is closed")
 
     def execute_query(self, query, params=None):
         """
@@ -129,22 +153,28 @@ class MySQLConnector:
             params (tuple, optional): A tuple of parameters to pass to the query. Default is None.
 
         Returns:
-            list: The result of the query.
+            ResultSet: The result of the query.
 
         Raises:
             ConnectionError: If there is no active connection to the database.
-            RuntimeError: If there is an error executing the query.
+            QueryExecutionError: If there is an error executing the query.
+            ResultTooLarge: If the result exceeds `max_result_bytes`.
         """
         if self.connection is None or not self.connection.is_connected():
-            print("Connection is not established")
+            logger.error("Connection is not established")
             return None
 
         cursor = self.connection.cursor()
         try:
             cursor.execute(query, params)
-            return cursor.fetchall()
+            return ResultSet.fetch(cursor, fetch_size=self.fetch_size, spill_threshold=self.spill_threshold,
+                                   max_bytes=self.max_result_bytes, spill_dir=self.spill_dir, query=query)
+        except ResultTooLarge:
+            # The unread rows must be drained before the connection runs another statement
+            self.connection.consume_results()
+            raise
         except Error as e:
-            print(f"Error: {e}")
-            return None
+            logger.error("Error executing query: %s", e)
+            raise QueryExecutionError(str(e), query=query) from e
         finally:
             cursor.close()
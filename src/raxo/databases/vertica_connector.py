@@ -3,7 +3,8 @@ VerticaConnector Module
 
 This module provides the VerticaConnector class for creating and managing Vertica database connections.
 The VerticaConnector class initializes a connection to a Vertica database using provided credentials
- and supports executing SQL queries and closing the connection.
+ and supports executing SQL queries and closing the connection. Query results are fetched in batches
+ into a ResultSet, which spills large results to disk, see `raxo.utils.result_set`.
 
 Classes:
     VerticaConnector: A class to handle Vertica database connections.
@@ -19,11 +20,17 @@ Usage Example:
     )
     vertica_connector.connect()
     results = vertica_connector.execute_query("SELECT * FROM my_table")
+    print(len(results), results.columns, results.page(0, 10))
     vertica_connector.disconnect()
 """
 
+import logging
+
 import vertica_python
-from ..utils.exceptions import InvalidKeysException
+from ..utils.exceptions import InvalidKeysException, QueryExecutionError
+from ..utils.result_set import ResultSet
+
+logger = logging.getLogger(__name__)
 
 
 class VerticaConnector:
@@ -42,11 +49,17 @@ class VerticaConnector:
         password (str): The password to use for authentication.
         database (str): The name of the database to connect to.
         connection: The connection object. Default is None.
+        fetch_size (int): The rows fetched per batch.
+        spill_threshold (int | None): The estimated result bytes above which rows are spilled to disk.
+        max_result_bytes (int | None): The estimated result bytes above which a query fails.
+        spill_dir (str | None): The directory of spilled results.
     """
 
     required_keys = ('host', 'port', 'user', 'password', 'database')
 
-    def __init__(self, host: str, port: int, user: str, password: str, database: str):
+    def __init__(self, host: str, port: int, user: str, password: str, database: str, fetch_size: int = 1000,
+                 spill_threshold: int | None = 64 * 1024 * 1024, max_result_bytes: int | None = None,
+                 spill_dir: str | None = None):
         """
         Initialize the VerticaConnector with the given credentials.
 
@@ -56,6 +69,12 @@ class VerticaConnector:
             user (str): The username to use for authentication.
             password (str): The password to use for authentication.
             database (str): The name of the database to connect to.
+            fetch_size (int): The rows fetched per batch. Default is 1000.
+            spill_threshold (int | None): The estimated result bytes above which rows are spilled to
+                disk; None keeps every result in memory. Default is 64 MiB.
+            max_result_bytes (int | None): The estimated result bytes above which a query fails with
+                ResultTooLarge; None allows any size. Default is None.
+            spill_dir (str | None): The directory of spilled results. Default is the system temporary directory.
 
         Raises:
             InvalidKeysException: If any of the required keys are missing.
@@ -67,6 +86,11 @@ class VerticaConnector:
         self.database = database
         self.connection = None
         self.dialect = "Vertica"
+        self.paramstyle = "format"
+        self.fetch_size = fetch_size
+        self.spill_threshold = spill_threshold
+        self.max_result_bytes = max_result_bytes
+        self.spill_dir = spill_dir
         missing_keys = self.check_missing_keys()
         if missing_keys:
             raise InvalidKeysException(f"Missing required keys: {', '.join(missing_keys)}")
@@ -99,9 +123,9 @@ class VerticaConnector:
                 password=self.password,
                 database=self.database
             )
-            print("Connection established successfully.")
+            logger.info("Connection established successfully.")
         except vertica_python.errors.ConnectionError as e:
-            print(f"Connection error: {e}")
+            logger.error("Connection error: %s", e)
             raise
 
     def disconnect(self):
@@ -114,9 +138,9 @@ class VerticaConnector:
         if self.connection:
             self.connection.close()
             self.connection = None
-            print("Connection closed.")
+            logger.info("Connection closed.")
 
-    def execute_query(self, query):
+    def execute_query(self, query, params=None):
         """
         Execute a SQL query on the Vertica database.
 
@@ -125,23 +149,27 @@ class VerticaConnector:
 
         Args:
             query (str): The SQL query to be executed.
+            params (tuple, optional): A tuple of parameters bound to the `%s` placeholders of the query.
+                Default is None.
 
         Returns:
-            list: The result of the query.
+            ResultSet: The result of the query.
 
         Raises:
             ConnectionError: If there is no active connection to the database.
-            RuntimeError: If there is an error executing the query.
+            QueryExecutionError: If there is an error executing the query.
+            ResultTooLarge: If the result exceeds `max_result_bytes`.
         """
         if not self.connection:
             raise ConnectionError("Connection is not established. Call the connect method first.")
 
         cursor = self.connection.cursor()
         try:
-            cursor.execute(query)
-            return cursor.fetchall()
-        except Exception as e:
-            print(f"Error executing query: {e}")
-            raise
+            cursor.execute(query, params)
+            return ResultSet.fetch(cursor, fetch_size=self.fetch_size, spill_threshold=self.spill_threshold,
+                                   max_bytes=self.max_result_bytes, spill_dir=self.spill_dir, query=query)
+        except vertica_python.errors.Error as e:
+            logger.error("Error executing query: %s", e)
+            raise QueryExecutionError(str(e), query=query) from e
         finally:
             cursor.close()
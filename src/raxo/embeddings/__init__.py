@@ -1 +1,9 @@
 from .openai_embedding import OpenAiEmbeddings
+
+
+def __getattr__(name):
+    # onnxruntime and tokenizers are optional, so LocalEmbeddings is only imported when used
+    if name == "LocalEmbeddings":
+        from .local_embedding import LocalEmbeddings
+        return LocalEmbeddings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -25,3 +25,15 @@ class Embedding(ABC):
     @abstractmethod
     def create_embedding(self, data):
         pass
+
+    def create_embeddings(self, data):
+        """
+        Embed many texts; subclasses able to batch them override this.
+
+        Args:
+            data (list[str]): The texts.
+
+        Returns:
+            list[list[float]]: The embeddings, in the order of the texts.
+        """
+        return [self.create_embedding(text) for text in data]
@@ -0,0 +1,334 @@
+"""
+Local Embedding Module
+
+This module provides the LocalEmbeddings class, an Embedding running a sentence embedding model
+exported to ONNX on the CPU, with no network access. It is meant for air-gapped deployments and
+for bulk re-training without per-call provider costs.
+
+The model directory holds `model.onnx` (or `onnx/model.onnx`) and the Hugging Face `tokenizer.json`,
+as exported by `optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2 <dir>`.
+Token embeddings are mean-pooled over the attention mask (or the CLS token is taken) and
+L2-normalized.
+
+Throughput comes from three mechanisms:
+    - Dynamic batching: concurrent `create_embedding` calls, e.g. from `raxo serve` or `raxo batch`
+      threads, are coalesced into one model run while the model is busy, so a single caller never
+      waits for a batch to fill.
+    - Length-sorted batches: `create_embeddings` sorts inputs by token count and pads each batch
+      to its own longest input only.
+    - A process pool: lists of at least `bulk_threshold` texts are split across `workers` processes,
+      each running the model with `cores / workers` intra-op threads.
+
+Memory is capped by `max_batch_tokens`, which bounds the activations of a single run, by disabling
+the ONNX Runtime memory arena so they are released after each run, and, when `memory_limit_mb` is
+set, by a hard address space limit on each worker process (POSIX only).
+
+Requires `onnxruntime`, `tokenizers` and `numpy`: `pip install raxo[local]`.
+
+Classes:
+    LocalEmbeddings: An Embedding running an ONNX model on the CPU.
+
+Usage Example:
+    embed = LocalEmbeddings("/models/all-MiniLM-L6-v2", workers=4, memory_limit_mb=4096)
+    raxo = Raxo(llm=open_ai, vector_db=ChromaStore(em_function=embed), em_function=embed)
+    raxo.train_many(ddl=ddl_statements, documentation=documents)  # embedded across 4 processes
+    raxo.ask("what are my sales by region")                        # embedded in-process
+    embed.close()
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List
+
+from .embedding import Embedding
+
+logger = logging.getLogger(__name__)
+
+# The encoder of a pool worker process, loaded once by `_init_worker`
+_worker_encoder = None
+
+
+def _model_file(model_path: str) -> str:
+    if os.path.isfile(model_path):
+        return model_path
+    for candidate in ("model.onnx", os.path.join("onnx", "model.onnx")):
+        path = os.path.join(model_path, candidate)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No model.onnx found in {model_path}")
+
+
+def _tokenizer_file(model_path: str) -> str:
+    directory = os.path.dirname(model_path) if os.path.isfile(model_path) else model_path
+    for path in (os.path.join(directory, "tokenizer.json"), os.path.join(os.path.dirname(directory), "tokenizer.json")):
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No tokenizer.json found next to {model_path}")
+
+
+class _Encoder:
+    """Tokenizes texts and runs the ONNX model; one instance per process."""
+
+    def __init__(self, model_path: str, max_length: int, threads: int, pooling: str, normalize: bool,
+                 max_batch_tokens: int):
+        try:
+            import numpy as np
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError("LocalEmbeddings requires `onnxruntime`, `tokenizers` and `numpy`, "
+                              "install them with `pip install raxo[local]`.") from e
+        self.np = np
+        self.pooling = pooling
+        self.normalize = normalize
+        self.max_batch_tokens = max_batch_tokens
+        self.tokenizer = Tokenizer.from_file(_tokenizer_file(model_path))
+        self.tokenizer.enable_truncation(max_length)
+        self.tokenizer.no_padding()
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        # Activations are released after each run instead of growing a pool to the largest batch
+        options.enable_cpu_mem_arena = False
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(_model_file(model_path), options,
+                                                    providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def batches(self, encodings: list, batch_size: int):
+        """Yield lists of indexes of length-sorted encodings, bounded in size and padded tokens."""
+        order = sorted(range(len(encodings)), key=lambda index: len(encodings[index].ids))
+        batch, tokens = [], 0
+        for index in order:
+            length = len(encodings[index].ids)
+            # Sorted ascending, so the padded size of the batch is set by its last input; a batch
+            # is also cut before padding would exceed a third of its tokens
+            padded = (len(batch) + 1) * length
+            if batch and (padded > self.max_batch_tokens or len(batch) >= batch_size
+                          or tokens + length < padded * 2 / 3):
+                yield batch
+                batch, tokens = [], 0
+            batch.append(index)
+            tokens += length
+        if batch:
+            yield batch
+
+    def run(self, encodings: list):
+        np = self.np
+        width = max(len(encoding.ids) for encoding in encodings)
+        ids = np.zeros((len(encodings), width), dtype=np.int64)
+        mask = np.zeros((len(encodings), width), dtype=np.int64)
+        for row, encoding in enumerate(encodings):
+            ids[row, :len(encoding.ids)] = encoding.ids
+            mask[row, :len(encoding.ids)] = 1
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(ids)
+        hidden = self.session.run(None, {name: value for name, value in feeds.items() if name in self.input_names})[0]
+        if hidden.ndim == 2:
+            # Models exported with their pooling layer return sentence embeddings directly
+            vectors = hidden
+        elif self.pooling == "cls":
+            vectors = hidden[:, 0]
+        else:
+            weights = mask[..., None].astype(hidden.dtype)
+            vectors = (hidden * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+        if self.normalize:
+            vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors.astype(np.float32)
+
+    def encode(self, texts: List[str], batch_size: int) -> list:
+        encodings = self.tokenizer.encode_batch(texts)
+        vectors = [None] * len(texts)
+        for batch in self.batches(encodings, batch_size):
+            for index, vector in zip(batch, self.run([encodings[index] for index in batch])):
+                vectors[index] = vector.tolist()
+        return vectors
+
+
+def _init_worker(config: dict, memory_limit_mb: int | None):
+    global _worker_encoder
+    if memory_limit_mb:
+        try:
+            import resource
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError) as e:
+            logger.warning("Could not cap the memory of embedding worker %s: %s", os.getpid(), e)
+    _worker_encoder = _Encoder(**config)
+
+
+def _encode_in_worker(texts: List[str], batch_size: int) -> list:
+    return _worker_encoder.encode(texts, batch_size)
+
+
+class LocalEmbeddings(Embedding):
+    """
+    An Embedding running an ONNX sentence embedding model on the CPU.
+
+    Attributes:
+        model_path (str): The model directory, or the path of the `.onnx` file.
+        batch_size (int): The maximum number of texts per model run.
+        workers (int): The number of worker processes for bulk embedding.
+        bulk_threshold (int): The minimum number of texts sent to the worker processes.
+        memory_limit_mb (int | None): The address space limit of the worker processes together.
+        embed_mode (str): "local".
+        stats (dict): The number of texts embedded in-process, of dynamic batches run and of texts
+            embedded by the worker processes.
+    """
+
+    def __init__(self, model_path: str, batch_size: int = 32, max_length: int = 256, max_batch_tokens: int = 8192,
+                 workers: int = 1, threads: int | None = None, bulk_threshold: int = 256,
+                 memory_limit_mb: int | None = None, pooling: str = "mean", normalize: bool = True):
+        """
+        Initialize an instance of the LocalEmbeddings class and load the model in-process.
+
+        Args:
+            model_path (str): The model directory holding `model.onnx` and `tokenizer.json`, or the
+                path of the `.onnx` file with `tokenizer.json` next to it.
+            batch_size (int): The maximum number of texts per model run. Default is 32.
+            max_length (int): The number of tokens texts are truncated to. Default is 256.
+            max_batch_tokens (int): The maximum number of padded tokens per model run, bounding
+                its memory. Default is 8192.
+            workers (int): The number of worker processes for bulk embedding; 1 embeds every
+                text in-process. Default is 1.
+            threads (int | None): The intra-op threads of the in-process model. Default is the
+                number of cores.
+            bulk_threshold (int): The minimum number of texts of a `create_embeddings` call sent
+                to the worker processes. Default is 256.
+            memory_limit_mb (int | None): The address space limit of the worker processes
+                together, split evenly between them. Default is None, no limit.
+            pooling (str): "mean" over the attention mask, or "cls". Default is "mean".
+            normalize (bool): Whether to L2-normalize the embeddings. Default is True.
+
+        Raises:
+            ImportError: If `onnxruntime`, `tokenizers` or `numpy` is not installed.
+            FileNotFoundError: If the model or the tokenizer file is missing.
+        """
+        Embedding.__init__(self)
+        if pooling not in ("mean", "cls"):
+            raise ValueError(f"pooling must be 'mean' or 'cls', got {pooling!r}")
+        self.model_path = model_path
+        self.batch_size = batch_size
+        self.workers = max(1, workers)
+        self.bulk_threshold = bulk_threshold
+        self.memory_limit_mb = memory_limit_mb
+        self.embed_mode = "local"
+        cores = os.cpu_count() or 1
+        self._config = {"model_path": model_path, "max_length": max_length, "pooling": pooling,
+                        "normalize": normalize, "max_batch_tokens": max_batch_tokens}
+        self._encoder = _Encoder(threads=threads or cores, **self._config)
+        self._worker_threads = max(1, cores // self.workers)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self._batcher = None
+        self._batcher_lock = threading.Lock()
+        self.stats = {"texts": 0, "batches": 0, "bulk_texts": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, **deltas):
+        with self._stats_lock:
+            for key, value in deltas.items():
+                self.stats[key] += value
+
+    def _ensure_batcher(self):
+        with self._batcher_lock:
+            if self._batcher is None:
+                self._batcher = threading.Thread(target=self._batch_loop, name="raxo-embed-batcher", daemon=True)
+                self._batcher.start()
+
+    def _batch_loop(self):
+        while True:
+            pending = [self._queue.get()]
+            # Everything queued while the previous batch ran joins this one, without waiting for more
+            while len(pending) < self.batch_size:
+                try:
+                    pending.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if any(item is None for item in pending):
+                for text, future in (item for item in pending if item is not None):
+                    future.set_exception(RuntimeError("LocalEmbeddings is closed"))
+                return
+            try:
+                vectors = self._encoder.encode([text for text, _ in pending], self.batch_size)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+            self._count(texts=len(pending), batches=1)
+            for (_, future), vector in zip(pending, vectors):
+                future.set_result(vector)
+
+    def create_embedding(self, data: str) -> List[float]:
+        """
+        Embed one text, batched with the texts embedded concurrently by other threads.
+
+        Args:
+            data (str): The text.
+
+        Returns:
+            list[float]: The embedding.
+        """
+        self._ensure_batcher()
+        future = Future()
+        self._queue.put((data, future))
+        return future.result()
+
+    def create_embeddings(self, data: List[str]) -> List[List[float]]:
+        """
+        Embed many texts, across the worker processes when there are at least `bulk_threshold`.
+
+        Args:
+            data (list[str]): The texts.
+
+        Returns:
+            list[list[float]]: The embeddings, in the order of the texts.
+        """
+        if not data:
+            return []
+        if self.workers == 1 or len(data) < self.bulk_threshold:
+            vectors = self._encoder.encode(list(data), self.batch_size)
+            self._count(texts=len(data))
+            return vectors
+        pool = self._ensure_pool()
+        # Contiguous chunks of the length-sorted texts keep the padding of each worker low
+        order = sorted(range(len(data)), key=lambda index: len(data[index]))
+        chunk = max(self.batch_size, -(-len(order) // (self.workers * 4)))
+        chunks = [order[start:start + chunk] for start in range(0, len(order), chunk)]
+        futures = [pool.submit(_encode_in_worker, [data[index] for index in indexes], self.batch_size)
+                   for indexes in chunks]
+        vectors = [None] * len(data)
+        for indexes, future in zip(chunks, futures):
+            for index, vector in zip(indexes, future.result()):
+                vectors[index] = vector
+        self._count(bulk_texts=len(data))
+        return vectors
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                limit = self.memory_limit_mb // self.workers if self.memory_limit_mb else None
+                # Forking a process holding ONNX Runtime threads is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker, initargs=({**self._config, "threads": self._worker_threads}, limit))
+                logger.info("Started %s embedding workers with %s threads each", self.workers, self._worker_threads)
+            return self._pool
+
+    def close(self):
+        """Stop the batching thread and the worker processes."""
+        with self._batcher_lock:
+            if self._batcher is not None:
+                self._queue.put(None)
+                self._batcher.join()
+                self._batcher = None
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
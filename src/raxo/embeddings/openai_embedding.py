@@ -1,14 +1,14 @@
 import os
 from typing import List
-from openai import OpenAI
 from .embedding import Embedding
 from ..utils.exceptions import InvalidKeysException
+from ..utils.session import ProviderSession
 
 
 class OpenAiEmbeddings(Embedding):
     required_keys = ('api_key', 'model')
 
-    def __init__(self, api_key: str | None = None, model: str | None = None):
+    def __init__(self, api_key: str | None = None, model: str | None = None, session: ProviderSession | None = None):
         Embedding.__init__(self)
 
         self.api_key = api_key
@@ -21,7 +21,9 @@ class OpenAiEmbeddings(Embedding):
                                                please add an environment variable
                                                `OPENAI_API_KEY` and `MODEL` which contains it, or pass `api_key` and
                                                  `model` as a named parameter""")
-        self.client = OpenAI(api_key=api_key or os.environ.get("OPENAI_API_KEY", None))
+        # Shares its connection pool with the chat model and ChromaStore, see ProviderSession
+        self.session = session or ProviderSession.default()
+        self.client = self.session.openai(api_key=api_key or os.environ.get("OPENAI_API_KEY", None))
         # openai_ef = embedding_functions.OpenAIEmbeddingFunction(api_key="",
         #                                                         model_name="text-embedding-ada-002")
 
@@ -11,7 +11,7 @@ Classes:
 
 Dependencies:
     - os: Standard library for accessing environment variables.
-    - openai.AzureOpenAI: Azure OpenAI client for making API requests.
+    - openai.AzureOpenAI: Azure OpenAI client for making API requests, built by a ProviderSession.
     - utils.exceptions.InvalidKeysException: Custom exception for handling missing keys.
 
 AzureOpenAIChat Usage Example:
@@ -30,9 +30,9 @@ AzureOpenAIChat Usage Example:
 """
 
 import os
-from openai import AzureOpenAI
 from .llms import Llm
 from ..utils.exceptions import InvalidKeysException
+from ..utils.session import ProviderSession
 
 
 class AzureOpenAIChat(Llm):
@@ -49,13 +49,16 @@ class AzureOpenAIChat(Llm):
         api_version (str): The API version for the Azure OpenAI service.
         azure_endpoint (str): The endpoint URL for the Azure OpenAI service.
         deployment_name (str): The deployment name for the Azure OpenAI service.
+        json_mode (bool): Whether structured requests ask the API for a JSON object response.
+        session (ProviderSession): The HTTP session the client's connections are pooled in.
         client (AzureOpenAI): The Azure OpenAI client for making API requests.
     """
     required_keys = ('api_key', 'api_version', 'azure_endpoint', 'deployment_name')
 
     def __init__(self, api_key: str | None = None, api_version: str | None = None,
                  azure_endpoint: str | None = None,
-                 deployment_name: str | None = None):
+                 deployment_name: str | None = None, json_mode: bool = True,
+                 session: ProviderSession | None = None):
         """
         Initialize an instance of the AzureOpenAIChat class.
 
@@ -74,6 +77,11 @@ class AzureOpenAIChat(Llm):
                 Default is None.
             deployment_name (str | None): The deployment name for the Azure OpenAI service.
                 Default is None.
+            json_mode (bool): Whether structured requests ask the API for a JSON object response
+                (`response_format={"type": "json_object"}`). Disable it for deployments without
+                JSON mode support. Default is True.
+            session (ProviderSession | None): The HTTP session to share with other components.
+                Default is None, meaning `ProviderSession.default()`.
 
         Raises:
             InvalidKeysException: If any of the required keys are missing.
@@ -85,6 +93,7 @@ class AzureOpenAIChat(Llm):
         self.api_version = api_version or os.environ.get("API_VERSION", None)
         self.azure_endpoint = azure_endpoint or os.environ.get("AZURE_ENDPOINT", None)
         self.deployment_name = deployment_name
+        self.json_mode = json_mode
         missing_keys = self.check_missing_keys(self.required_keys)
         if missing_keys:
             raise InvalidKeysException(f"""Missing keys: {', '.join(missing_keys)}\n
@@ -93,10 +102,11 @@ class AzureOpenAIChat(Llm):
                                         which contains it, or pass `azure_key`, `api_version`, `azure_endpoint`
                                         and 'deployment_name as a named parameter.""")
 
-        self.client = AzureOpenAI(api_key=self.api_key,
-                                  azure_endpoint=self.azure_endpoint,
-                                  api_version=self.api_version
-                                  )
+        self.session = session or ProviderSession.default()
+        self.client = self.session.azure_openai(api_key=self.api_key,
+                                                azure_endpoint=self.azure_endpoint,
+                                                api_version=self.api_version
+                                                )
 
     def invoke_prompt(self, prompt, temperature: float = 0.5, max_tokens: int = 700, **kwargs):
         """
@@ -127,6 +137,7 @@ class AzureOpenAIChat(Llm):
                                                    temperature=temperature,
                                                    max_tokens=max_tokens,
                                                    **kwargs)
+        self.record_usage(data.usage)
 
         return data.choices[0].message.content
 
@@ -24,6 +24,7 @@ Usage Example:
         print(f"Missing keys: {', '.join(missing_keys)}")
 """
 
+import threading
 from abc import ABC, abstractmethod
 
 
@@ -40,6 +41,8 @@ class Llm(ABC):
         invoke_prompt: An abstract method to be implemented by subclasses to invoke a prompt and
             generate a response.
         check_missing_keys: Checks for any missing required keys in the subclass instances.
+        record_usage: Stores the token usage reported by the provider for the last call.
+        last_usage: Returns the token usage of the last call made on the calling thread.
 
     Usage Example:
         class MyLlm(Llm):
@@ -50,6 +53,9 @@ class Llm(ABC):
         my_llm = MyLlm()
         missing_keys = my_llm.check_missing_keys(['api_key', 'model'])
     """
+    # Subclasses set this when `invoke_prompt` accepts `response_format={"type": "json_object"}`
+    json_mode = False
+
     def __int__(self):
         """
         Initialize an instance of the Llm class.
@@ -93,5 +99,43 @@ class Llm(ABC):
         missing_keys = [param for param in required_keys if getattr(self, param) is None]
         return missing_keys
 
+    def record_usage(self, usage):
+        """
+        Store the token usage reported by the provider for the last call on this thread.
+
+        Subclasses should call this from `invoke_prompt` with the `usage` object of the SDK response.
+
+        Args:
+            usage: The SDK usage object (or a dict) with `prompt_tokens`, `completion_tokens`
+                and `total_tokens`. The provider-side cache hits reported in
+                `prompt_tokens_details.cached_tokens` are stored as `cached_tokens`.
+                None clears the stored usage.
+        """
+        if usage is not None and not isinstance(usage, dict):
+            details = getattr(usage, "prompt_tokens_details", None)
+            usage = {
+                "prompt_tokens": getattr(usage, "prompt_tokens", None),
+                "completion_tokens": getattr(usage, "completion_tokens", None),
+                "total_tokens": getattr(usage, "total_tokens", None),
+                "cached_tokens": getattr(details, "cached_tokens", None),
+            }
+        self._usage_store().usage = usage
+
+    @property
+    def last_usage(self) -> dict | None:
+        """
+        The token usage of the last call made on the calling thread.
+
+        Returns:
+            dict | None: The usage recorded by `record_usage`, or None if the model does not report it.
+        """
+        return getattr(self._usage_store(), "usage", None)
+
+    def _usage_store(self):
+        store = self.__dict__.get("_usage_local")
+        if store is None:
+            store = self.__dict__.setdefault("_usage_local", threading.local())
+        return store
+
     def create_embedding(self, data):
         pass
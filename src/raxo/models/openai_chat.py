@@ -11,7 +11,7 @@ Classes:
 
 Dependencies:
     - os: Standard library for accessing environment variables.
-    - openai.OpenAI: OpenAI client for making API requests.
+    - openai.OpenAI: OpenAI client for making API requests, built by a ProviderSession.
     - utils.exceptions.InvalidKeysException: Custom exception for handling missing keys.
 
 OpenAIChat Usage Example:
@@ -28,10 +28,10 @@ OpenAIChat Usage Example:
 """
 
 import os
-from openai import OpenAI
 from typing import List
 from .llms import Llm
 from ..utils.exceptions import InvalidKeysException, PromptError
+from ..utils.session import ProviderSession
 
 
 class OpenAIChat(Llm):
@@ -44,13 +44,15 @@ class OpenAIChat(Llm):
 
     Attributes:
         model (str): The model to use for generating responses.
+        json_mode (bool): Whether structured requests ask the API for a JSON object response.
+        session (ProviderSession): The HTTP session the client's connections are pooled in.
         client (OpenAI): The OpenAI client for making API requests.
     """
 
     required_keys = ('api_key', 'model')
 
     def __init__(self, api_key: str | None = None,
-                 model: str | None = None):
+                 model: str | None = None, json_mode: bool = True, session: ProviderSession | None = None):
         """
         Initialize an instance of the OpenAIChat class.
 
@@ -62,6 +64,11 @@ class OpenAIChat(Llm):
         Args:
             api_key (str | None): The API key for accessing the OpenAI service. Default is None.
             model (str | None): The model to use for generating responses. Default is None.
+            json_mode (bool): Whether structured requests ask the API for a JSON object response
+                (`response_format={"type": "json_object"}`). Disable it for models without
+                JSON mode support. Default is True.
+            session (ProviderSession | None): The HTTP session to share with other components.
+                Default is None, meaning `ProviderSession.default()`.
 
         Raises:
             InvalidKeysException: If any of the required keys are missing.
@@ -71,6 +78,7 @@ class OpenAIChat(Llm):
 
         self.model = model
         self.api_key = api_key
+        self.json_mode = json_mode
 
         missing_keys = self.check_missing_keys(self.required_keys)
         if missing_keys:
@@ -79,7 +87,8 @@ class OpenAIChat(Llm):
                                        `OPENAI_API_KEY` and `MODEL` which contains it, or pass `api_key` and  `model`
                                        as a named parameter""")
 
-        self.client = OpenAI(api_key=self.api_key or os.environ.get("OPENAI_API_KEY", None))
+        self.session = session or ProviderSession.default()
+        self.client = self.session.openai(api_key=self.api_key or os.environ.get("OPENAI_API_KEY", None))
 
     def invoke_prompt(self, prompt, temperature: float = 0.5, max_tokens: int = 700, **kwargs):
         """
@@ -111,6 +120,7 @@ class OpenAIChat(Llm):
                                                    temperature=temperature,
                                                    max_tokens=max_tokens,
                                                    **kwargs)
+        self.record_usage(data.usage)
 
         return data.choices[0].message.content
 
@@ -0,0 +1,162 @@
+"""
+Replay Module
+
+This module re-drives a query log written by `raxo.utils.query_log.QueryLog` against a Raxo
+instance, to measure a new configuration under the load recorded in production.
+
+Requests are sent open-loop: each one is due at its original offset from the first record,
+divided by `speed`, whether or not earlier requests have finished. Latency is measured from that
+due time, so time spent waiting for a free worker counts against the configuration instead of
+silently lowering the offered rate. A speed of 0 sends every request as soon as a worker is free.
+
+The report holds the throughput, the latency percentiles next to the recorded ones, the outcomes,
+how often the replayed SQL matches the recorded SQL, and the SQL and template cache hit ratios.
+
+Classes:
+    Replayer: Replays logged requests at their original or a scaled rate.
+
+Usage Example:
+    from raxo.replay import Replayer
+    from raxo.utils.query_log import read_query_log
+
+    report = Replayer(raxo, speed=2.0, concurrency=16).run(read_query_log("queries.jsonl"))
+
+    # or from the command line, see `raxo.cli`
+    raxo replay queries.jsonl --factory myapp.raxo:build --speed 2 --concurrency 16
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from .benchmarks.stats import summarize
+from .utils.tracing import RootSpanHook
+
+logger = logging.getLogger(__name__)
+
+_TRAIN_FIELDS = ("question", "sql", "ddl", "documentation")
+
+
+def _hit_ratio(before: dict, after: dict) -> float | None:
+    hits = after["hits"] - before["hits"]
+    lookups = hits + after["misses"] - before["misses"]
+    return round(hits / lookups, 4) if lookups else None
+
+
+class Replayer:
+    """
+    Replays logged requests at their original or a scaled rate.
+
+    Attributes:
+        raxo (Raxo): The instance under test.
+        speed (float): The rate multiplier; 2 replays twice as fast, 0 as fast as possible.
+        concurrency (int): The requests running at once.
+        kinds (tuple[str]): The request kinds replayed, among "ask" and "train".
+    """
+
+    def __init__(self, raxo, speed: float = 1.0, concurrency: int = 16, kinds: tuple = ("ask",)):
+        """
+        Initialize an instance of the Replayer class.
+
+        Args:
+            raxo (Raxo): The instance under test.
+            speed (float): The rate multiplier; 0 sends requests as fast as possible. Default is 1.
+            concurrency (int): The requests running at once. Default is 16.
+            kinds (tuple[str]): The request kinds replayed. Default is ("ask",).
+
+        Raises:
+            ValueError: If `speed` is negative.
+        """
+        if speed < 0:
+            raise ValueError(f"Expected a non-negative speed, got {speed}")
+        self.raxo = raxo
+        self.speed = speed
+        self.concurrency = concurrency
+        self.kinds = tuple(kinds)
+        self._hook = RootSpanHook()
+
+    def _send(self, record: dict, due: float) -> dict:
+        raxo = self.raxo.with_namespace(record["namespace"]) if record.get("namespace") else self.raxo
+        start = time.perf_counter()
+        self._hook.take()
+        error = None
+        try:
+            if record["kind"] == "ask":
+                raxo.ask(record["question"])
+            else:
+                raxo.train(**{field: record[field] for field in _TRAIN_FIELDS if record.get(field)})
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        end = time.perf_counter()
+        span = self._hook.take()
+        attributes = span.attributes if span is not None else {}
+        return {"kind": record["kind"], "latency": end - due, "service": end - start,
+                "outcome": "exception" if error else attributes.get("outcome", "ok"),
+                "sql": attributes.get("sql"), "recorded_sql": record.get("sql"), "error": error}
+
+    def run(self, records: Iterable[dict], limit: int | None = None) -> dict:
+        """
+        Replay the records of a query log.
+
+        Args:
+            records (Iterable[dict]): The logged records, e.g. from `read_query_log`.
+            limit (int | None): The largest number of requests replayed. Default is None.
+
+        Returns:
+            dict: The requests sent, the elapsed seconds, the throughput, the replayed, service and
+            recorded latency summaries, the schedule lag, the outcomes, the SQL match ratio and the
+            cache hit ratios.
+        """
+        selected = [record for record in records if record.get("kind") in self.kinds
+                    and (record["kind"] != "ask" or record.get("question"))]
+        selected.sort(key=lambda record: record["ts"])
+        if limit is not None:
+            selected = selected[:limit]
+        if not selected:
+            return {"requests": 0}
+
+        self.raxo.tracer.add_hook(self._hook)
+        sql_before = self.raxo.sql_cache.stats()
+        template_before = self.raxo.template_cache.stats()
+        origin = selected[0]["ts"]
+        lags = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="raxo-replay") as executor:
+                start = time.perf_counter()
+                futures = []
+                for record in selected:
+                    due = start + (record["ts"] - origin) / self.speed if self.speed else time.perf_counter()
+                    delay = due - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    lags.append(max(time.perf_counter() - due, 0.0))
+                    futures.append(executor.submit(self._send, record, due))
+                results = [future.result() for future in futures]
+            elapsed = time.perf_counter() - start
+        finally:
+            self.raxo.tracer.hooks.remove(self._hook)
+
+        outcomes = {}
+        for result in results:
+            outcomes[result["outcome"]] = outcomes.get(result["outcome"], 0) + 1
+        compared = [result for result in results if result["kind"] == "ask" and result["recorded_sql"]]
+        report = {
+            "requests": len(results),
+            "elapsed_seconds": round(elapsed, 3),
+            "requests_per_second": round(len(results) / elapsed, 3) if elapsed else None,
+            "offered_per_second": round(len(results) / ((selected[-1]["ts"] - origin) / self.speed), 3)
+            if self.speed and selected[-1]["ts"] > origin else None,
+            "latency": summarize([result["latency"] for result in results]),
+            "service": summarize([result["service"] for result in results]),
+            "recorded": summarize([record["duration_ms"] / 1000 for record in selected if "duration_ms" in record]),
+            "schedule_lag_p99_ms": summarize(lags).get("p99_ms"),
+            "outcomes": outcomes,
+            "sql_match_ratio": round(sum(result["sql"] == result["recorded_sql"] for result in compared)
+                                     / len(compared), 4) if compared else None,
+            "cache_hit_ratio": {"sql": _hit_ratio(sql_before, self.raxo.sql_cache.stats()),
+                                "template": _hit_ratio(template_before, self.raxo.template_cache.stats())},
+        }
+        logger.info("Replay finished: %s requests, %.2f requests/s", report["requests"],
+                    report["requests_per_second"] or 0)
+        return report
@@ -0,0 +1,327 @@
+"""
+Server Module
+
+This module serves a long-lived Raxo instance over HTTP with the standard library only. The LLM,
+embedding, vector store and database clients are built once at startup and shared by every
+request; tenants are served through `Raxo.with_namespace` views of the same instance.
+
+Concurrency is bounded in two stages: at most `workers` requests run the pipeline at once and at
+most `queue_size` more wait for a worker. Requests beyond that are rejected immediately with
+`503 Service Unavailable` and a `Retry-After` header, so overload shows up as fast rejections
+instead of growing latency.
+
+Endpoints:
+    POST /ask          {"question": str, "namespace": dict?, "follow_ups": int?, "profile": bool?}
+    POST /train        {"ddl" | "documentation" | "sql": str, "question": str?, "namespace": dict?}
+    POST /follow-ups   {"question" | "sql": str, "count": int?, "namespace": dict?}
+    GET  /healthz      Liveness: 200 while the process serves requests.
+    GET  /readyz       Readiness: 200 once started, 503 while starting or draining.
+    GET  /metrics      Pipeline, cache and server metrics in the Prometheus text format.
+    GET  /profile      Hot functions of the profiled requests, with a ProfilingHook registered.
+
+Classes:
+    RaxoServer: A threaded HTTP server around a Raxo instance.
+
+Usage Example:
+    server = RaxoServer(raxo, host="0.0.0.0", port=8000, workers=8, queue_size=32)
+    server.serve_forever()
+
+    # or from the command line, see `raxo.cli`
+    raxo serve --factory myapp.raxo:build --port 8000
+    raxo serve --fake
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .utils.exceptions import NoTextProvided
+from .utils.result_set import ResultSet
+from .utils.tracing import MetricsHook
+
+logger = logging.getLogger(__name__)
+
+_MAX_BODY_BYTES = 1 << 20
+
+
+class _HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _int_field(body: dict, name: str, default: int = 0) -> int:
+    try:
+        return int(body.get(name) or default)
+    except (TypeError, ValueError):
+        raise _HttpError(400, f"{name} must be an integer")
+
+
+def _text_field(body: dict, name: str) -> str | None:
+    value = body.get(name)
+    if value is not None and not isinstance(value, str):
+        raise _HttpError(400, f"{name} must be a string")
+    return value
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "raxo"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status: int, body, content_type: str = "application/json", headers: dict | None = None):
+        if content_type == "application/json":
+            body = json.dumps(body, default=str)
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _content_length(self) -> int:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # The end of the body is unknown, so the connection cannot carry another request
+            self.close_connection = True
+            raise _HttpError(400, "invalid Content-Length")
+        if length > _MAX_BODY_BYTES:
+            # Not worth reading to keep the connection alive
+            self.close_connection = True
+            raise _HttpError(413, "request body too large")
+        return length
+
+    def _discard_body(self):
+        """Read the body of a request answered without it, so the next request starts at its boundary."""
+        try:
+            self.rfile.read(self._content_length())
+        except _HttpError:
+            pass
+
+    def _read_json(self) -> dict:
+        length = self._content_length()
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise _HttpError(400, "request body must be a JSON object")
+        if not isinstance(body, dict):
+            raise _HttpError(400, "request body must be a JSON object")
+        return body
+
+    def do_GET(self):
+        server = self.server.raxo_server
+        path = self.path.split("?", 1)[0]
+        if path == "/healthz":
+            self._send(200, {"status": "ok"})
+        elif path == "/readyz":
+            ready = server.ready.is_set()
+            self._send(200 if ready else 503, {"status": "ready" if ready else "unavailable"})
+        elif path == "/metrics":
+            self._send(200, server.render_metrics(), content_type="text/plain; version=0.0.4")
+        elif path == "/profile":
+            report = server.profile_report()
+            self._send(200 if report is not None else 404, report or {"error": "profiling is not enabled"})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        server = self.server.raxo_server
+        route = server.routes.get(self.path.split("?", 1)[0])
+        if route is None:
+            self._discard_body()
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            body = self._read_json()
+            if not server.ready.is_set():
+                raise _HttpError(503, "server is not ready")
+            with server.admit():
+                self._send(200, route(body))
+        except _HttpError as e:
+            headers = {"Retry-After": str(server.retry_after)} if e.status == 503 else None
+            self._send(e.status, {"error": e.message}, headers=headers)
+        except NoTextProvided as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            logger.exception("Request to %s failed", self.path)
+            self._send(500, {"error": str(e)})
+
+
+class RaxoServer:
+    """
+    A threaded HTTP server around a long-lived Raxo instance.
+
+    Attributes:
+        raxo (Raxo): The served instance.
+        workers (int): The maximum number of requests running the pipeline at once.
+        queue_size (int): The maximum number of requests waiting for a worker.
+        queue_timeout (float): Seconds a queued request waits for a worker before a 503.
+        ready (threading.Event): Set once the server accepts pipeline requests.
+        metrics (MetricsHook): The hook collecting pipeline spans.
+        max_result_rows (int): The most rows of an executed query returned by /ask.
+    """
+
+    def __init__(self, raxo, host: str = "127.0.0.1", port: int = 8000, workers: int = 8, queue_size: int = 32,
+                 queue_timeout: float = 30.0, retry_after: int = 1, max_result_rows: int = 10_000):
+        """
+        Initialize an instance of the RaxoServer class.
+
+        Args:
+            raxo (Raxo): The instance to serve.
+            host (str): The interface to bind. Default is "127.0.0.1".
+            port (int): The port to bind; 0 picks a free port. Default is 8000.
+            workers (int): The maximum number of requests running the pipeline at once. Default is 8.
+            queue_size (int): The maximum number of requests waiting for a worker. Default is 32.
+            queue_timeout (float): Seconds a queued request waits for a worker. Default is 30.
+            retry_after (int): The `Retry-After` seconds sent with 503 responses. Default is 1.
+            max_result_rows (int): The most rows of an executed query returned by /ask; larger
+                results are truncated and flagged. Default is 10,000.
+        """
+        self.raxo = raxo
+        self.workers = workers
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.max_result_rows = max_result_rows
+        self.ready = threading.Event()
+        self.metrics = next((hook for hook in raxo.tracer.hooks if isinstance(hook, MetricsHook)), None)
+        if self.metrics is None:
+            self.metrics = MetricsHook()
+            raxo.tracer.add_hook(self.metrics)
+        self.routes = {"/ask": self.ask, "/train": self.train, "/follow-ups": self.follow_ups}
+        self._admission = threading.BoundedSemaphore(workers + queue_size)
+        self._workers = threading.BoundedSemaphore(workers)
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "rejected": 0, "timed_out": 0, "in_flight": 0, "queued": 0}
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.raxo_server = self
+
+    @property
+    def address(self) -> tuple:
+        """The bound (host, port)."""
+        return self.httpd.server_address[:2]
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                self._stats[key] += value
+
+    @contextmanager
+    def admit(self):
+        """Hold a worker during a request; raises a 503 error when the queue is full or the wait times out."""
+        if not self._admission.acquire(blocking=False):
+            self._count(rejected=1)
+            raise _HttpError(503, "server is overloaded")
+        try:
+            self._count(requests=1, queued=1)
+            if not self._workers.acquire(timeout=self.queue_timeout):
+                self._count(queued=-1, timed_out=1)
+                raise _HttpError(503, "timed out waiting for a worker")
+            self._count(queued=-1, in_flight=1)
+            try:
+                yield
+            finally:
+                self._count(in_flight=-1)
+                self._workers.release()
+        finally:
+            self._admission.release()
+
+    def _scoped(self, body: dict):
+        namespace = body.get("namespace")
+        if namespace is not None and not isinstance(namespace, dict):
+            raise _HttpError(400, "namespace must be an object")
+        return self.raxo.with_namespace(namespace) if namespace else self.raxo
+
+    def ask(self, body: dict) -> dict:
+        raxo = self._scoped(body)
+        question = _text_field(body, "question")
+        follow_ups = _int_field(body, "follow_ups")
+        profile = bool(body.get("profile"))
+        if not follow_ups:
+            return self._result(raxo.ask(question, profile=profile))
+        result, future = raxo.ask_with_follow_ups(question, follow_ups, profile=profile)
+        return {**self._result(result), "follow_ups": future.result()}
+
+    def _result(self, result) -> dict:
+        if not isinstance(result, ResultSet):
+            return {"result": result}
+        # Only the returned page is read back from a spilled result
+        with result:
+            return {"result": result.page(0, self.max_result_rows), "row_count": len(result),
+                    "truncated": len(result) > self.max_result_rows}
+
+    def train(self, body: dict) -> dict:
+        fields = {key: _text_field(body, key) for key in ("question", "sql", "ddl", "documentation")}
+        if not any(fields[key] for key in ("sql", "ddl", "documentation")):
+            raise _HttpError(400, "one of ddl, documentation or sql is required")
+        return {"id": self._scoped(body).train(**fields)}
+
+    def follow_ups(self, body: dict) -> dict:
+        text = _text_field(body, "sql") or _text_field(body, "question")
+        return {"follow_ups": self._scoped(body).get_follow_up_questions(text, _int_field(body, "count", 3))}
+
+    def profile_report(self) -> dict | None:
+        """Return the hot functions of the requests profiled by a ProfilingHook, if one is registered."""
+        from .utils.profiling import ProfilingHook
+
+        for hook in self.raxo.tracer.hooks:
+            if isinstance(hook, ProfilingHook):
+                return {"mode": hook.mode, "profiled": hook.profiled, "functions": hook.hot_functions()}
+        return None
+
+    def render_metrics(self) -> str:
+        """Render pipeline, cache and server metrics in the Prometheus text format."""
+        with self._lock:
+            stats = dict(self._stats)
+        lines = [f"raxo_server_{key} {value}" for key, value in stats.items()]
+        lines += [f"raxo_server_workers {self.workers}", f"raxo_server_queue_size {self.queue_size}",
+                  f"raxo_server_ready {int(self.ready.is_set())}"]
+        for name, cache in (("sql", self.raxo.sql_cache), ("template", self.raxo.template_cache)):
+            lines += [f'raxo_cache_{key}{{cache="{name}"}} {value}' for key, value in cache.stats().items()]
+        for index, session in enumerate(self.raxo.sessions()):
+            lines += [f'raxo_http_{key}{{session="{index}"}} {value}' for key, value in session.stats().items()]
+        return "\n".join(lines) + "\n" + self.metrics.render()
+
+    def serve_forever(self):
+        """
+        Warm up provider connections and load the join graph of the stored DDL, then serve
+        requests until `shutdown` is called.
+        """
+        self.raxo.warm_up()
+        self.raxo.load_join_graph()
+        self.ready.set()
+        logger.info("Serving Raxo on http://%s:%s", *self.address)
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+
+    def shutdown(self, drain_timeout: float = 30.0):
+        """
+        Stop accepting pipeline requests, wait for in-flight ones and stop the server.
+
+        Args:
+            drain_timeout (float): The maximum number of seconds to wait for in-flight requests.
+                Default is 30.
+        """
+        self.ready.clear()
+        deadline = time.monotonic() + drain_timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if self._stats["in_flight"] == 0 and self._stats["queued"] == 0:
+                    break
+            time.sleep(0.05)
+        self.httpd.shutdown()
+        self.raxo.close()
@@ -0,0 +1,15 @@
+"""
+Testing Module
+
+This module provides deterministic, network-free fakes of the LLM, embedding, vector store and
+database integrations. They are used by the benchmark suite and can be used to exercise Raxo
+locally without API keys or a warehouse.
+
+Classes:
+    FakeLlm: An Llm answering prompts locally with configurable latency and jitter.
+    FakeEmbedding: An Embedding computing feature-hashed bag-of-words vectors.
+    InMemoryVectorStore: A brute-force Vector store returning Chroma-shaped query results.
+    SQLiteDatabase: A SQLite-backed stand-in for the database connectors.
+"""
+
+from .fakes import FakeLlm, FakeEmbedding, InMemoryVectorStore, SQLiteDatabase
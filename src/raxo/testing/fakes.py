@@ -0,0 +1,330 @@
+"""
+Fakes Module
+
+This module provides deterministic, network-free stand-ins for the components Raxo talks to.
+They implement the same interfaces as the real integrations, so a Raxo instance built from them
+exercises the full pipeline locally, with optional injected latency to mimic remote services.
+
+Classes:
+    FakeLlm: An Llm that answers with SQL for the best matching table found in the prompt.
+    FakeEmbedding: An Embedding computing feature-hashed bag-of-words vectors.
+    InMemoryVectorStore: A brute-force Vector store returning Chroma-shaped query results.
+    SQLiteDatabase: A SQLite-backed stand-in for MySQLConnector and VerticaConnector.
+
+Usage Example:
+    from raxo import Raxo
+    from raxo.testing import FakeLlm, FakeEmbedding, InMemoryVectorStore, SQLiteDatabase
+
+    database = SQLiteDatabase()
+    database.connect()
+    raxo = Raxo(llm=FakeLlm(latency=0.2, jitter=0.05), database=database,
+                vector_db=InMemoryVectorStore(), em_function=FakeEmbedding(latency=0.01))
+    raxo.train(ddl="CREATE TABLE sales (region VARCHAR(10), amount INT)")
+    print(raxo.ask("what are my region sales"))
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, List
+
+from ..embeddings.embedding import Embedding
+from ..models.llms import Llm
+from ..utils.exceptions import QueryExecutionError
+from ..utils.result_set import ResultSet
+from ..utils.tokens import estimate_prompt_tokens, estimate_tokens
+from ..vector.vector import Vector
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_]+")
+_TABLE_PATTERN = re.compile(r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?[`\"\[]?([A-Za-z0-9_.]+)", re.IGNORECASE)
+
+
+class _Latency:
+    """Sleeps for `latency` seconds plus a uniformly distributed jitter, reproducibly."""
+
+    def __init__(self, latency: float, jitter: float, seed: int):
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if self.latency <= 0 and self.jitter <= 0:
+            return
+        with self._lock:
+            delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class FakeLlm(Llm):
+    """
+    An Llm answering prompts locally and deterministically.
+
+    By default the answer is a JSON object in the format requested by the SQL generation prompt,
+    counting the rows of the table in the prompt whose name shares most words with the question. A custom `responder` can be supplied
+    to return any other text.
+
+    Attributes:
+        responder (Callable[[list], str]): Produces the response text from the prompt.
+        calls (int): The number of prompts answered so far.
+
+    Args:
+        latency (float): Seconds to sleep per call. Default is 0.
+        jitter (float): Maximum deviation added to or subtracted from `latency`. Default is 0.
+        seed (int): The seed for the jitter. Default is 0.
+        responder (Callable[[list], str] | None): A custom response function. Default is None.
+        responses (dict | None): Maps user questions to the SQL returned for them. Default is None.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: int = 0,
+                 responder: Callable[[list], str] | None = None, responses: dict | None = None):
+        Llm.__init__(self)
+        self.responder = responder or self._default_responder
+        self.responses = responses or {}
+        self.calls = 0
+        self._latency = _Latency(latency, jitter, seed)
+        self._lock = threading.Lock()
+
+    def invoke_prompt(self, prompt, temperature=0.5, max_tokens=700, **kwargs):
+        self._latency.wait()
+        with self._lock:
+            self.calls += 1
+        response = self.responder(prompt)
+        prompt_tokens = estimate_prompt_tokens(prompt)
+        completion_tokens = estimate_tokens(response)
+        self.record_usage({"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                           "total_tokens": prompt_tokens + completion_tokens})
+        return response
+
+    def _default_responder(self, prompt) -> str:
+        question = next((message["content"] for message in reversed(prompt) if message["role"] == "user"), "")
+        if question in self.responses:
+            return json.dumps({"sql": self.responses[question], "error": None})
+        context = "\n".join(message.get("content") or "" for message in prompt if message["role"] != "user")
+        tables = _TABLE_PATTERN.findall(context)
+        if not tables:
+            return json.dumps({"sql": None, "error": "No table found in the given context."})
+        words = set(_TOKEN_PATTERN.findall(question.lower()))
+        table = max(tables, key=lambda name: len(words & set(name.lower().split("_"))))
+        return json.dumps({"sql": f"SELECT COUNT(*) FROM {table}", "error": None})
+
+
+class FakeEmbedding(Embedding):
+    """
+    An Embedding computing feature-hashed bag-of-words vectors.
+
+    Texts sharing words get similar vectors, so retrieval over a synthetic schema behaves
+    plausibly while staying fully deterministic and network-free.
+
+    Args:
+        dimensions (int): The size of the produced vectors. Default is 256.
+        latency (float): Seconds to sleep per call. Default is 0.
+        jitter (float): Maximum deviation added to or subtracted from `latency`. Default is 0.
+        seed (int): The seed for the jitter. Default is 0.
+    """
+
+    def __init__(self, dimensions: int = 256, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        Embedding.__init__(self)
+        self.dimensions = dimensions
+        self.model = f"fake-hash-{dimensions}"
+        self.embed_mode = "fake"
+        self.calls = 0
+        self._latency = _Latency(latency, jitter, seed)
+        self._lock = threading.Lock()
+
+    def create_embedding(self, data: str) -> List[float]:
+        self._latency.wait()
+        with self._lock:
+            self.calls += 1
+        vector = [0.0] * self.dimensions
+        for token in _TOKEN_PATTERN.findall(data.lower()):
+            digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+
+class InMemoryVectorStore(Vector):
+    """
+    A brute-force vector store kept in process memory.
+
+    Query results use the same nested-list layout as ChromaDB (`ids`, `documents`, `metadatas`
+    and squared-L2 `distances`), so it can replace ChromaStore anywhere in the pipeline.
+
+    Args:
+        n_result_sql (int): The number of SQL results to retrieve. Default is 5.
+        n_result_ddl (int): The number of DDL results to retrieve. Default is 5.
+        n_result_doc (int): The number of documentation results to retrieve. Default is 5.
+    """
+
+    def __init__(self, n_result_sql=5, n_result_ddl=5, n_result_doc=5):
+        Vector.__init__(self)
+        self.n_result_sql = n_result_sql
+        self.n_result_ddl = n_result_ddl
+        self.n_result_doc = n_result_doc
+        self.collections = {"sql": {}, "ddl": {}, "documentation": {}}
+        self._lock = threading.Lock()
+
+    def _add(self, collection: str, suffix: str, document: str, embedding: list, metadata=None) -> str:
+        item_id = f"{str(uuid.uuid4())}-{suffix}"
+        with self._lock:
+            self.collections[collection][item_id] = (document, list(embedding), metadata)
+        return item_id
+
+    @staticmethod
+    def _in_namespace(metadata, namespace: dict | None) -> bool:
+        if not namespace:
+            return True
+        metadata = metadata or {}
+        return all(metadata.get(key) == value for key, value in namespace.items() if value is not None)
+
+    def _query(self, collection: str, embedding: list, n_results: int, namespace: dict | None = None,
+               include_embeddings: bool = False) -> dict:
+        with self._lock:
+            items = list(self.collections[collection].items())
+        scored = []
+        for item_id, (document, vector, metadata) in items:
+            if not self._in_namespace(metadata, namespace):
+                continue
+            distance = sum((a - b) * (a - b) for a, b in zip(embedding, vector))
+            scored.append((distance, item_id, document, metadata, vector))
+        scored.sort(key=lambda item: item[0])
+        scored = scored[:n_results]
+        result = {
+            "ids": [[item[1] for item in scored]],
+            "documents": [[item[2] for item in scored]],
+            "metadatas": [[item[3] for item in scored]],
+            "distances": [[item[0] for item in scored]],
+        }
+        if include_embeddings:
+            result["embeddings"] = [[item[4] for item in scored]]
+        return result
+
+    def add_ddl(self, ddl: str, embedding: list, namespace: dict | None = None, original: str | None = None) -> str:
+        return self._add("ddl", "ddl", ddl, embedding,
+                         {**(namespace or {}), **({"original": original} if original else {})} or None)
+
+    def add_question_sql(self, question: str, sql: str, embedding: list, namespace: dict | None = None) -> str:
+        return self._add("sql", "sql", question, embedding, {**(namespace or {}), "sql": sql})
+
+    def add_documentation(self, doc: str, embedding: list, namespace: dict | None = None) -> str:
+        return self._add("documentation", "doc", doc, embedding, dict(namespace) if namespace else None)
+
+    def get_ddl(self, question_embed: list, namespace: dict | None = None, n_results: int | None = None) -> dict:
+        n_results = self.n_result_ddl if n_results is None else n_results
+        return self._query("ddl", question_embed, n_results, namespace)
+
+    def list_ddl(self, namespace: dict | None = None) -> dict:
+        with self._lock:
+            items = [(item_id, document, metadata) for item_id, (document, _, metadata)
+                     in self.collections["ddl"].items() if self._in_namespace(metadata, namespace)]
+        return {"ids": [item[0] for item in items], "documents": [item[1] for item in items],
+                "metadatas": [item[2] for item in items]}
+
+    def get_similar_question_sql(self, question_embed: list, namespace: dict | None = None,
+                                 n_results: int | None = None) -> dict:
+        n_results = self.n_result_sql if n_results is None else n_results
+        return self._query("sql", question_embed, n_results, namespace, include_embeddings=True)
+
+    def get_documentation(self, question_embed: list, namespace: dict | None = None) -> dict:
+        return self._query("documentation", question_embed, self.n_result_doc, namespace)
+
+    def count(self, collection: str = "ddl", namespace: dict | None = None) -> int:
+        """Return the number of documents stored in a collection, optionally within a namespace."""
+        with self._lock:
+            return sum(1 for _, _, metadata in self.collections[collection].values()
+                       if self._in_namespace(metadata, namespace))
+
+    def delete_namespace(self, namespace: dict) -> None:
+        """Delete every document of a namespace."""
+        if not namespace:
+            raise ValueError("A non-empty namespace is required, refusing to delete every document.")
+        with self._lock:
+            for items in self.collections.values():
+                for item_id in [item_id for item_id, (_, _, metadata) in items.items()
+                                if self._in_namespace(metadata, namespace)]:
+                    del items[item_id]
+
+
+class SQLiteDatabase:
+    """
+    A SQLite-backed stand-in for MySQLConnector and VerticaConnector.
+
+    It exposes the same `connect`, `disconnect` and `execute_query` methods and a `dialect`
+    attribute. The connection is shared across threads and serialized with a lock.
+
+    Args:
+        path (str): The SQLite database file. Default is ":memory:".
+        latency (float): Seconds to sleep per query. Default is 0.
+        jitter (float): Maximum deviation added to or subtracted from `latency`. Default is 0.
+        seed (int): The seed for the jitter. Default is 0.
+        spill_threshold (int | None): The estimated result bytes above which rows are spilled to
+            disk, as in the real connectors. Default is 64 MiB.
+        max_result_bytes (int | None): The estimated result bytes above which a query fails. Default is None.
+    """
+
+    def __init__(self, path: str = ":memory:", latency: float = 0.0, jitter: float = 0.0, seed: int = 0,
+                 spill_threshold: int | None = 64 * 1024 * 1024, max_result_bytes: int | None = None):
+        self.path = path
+        self.connection = None
+        self.dialect = "SQLite"
+        self.paramstyle = "qmark"
+        self.spill_threshold = spill_threshold
+        self.max_result_bytes = max_result_bytes
+        self._latency = _Latency(latency, jitter, seed)
+        self._lock = threading.Lock()
+
+    def connect(self):
+        """Open the SQLite connection."""
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+
+    def disconnect(self):
+        """Close the SQLite connection."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def execute_script(self, script: str):
+        """Execute several `;`-separated statements, e.g. the DDL of a synthetic schema."""
+        with self._lock:
+            self.connection.executescript(script)
+            self.connection.commit()
+
+    def execute_query(self, query, params=None):
+        """
+        Execute a SQL query on the SQLite database.
+
+        Args:
+            query (str): The SQL query to be executed.
+            params (tuple, optional): A tuple of parameters to pass to the query. Default is None.
+
+        Returns:
+            ResultSet: The result of the query.
+
+        Raises:
+            ConnectionError: If there is no active connection to the database.
+            QueryExecutionError: If there is an error executing the query.
+            ResultTooLarge: If the result exceeds `max_result_bytes`.
+        """
+        if self.connection is None:
+            raise ConnectionError("Connection is not established. Call the connect method first.")
+        self._latency.wait()
+        with self._lock:
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(query, params or ())
+                return ResultSet.fetch(cursor, spill_threshold=self.spill_threshold,
+                                       max_bytes=self.max_result_bytes, query=query)
+            except sqlite3.Error as e:
+                raise QueryExecutionError(str(e), query=query) from e
+            finally:
+                cursor.close()
+
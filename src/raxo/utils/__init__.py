@@ -5,5 +5,13 @@ This module provides util classes and functions that support the main functional
 Currently, it includes custom exception classes used across the project.
 
 Modules:
+    cache: Contains a thread-safe LRU cache with hit and miss counters.
+    ddl: Contains a tolerant parser for MySQL and Vertica CREATE TABLE statements.
     exceptions: Contains custom exception classes used for specific error handling scenarios.
+    imports: Contains a helper resolving `module:attribute` references to objects.
+    normalize: Contains the canonicalization of questions into cache keys and literal slots.
+    session: Contains the ProviderSession sharing one HTTP connection pool between provider clients.
+    sql_utils: Contains the structured parser for LLM responses and SQL helpers.
+    tokens: Contains helpers estimating the token count of texts and prompts.
+    tracing: Contains the Tracer, Span and pluggable hooks used to instrument the pipeline.
 """
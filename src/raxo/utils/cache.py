@@ -0,0 +1,148 @@
+"""
+Cache Module
+
+This module provides LRUCache, a small thread-safe least-recently-used cache with hit and miss
+counters, shared by the caches of the Raxo pipeline.
+
+Cache keys of namespaced entries start with the namespace scope, the frozen set of the namespace's
+non-None items. A document trained in a namespace is retrieved by every namespace whose scope is a
+subset of the trained one, so only the entries of those scopes are invalidated by training.
+
+Classes:
+    LRUCache: A thread-safe LRU cache.
+
+Functions:
+    namespace_scope: Return the scope of a namespace.
+
+Usage Example:
+    cache = LRUCache(maxsize=1024)
+    cache.put(("region sales", ()), "SELECT region, SUM(amount) FROM sales GROUP BY region")
+    cache.get(("region sales", ()))
+    cache.stats()  # {"size": 1, "hits": 1, "misses": 0, "hit_rate": 1.0}
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+_MISSING = object()
+
+
+def namespace_scope(namespace: dict | None) -> frozenset:
+    """
+    Return the scope of a namespace: the frozen set of its non-None items.
+
+    Args:
+        namespace (dict | None): The namespace, e.g. {"tenant": "acme"}.
+
+    Returns:
+        frozenset: The (key, value) pairs; values are JSON encoded so that any value is hashable.
+    """
+    return frozenset((key, json.dumps(value, sort_keys=True, default=str))
+                     for key, value in (namespace or {}).items() if value is not None)
+
+
+class LRUCache:
+    """
+    A thread-safe least-recently-used cache.
+
+    Attributes:
+        maxsize (int): The maximum number of entries; 0 disables the cache.
+        hits (int): The number of successful lookups.
+        misses (int): The number of failed lookups.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize an instance of the LRUCache class.
+
+        Args:
+            maxsize (int): The maximum number of entries; 0 disables the cache. Default is 1024.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Return the value of a key, marking it as recently used, or `default`."""
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def setdefault(self, key, factory):
+        """
+        Return the value of a key, storing `factory()` first when it is missing.
+
+        The factory runs under the cache lock, so concurrent callers of a missing key share one
+        value; it must be fast, e.g. submitting work and returning a Future.
+        """
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+            value = factory()
+            if self.maxsize > 0:
+                self._entries[key] = value
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            return value
+
+    def discard(self, key, value=_MISSING):
+        """Remove a key, only if it still holds `value` when one is given."""
+        with self._lock:
+            if key in self._entries and (value is _MISSING or self._entries[key] is value):
+                del self._entries[key]
+
+    def discard_if(self, predicate: Callable) -> int:
+        """
+        Remove the entries whose key satisfies a predicate.
+
+        Args:
+            predicate (Callable): Called with each key.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self):
+        """Remove every entry, keeping the counters."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return the size, hits, misses and hit rate of the cache."""
+        lookups = self.hits + self.misses
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
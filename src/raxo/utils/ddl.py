@@ -0,0 +1,387 @@
+"""
+DDL Module
+
+This module parses CREATE TABLE statements of the supported dialects (MySQL and Vertica, and the
+ANSI-like subset used by SQLite) into plain table definitions. It is a tolerant, single-pass
+scanner rather than a full SQL grammar: unknown clauses are skipped instead of raising.
+
+Functions:
+    split_statements: Split a script into statements, respecting quotes and comments.
+    parse_create_tables: Parse every CREATE TABLE statement of a script.
+    is_categorical_type: Tell whether a column type holds short categorical strings.
+    compact_ddl: Rewrite CREATE TABLE statements in a compact canonical form for prompts.
+    compaction_report: Measure the tokens saved by `compact_ddl` on a schema.
+
+Usage Example:
+    from raxo.utils.ddl import compact_ddl, parse_create_tables
+
+    for table in parse_create_tables(ddl):
+        print(table["name"], [column["name"] for column in table["columns"]])
+    compact_ddl(ddl)  # "CREATE TABLE sales (id INT, region VARCHAR, amount DECIMAL, PRIMARY KEY (id))"
+"""
+
+import re
+from typing import List
+
+from .tokens import estimate_tokens
+
+# A quoted identifier runs to its closing quote; a doubled quote inside it is an escaped quote
+_IDENTIFIER = r"(?:`(?:[^`]|``)*`|\"(?:[^\"]|\"\")*\"|\[[^\]]*\]|[\w$]+)"
+_QUALIFIED_IDENTIFIER = rf"{_IDENTIFIER}(?:\s*\.\s*{_IDENTIFIER})*"
+_IDENTIFIER_PART = re.compile(r"`((?:[^`]|``)*)`|\"((?:[^\"]|\"\")*)\"|\[([^\]]*)\]|([^.`\"\[]+)")
+_CREATE_TABLE = re.compile(
+    r"^\s*CREATE\s+(?:OR\s+REPLACE\s+)?(?:(?:GLOBAL|LOCAL)\s+)?(?:TEMP(?:ORARY)?\s+)?(?:FLEX\s+)?TABLE\s+"
+    rf"(?:IF\s+NOT\s+EXISTS\s+)?(?P<name>{_QUALIFIED_IDENTIFIER})\s*\(",
+    re.IGNORECASE)
+# Words completing a type after its name or its length, e.g. DOUBLE PRECISION or TIMESTAMP(3) WITH TIME ZONE
+_COLUMN_TYPE = re.compile(
+    r"(\w+(?:\s+(?:VARYING|PRECISION|UNSIGNED|ZEROFILL|VARCHAR|VARBINARY))*(?:\s*\([^)]*\))?"
+    r"(?:\s+(?:UNSIGNED|ZEROFILL|(?:WITH|WITHOUT)(?:\s+LOCAL)?\s+TIME\s+ZONE"
+    r"|(?:YEAR|MONTH|DAY|HOUR|MINUTE|SECOND)(?:\s+TO\s+(?:MONTH|HOUR|MINUTE|SECOND))?))*)",
+    re.IGNORECASE)
+_CONSTRAINT_KEYWORDS = ("PRIMARY", "FOREIGN", "UNIQUE", "KEY", "INDEX", "CONSTRAINT", "CHECK", "FULLTEXT",
+                        "SPATIAL", "PARTITION", "ORDER", "SEGMENTED", "UNSEGMENTED", "LIKE")
+_CATEGORICAL_TYPES = ("CHAR", "VARCHAR", "NCHAR", "NVARCHAR", "ENUM", "SET", "STRING", "VARCHAR2", "CHARACTER")
+_COLUMN_LIST = re.compile(r"\(([^)]*)\)")
+
+
+def unquote_identifier(identifier: str) -> str:
+    """Strip backticks, double quotes or brackets around each part of an identifier and unescape doubled quotes."""
+    parts = []
+    for match in _IDENTIFIER_PART.finditer(identifier):
+        backtick, double, bracket, plain = match.groups()
+        if backtick is not None:
+            parts.append(backtick.replace("``", "`"))
+        elif double is not None:
+            parts.append(double.replace('""', '"'))
+        elif bracket is not None:
+            parts.append(bracket)
+        elif plain.strip():
+            parts.append(plain.strip())
+    return ".".join(parts)
+
+
+def _strip_comments(sql: str) -> str:
+    output, index, quote = [], 0, None
+    while index < len(sql):
+        char = sql[index]
+        if quote:
+            output.append(char)
+            if char == quote:
+                quote = None
+            elif char == "\\" and index + 1 < len(sql):
+                output.append(sql[index + 1])
+                index += 1
+        elif char in ("'", '"', "`"):
+            quote = char
+            output.append(char)
+        elif sql.startswith("--", index) or char == "#":
+            end = sql.find("\n", index)
+            index = len(sql) if end == -1 else end
+            continue
+        elif sql.startswith("/*", index):
+            end = sql.find("*/", index + 2)
+            index = len(sql) if end == -1 else end + 2
+            output.append(" ")
+            continue
+        else:
+            output.append(char)
+        index += 1
+    return "".join(output)
+
+
+def _split_top_level(text: str, separator: str = ",") -> List[str]:
+    parts, depth, quote, current = [], 0, None, []
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"', "`"):
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _matching_paren(text: str, start: int) -> int:
+    depth, quote = 0, None
+    for index in range(start, len(text)):
+        char = text[index]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"', "`"):
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return index
+    return -1
+
+
+def split_statements(script: str) -> List[str]:
+    """
+    Split a SQL script into statements, ignoring `;` inside quotes and removing comments.
+
+    Args:
+        script (str): The SQL script.
+
+    Returns:
+        list[str]: The non-empty statements, without their trailing `;`.
+    """
+    return _split_top_level(_strip_comments(script), ";")
+
+
+def _column_names(text: str) -> List[str]:
+    match = _COLUMN_LIST.search(text)
+    if not match:
+        return []
+    return [unquote_identifier(name) for name in _split_top_level(match.group(1))]
+
+
+def _parse_column(definition: str) -> dict | None:
+    match = re.match(rf"({_IDENTIFIER})\s*(.*)$", definition, re.DOTALL)
+    if not match or not match.group(2).strip():
+        return None
+    name, rest = unquote_identifier(match.group(1)), match.group(2).strip()
+    type_match = _COLUMN_TYPE.match(rest)
+    column_type = re.sub(r"\s+", " ", type_match.group(1)).strip() if type_match else rest.split()[0]
+    options = rest[len(type_match.group(1)):] if type_match else ""
+    column = {"name": name, "type": column_type, "nullable": not re.search(r"\bNOT\s+NULL\b", options, re.IGNORECASE)}
+    comment = re.search(r"\bCOMMENT\s+'((?:[^'\\]|\\.|'')*)'", options, re.IGNORECASE)
+    if comment:
+        column["comment"] = comment.group(1)
+    references = re.search(rf"\bREFERENCES\s+({_QUALIFIED_IDENTIFIER})\s*(\([^)]*\))?", options, re.IGNORECASE)
+    if references:
+        column["references"] = (unquote_identifier(references.group(1)),
+                                _column_names(references.group(2) or "") or None)
+    if re.search(r"\bPRIMARY\s+KEY\b", options, re.IGNORECASE):
+        column["primary_key"] = True
+    return column
+
+
+def _parse_constraint(definition: str, table: dict):
+    upper = definition.upper()
+    if re.match(r"(CONSTRAINT\s+\S+\s+)?PRIMARY\s+KEY", upper):
+        table["primary_key"] = _column_names(definition)
+    elif re.match(r"(CONSTRAINT\s+\S+\s+)?FOREIGN\s+KEY", upper):
+        match = re.search(rf"FOREIGN\s+KEY\s*(\([^)]*\))\s*REFERENCES\s+({_QUALIFIED_IDENTIFIER})\s*(\([^)]*\))?",
+                          definition, re.IGNORECASE)
+        if match:
+            table["foreign_keys"].append({
+                "columns": _column_names(match.group(1)),
+                "table": unquote_identifier(match.group(2)),
+                "referenced_columns": _column_names(match.group(3) or ""),
+            })
+
+
+def parse_create_table(statement: str) -> dict | None:
+    """
+    Parse a single CREATE TABLE statement.
+
+    Args:
+        statement (str): The statement, comments allowed.
+
+    Returns:
+        dict | None: {"name", "columns", "primary_key", "foreign_keys", "options"} where columns are
+            {"name", "type", "nullable"[, "comment", "references", "primary_key"]} dicts and
+            "options" holds the text after the column list; None if it is not a CREATE TABLE.
+    """
+    statement = _strip_comments(statement).strip()
+    match = _CREATE_TABLE.match(statement)
+    if not match:
+        return None
+    open_paren = match.end() - 1
+    close_paren = _matching_paren(statement, open_paren)
+    if close_paren == -1:
+        return None
+    table = {"name": unquote_identifier(match.group("name")), "columns": [], "primary_key": [],
+             "foreign_keys": [], "options": statement[close_paren + 1:].strip().rstrip(";").strip()}
+    for definition in _split_top_level(statement[open_paren + 1:close_paren]):
+        first_word = definition.split(None, 1)[0].upper()
+        if first_word in _CONSTRAINT_KEYWORDS:
+            _parse_constraint(definition, table)
+            continue
+        column = _parse_column(definition)
+        if column is None:
+            continue
+        table["columns"].append(column)
+        if column.get("primary_key") and column["name"] not in table["primary_key"]:
+            table["primary_key"].append(column["name"])
+        if "references" in column:
+            referenced_table, referenced_columns = column["references"]
+            table["foreign_keys"].append({"columns": [column["name"]], "table": referenced_table,
+                                          "referenced_columns": referenced_columns or []})
+    return table
+
+
+def parse_create_tables(script: str) -> List[dict]:
+    """
+    Parse every CREATE TABLE statement of a script.
+
+    Args:
+        script (str): One or more `;`-separated statements.
+
+    Returns:
+        list[dict]: The parsed tables, see `parse_create_table`.
+    """
+    tables = []
+    for statement in split_statements(script):
+        table = parse_create_table(statement)
+        if table is not None:
+            tables.append(table)
+    return tables
+
+
+def is_categorical_type(column_type: str, max_length: int = 255) -> bool:
+    """
+    Tell whether a column type holds short strings that are likely categorical.
+
+    Args:
+        column_type (str): The declared type, e.g. "VARCHAR(50)".
+        max_length (int): The longest declared length still considered categorical. Default is 255.
+
+    Returns:
+        bool: True for CHAR/VARCHAR/ENUM-like types no longer than `max_length`.
+    """
+    match = re.match(r"\s*(?:NATIONAL\s+)?(\w+)(?:\s+VARYING)?\s*(?:\(\s*(\d+)?)?", column_type, re.IGNORECASE)
+    if not match or match.group(1).upper() not in _CATEGORICAL_TYPES:
+        return False
+    return match.group(2) is None or int(match.group(2)) <= max_length
+
+
+# Types whose length or precision does not change how a query is written
+_SIZED_TYPES = ("TINYINT", "SMALLINT", "MEDIUMINT", "INT", "INTEGER", "BIGINT", "CHAR", "VARCHAR", "NCHAR",
+                "NVARCHAR", "VARCHAR2", "CHARACTER", "BINARY", "VARBINARY", "DECIMAL", "NUMERIC", "NUMBER",
+                "FLOAT", "DOUBLE", "REAL", "TIMESTAMP", "DATETIME", "TIME", "BIT", "VARYING", "PRECISION")
+_RESERVED_WORDS = frozenset((
+    "all", "and", "as", "asc", "between", "by", "case", "check", "column", "constraint", "create", "cross",
+    "current_date", "current_time", "current_timestamp", "current_user", "date", "default", "delete", "desc",
+    "distinct", "drop", "else", "end", "exists", "from", "full", "group", "having", "in", "index", "inner",
+    "insert", "interval", "into", "is", "join", "key", "left", "like", "limit", "not", "null", "on", "or",
+    "order", "outer", "primary", "range", "references", "right", "rows", "select", "set", "table", "then",
+    "time", "timestamp", "to", "union", "unique", "update", "user", "using", "values", "when", "where", "with",
+))
+_PLAIN_IDENTIFIER = re.compile(r"^[A-Za-z_][\w$]*$")
+
+
+def _compact_identifier(identifier: str, dialect: str) -> str:
+    quote = "`" if dialect.lower() == "mysql" else '"'
+    return ".".join(part if _PLAIN_IDENTIFIER.match(part) and part.lower() not in _RESERVED_WORDS
+                    else f"{quote}{part.replace(quote, quote * 2)}{quote}" for part in identifier.split("."))
+
+
+def _compact_type(column_type: str) -> str:
+    column_type = re.sub(r"\s+(?:UNSIGNED|ZEROFILL)\b", "", column_type, flags=re.IGNORECASE).strip()
+    match = re.match(r"([A-Za-z][\w ]*?)\s*(?:(\(.*\))\s*([A-Za-z][\w ]*)?)?$", column_type, re.DOTALL)
+    if not match:
+        return column_type
+    name, arguments = " ".join(match.group(1).upper().split()), match.group(2)
+    # Words after the length belong to the type, e.g. TIMESTAMP(3) WITH TIME ZONE
+    suffix = " " + " ".join(match.group(3).upper().split()) if match.group(3) else ""
+    # ENUM and SET values are kept, they are what filters compare against
+    if arguments and name.split()[-1] not in _SIZED_TYPES:
+        return name + arguments + suffix
+    return name + suffix
+
+
+def _compact_comment(comment: str) -> str:
+    return "'" + re.sub(r"\s+", " ", comment).strip() + "'"
+
+
+def compact_create_table(table: dict, dialect: str = "MySQL", keep_comments: bool = True) -> str:
+    """
+    Render a parsed table as a single-line CREATE TABLE statement without boilerplate.
+
+    Only column names and simplified types, the primary key, foreign keys and, optionally, column
+    and table comments are kept. Lengths, precisions and display widths, NULL and DEFAULT clauses,
+    constraint names, indexes, storage options and partitioning are dropped.
+
+    Args:
+        table (dict): A table returned by `parse_create_table`.
+        dialect (str): The dialect whose quotes are used for reserved or unusual names. Default is "MySQL".
+        keep_comments (bool): Whether to keep column and table comments. Default is True.
+
+    Returns:
+        str: The compact statement.
+    """
+    quote = lambda name: _compact_identifier(name, dialect)  # noqa: E731
+    parts = []
+    for column in table["columns"]:
+        part = f"{quote(column['name'])} {_compact_type(column['type'])}"
+        if keep_comments and column.get("comment"):
+            part += f" COMMENT {_compact_comment(column['comment'])}"
+        parts.append(part)
+    if table["primary_key"]:
+        parts.append(f"PRIMARY KEY ({', '.join(map(quote, table['primary_key']))})")
+    for foreign_key in table["foreign_keys"]:
+        referenced = f"({', '.join(map(quote, foreign_key['referenced_columns']))})" \
+            if foreign_key["referenced_columns"] else ""
+        parts.append(f"FOREIGN KEY ({', '.join(map(quote, foreign_key['columns']))}) "
+                     f"REFERENCES {quote(foreign_key['table'])}{referenced}")
+    statement = f"CREATE TABLE {quote(table['name'])} ({', '.join(parts)})"
+    comment = re.search(r"\bCOMMENT\s*=?\s*'((?:[^'\\]|\\.|'')*)'", table["options"], re.IGNORECASE)
+    if keep_comments and comment:
+        statement += f" COMMENT {_compact_comment(comment.group(1))}"
+    return statement
+
+
+def compact_ddl(script: str, dialect: str = "MySQL", keep_comments: bool = True) -> str:
+    """
+    Rewrite the CREATE TABLE statements of a script in a compact canonical form.
+
+    The result is still DDL, so it can be parsed again, e.g. by the template cache or the join
+    graph. `ALTER TABLE ... FOREIGN KEY` statements and, with `keep_comments`, `COMMENT ON`
+    statements are kept on one line; other statements (indexes, Vertica projections, grants...)
+    are dropped. A script without any CREATE TABLE statement is returned unchanged.
+
+    Args:
+        script (str): One or more `;`-separated statements of any supported dialect.
+        dialect (str): The dialect whose quotes are used for reserved or unusual names. Default is "MySQL".
+        keep_comments (bool): Whether to keep column and table comments. Default is True.
+
+    Returns:
+        str: The compact statements, one per line.
+    """
+    statements, tables = [], 0
+    for statement in split_statements(script):
+        table = parse_create_table(statement)
+        if table is not None:
+            statements.append(compact_create_table(table, dialect, keep_comments))
+            tables += 1
+            continue
+        upper = statement.lstrip().upper()
+        if upper.startswith("ALTER TABLE") and "FOREIGN KEY" in upper or \
+                keep_comments and upper.startswith("COMMENT ON"):
+            statements.append(re.sub(r"\s+", " ", statement).strip())
+    return ";\n".join(statements) if tables else script.strip()
+
+
+def compaction_report(ddl, dialect: str = "MySQL", keep_comments: bool = True) -> dict:
+    """
+    Measure the tokens saved by `compact_ddl`.
+
+    Args:
+        ddl (str | list[str]): A script, or DDL documents as they would be trained.
+        dialect (str): The dialect passed to `compact_ddl`. Default is "MySQL".
+        keep_comments (bool): Passed to `compact_ddl`. Default is True.
+
+    Returns:
+        dict: The number of documents, the estimated tokens before and after compaction, the
+        tokens saved and the ratio of tokens kept.
+    """
+    documents = [ddl] if isinstance(ddl, str) else list(ddl)
+    before = sum(estimate_tokens(document) for document in documents)
+    after = sum(estimate_tokens(compact_ddl(document, dialect, keep_comments)) for document in documents)
+    return {"documents": len(documents), "tokens_before": before, "tokens_after": after, "saved": before - after,
+            "ratio": round(after / before, 3) if before else 1.0}
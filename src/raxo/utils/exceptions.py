@@ -12,6 +12,9 @@ Classes:
     PromptError: Exception raised for errors related to prompts.
     InvalidKeysException: Exception raised for missing keys required for the database connection.
     NoTextProvided: Exception raised when no text is provided as input.
+    QueryExecutionError: Exception raised when the database fails to execute a query.
+    ResultTooLarge: Exception raised when a query result exceeds the allowed size.
+    ReadOnlyStore: Exception raised when writing to a read-only vector store.
 
 Usage Example:
     try:
@@ -74,3 +77,42 @@ class NoTextProvided(Exception):
     def __init__(self, message="Please provide a valid input"):
         self.message = message
         super().__init__(self.message)
+
+
+class QueryExecutionError(RuntimeError):
+    """
+    Exception raised when the database fails to execute a query.
+
+    Attributes:
+        message (str): Explanation of the error, as reported by the database driver.
+        query (str | None): The query that failed.
+    """
+    def __init__(self, message="An error occurred while executing the query", query=None):
+        self.message = message
+        self.query = query
+        super().__init__(self.message)
+
+
+class ResultTooLarge(QueryExecutionError):
+    """
+    Exception raised when a query result exceeds the connector's `max_result_bytes`.
+
+    As a QueryExecutionError, it is fed back to the LLM like any database error, which can then
+    aggregate or limit the query.
+
+    Attributes:
+        message (str): Explanation of the error.
+        query (str | None): The query whose result was too large.
+    """
+
+
+class ReadOnlyStore(Exception):
+    """
+    Exception raised when writing to a read-only vector store, such as a SnapshotStore.
+
+    Attributes:
+        message (str): Explanation of the error.
+    """
+    def __init__(self, message="The vector store is read-only"):
+        self.message = message
+        super().__init__(self.message)
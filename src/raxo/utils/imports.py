@@ -0,0 +1,36 @@
+"""
+Imports Module
+
+This module resolves `module:attribute` references, which the command line tools use to load
+user-provided factories such as a function building a configured Raxo instance.
+
+Usage Example:
+    from raxo.utils.imports import import_object
+
+    factory = import_object("my_app.raxo:make_raxo")
+    raxo = factory()
+"""
+
+import importlib
+
+
+def import_object(spec: str):
+    """
+    Import an object from a `module:attribute` reference.
+
+    Args:
+        spec (str): The reference, e.g. "my_app.raxo:make_raxo". Dotted attributes are supported.
+
+    Returns:
+        object: The referenced object.
+
+    Raises:
+        ValueError: If the reference is not of the form `module:attribute`.
+    """
+    module_name, _, attribute = spec.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Expected a `module:attribute` reference, got {spec!r}")
+    target = importlib.import_module(module_name)
+    for part in attribute.split("."):
+        target = getattr(target, part)
+    return target
@@ -0,0 +1,195 @@
+"""
+Normalize Module
+
+This module canonicalizes natural language questions so that differently phrased versions of the
+same question share one cache key. Canonicalization is local and fast, with no model call:
+
+1. Literals (quoted strings, ISO dates, numbers) and known entities, such as the column values
+   of a ColumnValueIndex, are extracted into slots and replaced by placeholders.
+2. Relative date phrases ("last month", "past 7 days", "ytd") become relative tokens.
+3. Comparison operators, percent signs and currency symbols become tokens ("<ge>", "<pct>",
+   "<usd>"), so "amount >= 100" and "amount > 100" keep different keys.
+4. The text is case folded and stripped of punctuation and stop phrases ("please", "show me",
+   "what are my").
+
+Slots keep the extracted values in order, so SQL cached for a canonical question can be re-used
+for another question differing only in its literals.
+
+Classes:
+    CanonicalQuestion: The canonical form of a question.
+
+Functions:
+    canonicalize: Canonicalize a question.
+
+Usage Example:
+    canonicalize("What are my region sales?").key       # "region sales"
+    canonicalize("region sales please").key             # "region sales"
+    question = canonicalize("sales over 100 in 'EMEA' last month")
+    question.key    # "sales over <num0> in <str0> <last_month>"
+    question.slots  # [{"name": "num0", "kind": "num", "value": 100}, {"name": "str0", "kind": "str", "value": "EMEA"}]
+"""
+
+import re
+from typing import Iterable, List
+
+DEFAULT_STOP_PHRASES = (
+    "i want to know", "i would like to know", "i want to see", "i would like to see", "can you", "could you",
+    "would you", "please", "kindly", "show me", "tell me", "give me", "list me", "let me know", "what are",
+    "what is", "what were", "what was", "what's", "whats", "my", "our", "the", "a", "an", "all", "of all",
+)
+
+# Relative date phrases and the token replacing them; a captured count becomes a "num" slot
+_RELATIVE_DATES = (
+    (r"(?:in the |over the )?(?:last|past|previous) (?P<count>\d+) (?P<unit>day|week|month|quarter|year)s?",
+     "last_n_{unit}s"),
+    (r"(?:in the |over the )?next (?P<count>\d+) (?P<unit>day|week|month|quarter|year)s?", "next_n_{unit}s"),
+    (r"(?:last|past|previous) (?P<unit>day|week|month|quarter|year)", "last_{unit}"),
+    (r"(?:this|current) (?P<unit>day|week|month|quarter|year)", "this_{unit}"),
+    (r"next (?P<unit>day|week|month|quarter|year)", "next_{unit}"),
+    (r"(?P<unit>day|week|month|quarter|year) to date", "{unit}_to_date"),
+    (r"(?P<unit>[ywmq])td", "{unit}td"),
+    (r"(?:the )?day before yesterday", "day_before_yesterday"),
+    (r"yesterday", "yesterday"),
+    (r"today", "today"),
+    (r"tomorrow", "tomorrow"),
+)
+_LITERALS = (
+    ("str", r"'(?P<single>[^']*)'|\"(?P<double>[^\"]*)\"|`(?P<backtick>[^`]*)`"),
+    ("date", r"\b\d{4}-\d{2}-\d{2}\b"),
+)
+# A comma only groups thousands, so "1,2" stays two numbers while "1,200" is one
+_NUMBER = r"(?<!\w)-?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)*(?!\w)"
+_GROUPED_NUMBER = re.compile(r"-?\d{1,3}(?:,\d{3})+(?:\.\d+)?")
+# Symbols changing the meaning of a question, longest first, and the token replacing them
+_SYMBOLS = (
+    ("!=", "ne"), ("<>", "ne"), (">=", "ge"), ("=>", "ge"), ("<=", "le"), ("=<", "le"), ("==", "eq"),
+    ("=", "eq"), (">", "gt"), ("<", "lt"), ("%", "pct"), ("$", "usd"), ("€", "eur"), ("£", "gbp"),
+    ("¥", "jpy"), ("₹", "inr"),
+)
+_SYMBOL_TOKENS = dict(_SYMBOLS)
+_PUNCTUATION = re.compile(r"[^\w\s<>]+")
+
+
+def _scanner(entities: tuple = ()):
+    """Compile one pattern matching every slot and relative date, tried left to right."""
+    alternatives = [f"(?P<{kind}>{pattern})" for kind, pattern in _LITERALS]
+    alternatives += [f"(?P<rel{index}>\\b(?:{pattern})\\b)".replace("?P<count>", f"?P<count{index}>")
+                     .replace("?P<unit>", f"?P<unit{index}>") for index, (pattern, _) in enumerate(_RELATIVE_DATES)]
+    alternatives.append("(?P<symbol>" + "|".join(re.escape(symbol) for symbol, _ in _SYMBOLS) + ")")
+    if entities:
+        alternatives.append("(?P<value>(?<!\\w)(?:" + "|".join(re.escape(entity) for entity in entities) + ")(?!\\w))")
+    alternatives.append(f"(?P<num>{_NUMBER})")
+    return re.compile("|".join(alternatives), re.IGNORECASE)
+
+
+_DEFAULT_SCANNER = _scanner()
+
+
+class CanonicalQuestion:
+    """
+    The canonical form of a question.
+
+    Attributes:
+        text (str): The original question.
+        key (str): The canonical text, used as a cache key.
+        slots (list[dict]): The extracted literals in order of appearance, as {"name", "kind",
+            "value"} dicts where kind is "str", "date", "num" or "value" (a known entity).
+        relative_dates (list[str]): The relative date tokens found, e.g. ["last_month"].
+    """
+
+    __slots__ = ("text", "key", "slots", "relative_dates")
+
+    def __init__(self, text: str, key: str, slots: List[dict], relative_dates: List[str]):
+        self.text = text
+        self.key = key
+        self.slots = slots
+        self.relative_dates = relative_dates
+
+    @property
+    def values(self) -> tuple:
+        """The slot values, in order."""
+        return tuple(slot["value"] for slot in self.slots)
+
+    def __repr__(self):
+        return f"CanonicalQuestion(key={self.key!r}, slots={self.slots!r})"
+
+
+def _parse_number(text: str):
+    cleaned = text.replace(",", "") if _GROUPED_NUMBER.fullmatch(text) else text
+    try:
+        return int(cleaned)
+    except ValueError:
+        try:
+            return float(cleaned)
+        except ValueError:
+            return text
+
+
+def _stop_phrase_pattern(stop_phrases: Iterable[str]):
+    phrases = sorted({phrase.casefold() for phrase in stop_phrases}, key=len, reverse=True)
+    if not phrases:
+        return None
+    return re.compile(r"(?<![\w<])(?:" + "|".join(re.escape(phrase) for phrase in phrases) + r")(?![\w>])")
+
+
+_DEFAULT_STOP_PATTERN = _stop_phrase_pattern(DEFAULT_STOP_PHRASES)
+
+
+def canonicalize(question: str, entities: Iterable[str] | None = None,
+                 stop_phrases: Iterable[str] | None = None) -> CanonicalQuestion:
+    """
+    Canonicalize a question.
+
+    Args:
+        question (str): The natural language question.
+        entities (Iterable[str] | None): Known values, e.g. column values matched by a
+            ColumnValueIndex, extracted into "value" slots when they appear in the question.
+            Default is None.
+        stop_phrases (Iterable[str] | None): Phrases removed from the key. Default is
+            DEFAULT_STOP_PHRASES.
+
+    Returns:
+        CanonicalQuestion: The canonical key and the extracted slots.
+    """
+    entities = tuple(sorted({entity for entity in entities or () if entity}, key=len, reverse=True))
+    by_folded = {entity.casefold(): entity for entity in entities}
+    scanner = _scanner(entities) if entities else _DEFAULT_SCANNER
+    slots, counters, relative_dates = [], {}, []
+
+    def slot(kind: str, value) -> str:
+        name = f"{kind}{counters.get(kind, 0)}"
+        counters[kind] = counters.get(kind, 0) + 1
+        slots.append({"name": name, "kind": kind, "value": value})
+        return f" <{name}> "
+
+    def replace(match) -> str:
+        kind = match.lastgroup
+        if kind == "str":
+            quoted = next(value for value in (match.group("single"), match.group("double"),
+                                              match.group("backtick")) if value is not None)
+            return slot("str", quoted)
+        if kind == "date":
+            return slot("date", match.group(0))
+        if kind == "value":
+            return slot("value", by_folded.get(match.group(0).casefold(), match.group(0)))
+        if kind == "num":
+            return slot("num", _parse_number(match.group(0)))
+        if kind == "symbol":
+            return f" <{_SYMBOL_TOKENS[match.group(0)]}> "
+        # The outermost group closes last, so a relative date reports its "rel<index>" group
+        index = int(kind[3:])
+        groups = match.groupdict()
+        unit = (groups.get(f"unit{index}") or "").lower()
+        token = _RELATIVE_DATES[index][1].format(unit=unit)
+        relative_dates.append(token)
+        replacement = f" <{token}> "
+        if groups.get(f"count{index}") is not None:
+            replacement += slot("num", int(groups[f"count{index}"]))
+        return replacement
+
+    text = scanner.sub(replace, question).casefold()
+    stop_pattern = _DEFAULT_STOP_PATTERN if stop_phrases is None else _stop_phrase_pattern(stop_phrases)
+    if stop_pattern is not None:
+        text = stop_pattern.sub(" ", text)
+    key = " ".join(_PUNCTUATION.sub(" ", text).split())
+    return CanonicalQuestion(question, key, slots, relative_dates)
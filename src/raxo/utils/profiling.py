@@ -0,0 +1,301 @@
+"""
+Profiling Module
+
+This module profiles individual Raxo requests, to find where the time of a slow `ask` went: the
+vector store, output parsing, the provider SDK or the database driver.
+
+ProfilingHook is a trace hook. It profiles a sampled fraction of the `ask` requests, and every
+request asked with `profile=True`, from the start to the end of the request's root span and on the
+request's thread only, so concurrent requests do not blur each other. Two modes are available:
+    - "sample": a shared background thread reads the request thread's Python stack every
+      `interval` seconds. Wall-clock time is captured, including time blocked on sockets and
+      locks, at a cost that does not depend on the number of calls.
+    - "cprofile": `cProfile` records every call of the request thread, with exact call counts
+      but a higher overhead. Only one request is profiled at a time on Python 3.12 and later.
+
+Each profiled request slower than `min_duration` is written to `output_dir`. Sampled requests are
+written as collapsed stacks ("frame;frame;frame count" lines), which `flamegraph.pl`, speedscope
+and inferno read directly. cProfile requests are written as `pstats` files. Every profiled request
+is also added to an aggregate that `hot_functions` summarizes.
+
+Without the hook the tracer does no profiling work. With the hook, a request that is not
+profiled costs two comparisons and, with a non-zero `sample_rate`, one random draw.
+
+Classes:
+    ProfilingHook: Profiles sampled requests and aggregates their hot functions.
+
+Usage Example:
+    from raxo.utils.profiling import ProfilingHook
+
+    profiler = ProfilingHook(output_dir="profiles", sample_rate=0.01, min_duration=2.0)
+    raxo = Raxo(llm=open_ai, vector_db=chroma, em_function=embed, tracer=Tracer(hooks=[profiler]))
+    raxo.ask("total sales per region", profile=True)
+    profiler.hot_functions(10)
+    profiler.write_collapsed("profiles/all.collapsed")
+"""
+
+import cProfile
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from .tracing import Span, TraceHook
+
+logger = logging.getLogger(__name__)
+
+_MODES = ("sample", "cprofile")
+
+
+def _frame_label(code, module: str | None) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{module}.{name}" if module else f"{name} ({os.path.basename(code.co_filename)})"
+
+
+def _stack(frame) -> tuple:
+    """Return the labels of a frame and its callers, outermost first."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code, frame.f_globals.get("__name__")))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+def _pstats_label(function: tuple) -> str:
+    filename, line, name = function
+    return name if filename == "~" else f"{name} ({os.path.basename(filename)}:{line})"
+
+
+class _Sampler:
+    """Samples the stacks of the registered threads from one background thread."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self, thread_id: int) -> Counter:
+        stacks = Counter()
+        with self._lock:
+            self._targets[thread_id] = stacks
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="raxo-profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return stacks
+
+    def stop(self, thread_id: int):
+        with self._lock:
+            self._targets.pop(thread_id, None)
+
+    def _run(self):
+        while True:
+            # Sampled under the lock, so no sample lands in a request's stacks after `stop`
+            with self._lock:
+                active = bool(self._targets)
+                if active:
+                    frames = sys._current_frames()
+                    for thread_id, stacks in self._targets.items():
+                        frame = frames.get(thread_id)
+                        # A thread caught inside the profiler itself is measuring the profiler
+                        if frame is not None and frame.f_globals.get("__name__") != __name__:
+                            stacks[_stack(frame)] += 1
+                    del frames
+                else:
+                    self._wake.clear()
+            if active:
+                time.sleep(self.interval)
+            else:
+                # Idle until the next profiled request
+                self._wake.wait()
+
+
+class ProfilingHook(TraceHook):
+    """
+    Profiles sampled requests and aggregates their hot functions.
+
+    Attributes:
+        output_dir (str | None): The directory profiles are written to; None only aggregates.
+        sample_rate (float): The fraction of requests profiled without `profile=True`.
+        mode (str): "sample" for stack sampling or "cprofile".
+        interval (float): The seconds between stack samples in "sample" mode.
+        min_duration (float): The seconds below which a request's profile is not written.
+        kinds (tuple[str]): The root span names that can be profiled.
+        profiled (int): The number of requests profiled.
+        skipped (int): The requests not profiled because another cProfile was active.
+    """
+
+    def __init__(self, output_dir: str | None = None, sample_rate: float = 0.0, mode: str = "sample",
+                 interval: float = 0.002, min_duration: float = 0.0, kinds: tuple = ("ask",)):
+        """
+        Initialize an instance of the ProfilingHook class.
+
+        Args:
+            output_dir (str | None): The directory profiles are written to, created if needed;
+                None only aggregates. Default is None.
+            sample_rate (float): The fraction of requests profiled without `profile=True`. Default is 0.
+            mode (str): "sample" for stack sampling or "cprofile". Default is "sample".
+            interval (float): The seconds between stack samples. Default is 0.002.
+            min_duration (float): The seconds below which a request's profile is not written. Default is 0.
+            kinds (tuple[str]): The root span names that can be profiled. Default is ("ask",).
+
+        Raises:
+            ValueError: If the mode is unknown.
+        """
+        if mode not in _MODES:
+            raise ValueError(f"Unknown profiling mode {mode!r}, expected one of {_MODES}")
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        self.mode = mode
+        self.interval = interval
+        self.min_duration = min_duration
+        self.kinds = tuple(kinds)
+        self.profiled = 0
+        self.skipped = 0
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        self._active = {}
+        self._lock = threading.Lock()
+        self._stacks = Counter()
+        self._stats = None
+        self._sampler = _Sampler(interval) if mode == "sample" else None
+
+    def on_start(self, span: Span):
+        if span.parent is not None or span.name not in self.kinds:
+            return
+        if not span.attributes.get("profile") and (self.sample_rate <= 0 or random.random() >= self.sample_rate):
+            return
+        thread_id = threading.get_ident()
+        if self._sampler is not None:
+            self._active[span.span_id] = self._sampler.start(thread_id)
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows a single active cProfile per process
+            with self._lock:
+                self.skipped += 1
+            return
+        self._active[span.span_id] = profile
+
+    def on_end(self, span: Span):
+        if span.parent is not None:
+            return
+        profile = self._active.pop(span.span_id, None)
+        if profile is None:
+            return
+        if self._sampler is not None:
+            self._sampler.stop(threading.get_ident())
+            with self._lock:
+                self._stacks.update(profile)
+                self.profiled += 1
+        else:
+            profile.disable()
+            stats = pstats.Stats(profile)
+            with self._lock:
+                if self._stats is None:
+                    self._stats = stats
+                else:
+                    self._stats.add(stats)
+                self.profiled += 1
+        if self.output_dir and span.duration >= self.min_duration:
+            self._write(span, profile)
+
+    def _write(self, span: Span, profile):
+        name = os.path.join(self.output_dir, f"{span.name}-{span.span_id}-{span.duration * 1000:.0f}ms")
+        if self._sampler is not None:
+            self._write_stacks(f"{name}.collapsed", profile)
+        else:
+            profile.dump_stats(f"{name}.prof")
+        logger.info("Wrote the profile of a %.0f ms %s request to %s", span.duration * 1000, span.name, name)
+
+    @staticmethod
+    def _write_stacks(path: str, stacks: Counter):
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in stacks.most_common():
+                file.write(f"{';'.join(stack)} {count}\n")
+
+    def write_collapsed(self, path: str):
+        """
+        Write the stacks aggregated over every sampled request as collapsed stacks.
+
+        Args:
+            path (str): The output file.
+
+        Raises:
+            ValueError: In "cprofile" mode, which records no stacks.
+        """
+        if self._sampler is None:
+            raise ValueError("Collapsed stacks are only recorded in 'sample' mode, use `write_stats`")
+        with self._lock:
+            stacks = Counter(self._stacks)
+        self._write_stacks(path, stacks)
+
+    def write_stats(self, path: str):
+        """
+        Write the statistics aggregated over every cProfile request as a `pstats` file.
+
+        Args:
+            path (str): The output file.
+
+        Raises:
+            ValueError: In "sample" mode, which records no call statistics.
+        """
+        if self._sampler is not None:
+            raise ValueError("Call statistics are only recorded in 'cprofile' mode, use `write_collapsed`")
+        with self._lock:
+            if self._stats is not None:
+                self._stats.dump_stats(path)
+
+    def hot_functions(self, limit: int = 20) -> list:
+        """
+        Summarize the functions where the profiled requests spent the most time.
+
+        In "sample" mode the shares are fractions of the samples, where `self` counts the samples
+        with the function on top of the stack and `total` those with the function anywhere on it.
+        In "cprofile" mode they are seconds with call counts.
+
+        Args:
+            limit (int): The number of functions returned. Default is 20.
+
+        Returns:
+            list[dict]: The functions with the largest self time first.
+        """
+        with self._lock:
+            if self._sampler is None:
+                return self._hot_calls(limit)
+            stacks = Counter(self._stacks)
+        samples = sum(stacks.values())
+        if not samples:
+            return []
+        own, total = Counter(), Counter()
+        for stack, count in stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                total[label] += count
+        return [{"function": label, "self": round(count / samples, 4), "total": round(total[label] / samples, 4)}
+                for label, count in own.most_common(limit)]
+
+    def _hot_calls(self, limit: int) -> list:
+        if self._stats is None:
+            return []
+        rows = sorted(self._stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+        return [{"function": _pstats_label(function), "calls": calls, "self_seconds": round(own, 6),
+                 "total_seconds": round(cumulative, 6)}
+                for function, (_, calls, own, cumulative, _) in rows]
+
+    def reset(self):
+        """Clear the aggregated stacks and statistics."""
+        with self._lock:
+            self._stacks.clear()
+            self._stats = None
+            self.profiled = 0
+            self.skipped = 0
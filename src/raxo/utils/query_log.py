@@ -0,0 +1,299 @@
+"""
+Query Log Module
+
+This module records production requests so that they can be replayed against another Raxo
+configuration, see `raxo.replay`.
+
+QueryLog is a trace hook: it follows the spans of every `ask` and `train` request and, when the
+request's root span ends, turns them into one structured record holding the question, the time
+spent in each stage, the retrieved DDL ids, the generated SQL and the outcome. The request thread
+only builds that record and puts it on a bounded queue; a background thread writes the records in
+batches to a JSONL file rotated by size, or to a SQLite database capped to a number of records.
+When the writer falls behind, new records are dropped and counted rather than slowing requests.
+
+Classes:
+    QueryLog: Writes request records to a rotating JSONL or SQLite log in the background.
+
+Functions:
+    read_query_log: Iterate over the records of a log, oldest first.
+
+Usage Example:
+    from raxo.utils.query_log import QueryLog
+
+    query_log = QueryLog("queries.jsonl", max_bytes=64 * 1024 * 1024, backup_count=5)
+    raxo = Raxo(llm=open_ai, vector_db=chroma, em_function=embed, tracer=Tracer(hooks=[query_log]))
+    raxo.ask("total sales per region")
+    query_log.close()  # also done by `Raxo.close` and at interpreter exit
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+from typing import Iterator
+
+from .tracing import Span, TraceHook
+
+logger = logging.getLogger(__name__)
+
+_SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+# Request attributes set on the root span by Raxo, copied to the record when present
+_REQUEST_FIELDS = ("question", "namespace", "sql", "outcome", "ddl", "documentation", "items")
+_STOP = object()
+
+
+def _is_sqlite(path: str) -> bool:
+    return path.lower().endswith(_SQLITE_SUFFIXES)
+
+
+class _JsonlWriter:
+    """Appends records to a JSONL file, rotating it to `path.1` ... `path.N` past `max_bytes`."""
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = open(path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._size = 0
+
+    def write(self, records: list):
+        for record in records:
+            line = json.dumps(record, default=str) + "\n"
+            if self.max_bytes and self._size and self._size + len(line) > self.max_bytes:
+                self._rotate()
+            self._file.write(line)
+            self._size += len(line)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _SQLiteWriter:
+    """Inserts records into a SQLite table, deleting the oldest ones past `max_records`."""
+
+    def __init__(self, path: str, max_records: int | None):
+        self.max_records = max_records
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS queries (id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL, kind TEXT, "
+            "outcome TEXT, duration_ms REAL, record TEXT)")
+        self._connection.commit()
+
+    def write(self, records: list):
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO queries (ts, kind, outcome, duration_ms, record) VALUES (?, ?, ?, ?, ?)",
+                [(record["ts"], record["kind"], record.get("outcome"), record["duration_ms"],
+                  json.dumps(record, default=str)) for record in records])
+            if self.max_records:
+                self._connection.execute("DELETE FROM queries WHERE id <= (SELECT MAX(id) FROM queries) - ?",
+                                         (self.max_records,))
+
+    def close(self):
+        self._connection.close()
+
+
+class QueryLog(TraceHook):
+    """
+    Writes request records to a rotating JSONL or SQLite log in the background.
+
+    Paths ending in .db, .sqlite or .sqlite3 are written to SQLite, any other path to JSONL.
+
+    Attributes:
+        path (str): The log file.
+        kinds (tuple[str]): The root span names recorded.
+        sample_rate (float): The fraction of requests recorded.
+        written (int): The number of records written.
+        dropped (int): The number of records dropped because the queue was full.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, backup_count: int = 5,
+                 max_records: int | None = 1_000_000, queue_size: int = 10_000, sample_rate: float = 1.0,
+                 kinds: tuple = ("ask", "train", "train_many"), flush_interval: float = 1.0):
+        """
+        Initialize an instance of the QueryLog class.
+
+        Args:
+            path (str): The log file.
+            max_bytes (int): The size of a JSONL file before it is rotated; 0 never rotates.
+                Default is 64 MiB.
+            backup_count (int): The rotated JSONL files kept. Default is 5.
+            max_records (int | None): The records kept in a SQLite log; None keeps every record.
+                Default is 1,000,000.
+            queue_size (int): The records waiting to be written before new ones are dropped.
+                Default is 10,000.
+            sample_rate (float): The fraction of requests recorded. Default is 1.0.
+            kinds (tuple[str]): The root span names recorded. Default is ("ask", "train", "train_many").
+            flush_interval (float): The longest delay in seconds before a record is written. Default is 1.
+        """
+        self.path = path
+        self.kinds = tuple(kinds)
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self._open = {}
+        self._queue = queue.Queue(maxsize=queue_size)
+        if _is_sqlite(path):
+            # The connection is opened on the writer thread, SQLite connections are bound to their thread
+            self._make_writer = lambda: _SQLiteWriter(path, max_records)
+        else:
+            self._make_writer = lambda: _JsonlWriter(path, max_bytes, backup_count)
+        self._thread = threading.Thread(target=self._run, name="raxo-query-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def on_start(self, span: Span):
+        if span.parent is not None or span.name not in self.kinds:
+            return
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        # Keyed by span id; each request is only updated from its own thread
+        self._open[span.span_id] = {"ts": time.time(), "stages": {}}
+
+    def on_end(self, span: Span):
+        if span.parent is None:
+            record = self._open.pop(span.span_id, None)
+            if record is not None:
+                self._finish(span, record)
+            return
+        record = self._open.get(span.root.span_id)
+        if record is None:
+            return
+        stages = record["stages"]
+        stages[span.name] = stages.get(span.name, 0.0) + span.duration * 1000
+        attributes = span.attributes
+        if span.name == "retrieve" and "ids" in attributes:
+            record["ids"] = attributes["ids"]
+        elif span.name == "normalize":
+            record.setdefault("cache", {})["sql"] = attributes.get("cache_hit", False)
+        elif span.name == "template":
+            record.setdefault("cache", {})["template"] = attributes.get("hit", False)
+        elif span.name == "llm":
+            usage = record.setdefault("llm", {})
+            for key, value in attributes.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    usage[key] = usage.get(key, 0) + value
+        elif span.name == "execute" and "rows" in attributes:
+            record["rows"] = attributes["rows"]
+
+    def _finish(self, span: Span, record: dict):
+        attributes = span.attributes
+        record["kind"] = span.name
+        record["duration_ms"] = round(span.duration * 1000, 3)
+        record["stages"] = {name: round(value, 3) for name, value in record["stages"].items()}
+        for field in _REQUEST_FIELDS:
+            if field in attributes:
+                record[field] = attributes[field]
+        if span.name == "train":
+            record["train_kind"] = attributes.get("kind")
+        if span.error is not None:
+            record["outcome"] = "exception"
+            record["error"] = f"{type(span.error).__name__}: {span.error}"
+        else:
+            record.setdefault("outcome", "ok")
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        writer = None
+        try:
+            writer = self._make_writer()
+        except Exception:
+            logger.exception("Cannot open the query log %s, records are discarded", self.path)
+        stopping = False
+        while not stopping:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < 1000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                stopping = True
+                batch = [record for record in batch if record is not _STOP]
+            if writer is None or not batch:
+                continue
+            try:
+                writer.write(batch)
+                self.written += len(batch)
+            except Exception:
+                logger.exception("Failed to write %s records to the query log %s", len(batch), self.path)
+        if writer is not None:
+            writer.close()
+
+    def close(self, timeout: float | None = 10.0):
+        """
+        Write the queued records and stop the writer thread.
+
+        Args:
+            timeout (float | None): Seconds to wait for the writer. Default is 10.
+        """
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        """Return the records written, dropped and waiting to be written."""
+        return {"written": self.written, "dropped": self.dropped, "queued": self._queue.qsize()}
+
+
+def read_query_log(path: str) -> Iterator[dict]:
+    """
+    Iterate over the records of a query log, oldest first.
+
+    A JSONL log is read from its oldest rotated file to the current one; a last line truncated by
+    a crash is skipped.
+
+    Args:
+        path (str): The log file given to QueryLog.
+
+    Yields:
+        dict: The request records.
+    """
+    if _is_sqlite(path):
+        connection = sqlite3.connect(path)
+        try:
+            for (record,) in connection.execute("SELECT record FROM queries ORDER BY id"):
+                yield json.loads(record)
+        finally:
+            connection.close()
+        return
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        index += 1
+    files = [f"{path}.{number}" for number in range(index - 1, 0, -1)] + [path]
+    for name in files:
+        if not os.path.exists(name):
+            continue
+        with open(name, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
@@ -0,0 +1,313 @@
+"""
+Result Set Module
+
+This module keeps large query results from exhausting the memory of a shared worker.
+
+Rows are fetched from a DB-API cursor in batches of `fetch_size` while their size is estimated.
+Results smaller than `spill_threshold` stay in memory. Past it, the rows fetched so far and every
+following batch are written to an anonymous temporary file and read back through a read-only
+memory map once the fetch is complete. Only the page index stays in memory. Past `max_bytes`, the
+fetch stops and ResultTooLarge is raised.
+
+The spill file holds newline-delimited JSON, one array per row and one page per batch. Decimal,
+date, time, datetime, timedelta, UUID and bytes values are written as `{"__raxo__": [type, text]}`
+objects and read back with their type; values of any other type are read back as text.
+
+Either way the connectors return a ResultSet. It is a read-only sequence of row tuples, so
+`len`, indexing, slicing, iteration and comparison with a list work as before. It also exposes
+the column names and paged access. The spill file is private to the process and deleted when
+the result is closed or garbage collected.
+
+Classes:
+    ResultSet: A lazy, possibly disk-backed, sequence of result rows.
+
+Functions:
+    json_default: `json.dumps` default serializing results as lists.
+
+Usage Example:
+    connector = MySQLConnector(host=..., database=..., user=..., password=...,
+                               spill_threshold=64 * 1024 * 1024, max_result_bytes=2 * 1024 ** 3)
+    with connector.execute_query("SELECT * FROM events") as result:
+        print(len(result), result.columns, result.spilled)
+        first_page = result.page(0, 100)
+        for row in result:
+            ...
+"""
+
+import base64
+import bisect
+import datetime
+import decimal
+import json
+import logging
+import mmap
+import sys
+import tempfile
+import uuid
+import weakref
+from collections.abc import Sequence
+
+from .exceptions import ResultTooLarge
+
+logger = logging.getLogger(__name__)
+
+_SAMPLE_ROWS = 8
+
+_TAG = "__raxo__"
+
+_DECODERS = {
+    "decimal": decimal.Decimal,
+    "datetime": datetime.datetime.fromisoformat,
+    "date": datetime.date.fromisoformat,
+    "time": datetime.time.fromisoformat,
+    "timedelta": lambda text: datetime.timedelta(seconds=float(text)),
+    "uuid": uuid.UUID,
+    "bytes": base64.b64decode,
+}
+
+
+def _estimate_bytes(rows: list) -> int:
+    """Estimate the memory held by a batch of rows from a few evenly spaced rows."""
+    if not rows:
+        return 0
+    step = max(len(rows) // _SAMPLE_ROWS, 1)
+    sample = rows[::step]
+    size = sum(sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row) for row in sample)
+    return size * len(rows) // len(sample)
+
+
+def _encode_value(value):
+    """Tag the column values JSON has no type for; anything else is written as text."""
+    # datetime is checked before its date base class
+    if isinstance(value, datetime.datetime):
+        return {_TAG: ["datetime", value.isoformat()]}
+    if isinstance(value, datetime.date):
+        return {_TAG: ["date", value.isoformat()]}
+    if isinstance(value, datetime.time):
+        return {_TAG: ["time", value.isoformat()]}
+    if isinstance(value, datetime.timedelta):
+        return {_TAG: ["timedelta", repr(value.total_seconds())]}
+    if isinstance(value, decimal.Decimal):
+        return {_TAG: ["decimal", str(value)]}
+    if isinstance(value, uuid.UUID):
+        return {_TAG: ["uuid", str(value)]}
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {_TAG: ["bytes", base64.b64encode(value).decode("ascii")]}
+    return str(value)
+
+
+def _decode_value(obj: dict):
+    tagged = obj.get(_TAG) if len(obj) == 1 else None
+    if tagged is None:
+        return obj
+    kind, text = tagged
+    return _DECODERS[kind](text)
+
+
+_ENCODER = json.JSONEncoder(default=_encode_value, ensure_ascii=False, separators=(",", ":"))
+_DECODER = json.JSONDecoder(object_hook=_decode_value)
+
+
+def _release(mapping, file):
+    if mapping is not None:
+        mapping.close()
+    if file is not None:
+        file.close()
+
+
+class ResultSet(Sequence):
+    """
+    A lazy, possibly disk-backed, sequence of result rows.
+
+    Attributes:
+        description (list | None): The DB-API `cursor.description` of the result.
+        columns (list[str]): The column names.
+        nbytes (int): The estimated size of the rows in memory, in bytes.
+        spilled (bool): Whether the rows are stored on disk.
+    """
+
+    def __init__(self, rows: list | None = None, description=None):
+        """
+        Initialize an in-memory instance of the ResultSet class; use `fetch` to read a cursor.
+
+        Args:
+            rows (list | None): The rows. Default is None.
+            description (list | None): The DB-API description of the columns. Default is None.
+        """
+        self.description = list(description) if description else None
+        self.columns = [column[0] for column in self.description or []]
+        self._rows = list(rows or [])
+        self._count = len(self._rows)
+        self.nbytes = _estimate_bytes(self._rows)
+        self.spilled = False
+        self._file = None
+        self._map = None
+        # (first row, byte offset, byte length, row count) of each spilled page
+        self._pages = []
+        self._starts = []
+        self._cached = (-1, None)
+        self._finalizer = None
+
+    @classmethod
+    def fetch(cls, cursor, fetch_size: int = 1000, spill_threshold: int | None = 64 * 1024 * 1024,
+              max_bytes: int | None = None, spill_dir: str | None = None, query: str | None = None):
+        """
+        Read every row of an executed cursor, spilling them to disk past `spill_threshold`.
+
+        Args:
+            cursor: A DB-API cursor on which a query was executed.
+            fetch_size (int): The rows fetched per `fetchmany` call. Default is 1000.
+            spill_threshold (int | None): The estimated bytes above which rows are written to
+                disk; None keeps every result in memory. Default is 64 MiB.
+            max_bytes (int | None): The estimated bytes above which the fetch fails; None allows
+                any size. Default is None.
+            spill_dir (str | None): The directory of the spill file. Default is the system
+                temporary directory.
+            query (str | None): The query, reported in errors. Default is None.
+
+        Returns:
+            ResultSet: The rows.
+
+        Raises:
+            ResultTooLarge: If the result exceeds `max_bytes`.
+        """
+        result = cls(description=cursor.description)
+        if cursor.description is None:
+            # Statements without a result set, such as an UPDATE
+            return result
+        try:
+            while True:
+                batch = cursor.fetchmany(fetch_size)
+                if not batch:
+                    break
+                result._count += len(batch)
+                result.nbytes += _estimate_bytes(batch)
+                if max_bytes is not None and result.nbytes > max_bytes:
+                    raise ResultTooLarge(
+                        f"The query result exceeds {max_bytes} bytes after {result._count} rows, "
+                        f"aggregate or limit the rows returned", query=query)
+                if result.spilled:
+                    result._write_page(batch)
+                    continue
+                result._rows.extend(batch)
+                if spill_threshold is not None and result.nbytes > spill_threshold:
+                    result._spill(fetch_size, spill_dir)
+        except BaseException:
+            result.close()
+            raise
+        result._open_map()
+        return result
+
+    def _spill(self, page_rows: int, spill_dir: str | None):
+        logger.info("Spilling a query result of %s rows (~%s bytes) to disk", self._count, self.nbytes)
+        self._file = tempfile.TemporaryFile(prefix="raxo-result-", dir=spill_dir)
+        self._finalizer = weakref.finalize(self, _release, None, self._file)
+        self.spilled = True
+        rows, self._rows = self._rows, []
+        for start in range(0, len(rows), page_rows):
+            self._write_page(rows[start:start + page_rows])
+
+    def _write_page(self, rows: list):
+        payload = "".join(_ENCODER.encode(row) + "\n" for row in rows).encode("utf-8")
+        first = self._pages[-1][0] + self._pages[-1][3] if self._pages else 0
+        self._pages.append((first, self._file.tell(), len(payload), len(rows)))
+        self._starts.append(first)
+        self._file.write(payload)
+
+    def _open_map(self):
+        if not self.spilled:
+            return
+        self._file.flush()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._finalizer.detach()
+        self._finalizer = weakref.finalize(self, _release, self._map, self._file)
+
+    def _page_rows(self, index: int) -> list:
+        cached_index, rows = self._cached
+        if cached_index == index:
+            return rows
+        if self._map is None:
+            raise ValueError("The result set is closed")
+        _, offset, length, _ = self._pages[index]
+        # Only "\n" ends a row: str.splitlines would also split on the raw U+2028 in a value
+        lines = self._map[offset:offset + length].decode("utf-8").split("\n")[:-1]
+        rows = [tuple(_DECODER.decode(line)) for line in lines]
+        self._cached = (index, rows)
+        return rows
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("result index out of range")
+        if not self.spilled:
+            return self._rows[index]
+        page = bisect.bisect_right(self._starts, index) - 1
+        return self._page_rows(page)[index - self._starts[page]]
+
+    def __iter__(self):
+        if not self.spilled:
+            yield from self._rows
+            return
+        for page in range(len(self._pages)):
+            yield from self._page_rows(page)
+
+    def __eq__(self, other):
+        if isinstance(other, (ResultSet, list)):
+            return len(self) == len(other) and all(left == right for left, right in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ResultSet(rows={self._count}, columns={self.columns}, spilled={self.spilled})"
+
+    def page(self, offset: int = 0, limit: int = 100) -> list:
+        """
+        Return a page of rows.
+
+        Args:
+            offset (int): The index of the first row. Default is 0.
+            limit (int): The largest number of rows returned. Default is 100.
+
+        Returns:
+            list[tuple]: The rows.
+        """
+        return self[offset:offset + limit]
+
+    def to_list(self) -> list:
+        """Return every row in memory."""
+        return list(self)
+
+    def close(self):
+        """Delete the spill file, if any; in-memory rows remain readable."""
+        if self._finalizer is not None:
+            self._finalizer()
+        self._map = None
+        self._cached = (-1, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def json_default(value):
+    """
+    Serialize the values `json` does not handle: results as lists of rows, anything else as text.
+
+    Args:
+        value: The value to serialize.
+
+    Returns:
+        list | str: The serializable value.
+    """
+    if isinstance(value, ResultSet):
+        return value.to_list()
+    return str(value)
@@ -0,0 +1,190 @@
+"""
+Session Module
+
+This module provides the ProviderSession class, one pooled HTTP client shared by the provider SDK
+clients of a process. OpenAIChat, AzureOpenAIChat and OpenAiEmbeddings build their SDK clients
+from a session, and ChromaStore embeds through the Raxo embedding, so all of them reuse the same
+keep-alive connections and TLS sessions instead of opening one pool each.
+
+HTTP/2 is used when the `h2` package is installed (`pip install httpx[http2]`), multiplexing
+concurrent requests over a single connection.
+
+Classes:
+    ProviderSession: A pooled HTTP client and a factory of SDK clients sharing it.
+
+Usage Example:
+    session = ProviderSession(max_connections=50, connect_timeout=3, read_timeout=30)
+    llm = OpenAIChat(api_key="...", model="gpt-4o-mini", session=session)
+    embed = OpenAiEmbeddings(api_key="...", model="text-embedding-3-small", session=session)
+    session.warm_up()
+    session.stats()  # {"requests": ..., "connections_opened": ..., "reused": ..., "reuse_ratio": ...}
+
+    # Components created without a session share ProviderSession.default()
+"""
+
+import importlib.util
+import logging
+import threading
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderSession:
+    """
+    A pooled HTTP client shared by provider SDK clients.
+
+    Attributes:
+        client (httpx.Client): The shared HTTP client.
+        http2 (bool): Whether HTTP/2 is negotiated when the server supports it.
+        max_retries (int): The retries configured on the SDK clients.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, max_connections: int = 20, max_keepalive_connections: int = 10,
+                 keepalive_expiry: float = 60.0, connect_timeout: float = 5.0, read_timeout: float = 60.0,
+                 write_timeout: float = 30.0, pool_timeout: float = 10.0, http2: bool | None = None,
+                 max_retries: int = 2):
+        """
+        Initialize an instance of the ProviderSession class.
+
+        Args:
+            max_connections (int): The maximum number of open connections. Default is 20.
+            max_keepalive_connections (int): The maximum number of idle connections kept open. Default is 10.
+            keepalive_expiry (float): Seconds an idle connection is kept open. Default is 60.
+            connect_timeout (float): Seconds to establish a connection. Default is 5.
+            read_timeout (float): Seconds to wait for response data. Default is 60.
+            write_timeout (float): Seconds to send request data. Default is 30.
+            pool_timeout (float): Seconds to wait for a free connection of the pool. Default is 10.
+            http2 (bool | None): Whether to negotiate HTTP/2. Default is None, meaning whenever the
+                `h2` package is installed.
+            max_retries (int): The retries of the SDK clients. Default is 2.
+        """
+        self.http2 = importlib.util.find_spec("h2") is not None if http2 is None else http2
+        self.max_retries = max_retries
+        self.client = httpx.Client(
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections,
+                                keepalive_expiry=keepalive_expiry),
+            timeout=httpx.Timeout(connect=connect_timeout, read=read_timeout, write=write_timeout,
+                                  pool=pool_timeout),
+            http2=self.http2,
+            event_hooks={"response": [self._on_response]},
+        )
+        self._clients = {}
+        self._lock = threading.Lock()
+        self._streams = set()
+        self._stats = {"requests": 0, "connections_opened": 0, "http2_responses": 0, "errors": 0}
+
+    @classmethod
+    def default(cls) -> "ProviderSession":
+        """Return the process-wide session used by components created without one."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def _on_response(self, response: httpx.Response):
+        # httpcore exposes the connection a response was read from; an unseen one was just opened
+        stream = response.extensions.get("network_stream")
+        with self._lock:
+            self._stats["requests"] += 1
+            if response.status_code >= 500:
+                self._stats["errors"] += 1
+            if response.extensions.get("http_version") == b"HTTP/2":
+                self._stats["http2_responses"] += 1
+            if stream is not None and id(stream) not in self._streams:
+                if len(self._streams) >= 4096:
+                    self._streams.clear()
+                self._streams.add(id(stream))
+                self._stats["connections_opened"] += 1
+
+    def _sdk_client(self, key: tuple, factory):
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = factory()
+            return client
+
+    def openai(self, api_key: str | None = None, base_url: str | None = None):
+        """
+        Return an OpenAI client using the shared connection pool.
+
+        Clients are cached per API key and base URL.
+
+        Args:
+            api_key (str | None): The API key. Default is the `OPENAI_API_KEY` environment variable.
+            base_url (str | None): The API base URL. Default is the SDK default.
+
+        Returns:
+            openai.OpenAI: The client.
+        """
+        from openai import OpenAI
+
+        return self._sdk_client(("openai", api_key, base_url), lambda: OpenAI(
+            api_key=api_key, base_url=base_url, http_client=self.client, max_retries=self.max_retries))
+
+    def azure_openai(self, api_key: str, azure_endpoint: str, api_version: str):
+        """
+        Return an Azure OpenAI client using the shared connection pool.
+
+        Args:
+            api_key (str): The API key.
+            azure_endpoint (str): The endpoint URL.
+            api_version (str): The API version.
+
+        Returns:
+            openai.AzureOpenAI: The client.
+        """
+        from openai import AzureOpenAI
+
+        return self._sdk_client(("azure", api_key, azure_endpoint, api_version), lambda: AzureOpenAI(
+            api_key=api_key, azure_endpoint=azure_endpoint, api_version=api_version, http_client=self.client,
+            max_retries=self.max_retries))
+
+    def warm_up(self, urls=None) -> int:
+        """
+        Open connections ahead of the first request.
+
+        A HEAD request is sent to each URL, by default the base URLs of the SDK clients created
+        so far, so the TCP and TLS handshakes are not paid by the first question. Failures are
+        logged and ignored.
+
+        Args:
+            urls (Iterable[str] | None): The URLs to connect to. Default is None.
+
+        Returns:
+            int: The number of URLs reached.
+        """
+        if urls is None:
+            with self._lock:
+                urls = {str(client.base_url) for client in self._clients.values()}
+        reached = 0
+        for url in urls:
+            try:
+                self.client.head(url)
+                reached += 1
+            except httpx.HTTPError as e:
+                logger.warning("Could not warm up a connection to %s: %s", url, e)
+        return reached
+
+    def stats(self) -> dict:
+        """
+        Return connection reuse metrics.
+
+        Returns:
+            dict: The number of responses, of connections opened, of responses served on a reused
+            connection, the reuse ratio, HTTP/2 responses and 5xx errors.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["reused"] = max(stats["requests"] - stats["connections_opened"], 0)
+        stats["reuse_ratio"] = stats["reused"] / stats["requests"] if stats["requests"] else 0.0
+        return stats
+
+    def close(self):
+        """Close every pooled connection."""
+        self.client.close()
@@ -1,27 +1,276 @@
+"""
+SQL Utils Module
+
+This module turns raw LLM responses into structured results. Responses are expected to be the
+JSON object requested by the SQL generation prompt, but models also wrap it in markdown fences,
+surround it with prose, use Python literals (single quotes, None, True) or leave trailing commas.
+`parse_llm_output` handles all of these in a single pass without regex rewriting, so quotes inside
+the generated SQL survive, and reports why parsing failed when it does.
+
+Classes:
+    ParseResult: The typed outcome of parsing an LLM response.
+
+Functions:
+    parse_llm_output: Parse an LLM response into a ParseResult.
+    extract_output: Parse an LLM response into a dict, or return it unchanged on failure.
+    quote_identifier: Quote a table or column name for a SQL dialect.
+
+Usage Example:
+    result = parse_llm_output('```json\\n{"sql": "SELECT * FROM t WHERE name = \\'O\\'\\'Brien\\'", "error": null}\\n```')
+    if result.ok:
+        print(result.sql)
+    else:
+        print(result.reason)
+"""
+
+import json
 import re
-from json import loads
 
+_FENCE = re.compile(r"```[ \t]*([\w-]*)[ \t]*\n?(.*?)(?:```|$)", re.DOTALL)
+_SQL_START = re.compile(r"^\s*(?:--[^\n]*\n\s*)*(SELECT|WITH)\b", re.IGNORECASE)
+_SCALAR = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?|[A-Za-z_]+")
+_BARE_KEY = re.compile(r"[A-Za-z_]\w*")
+_HEX4 = re.compile(r"[0-9a-fA-F]{4}")
+_CLOSES_STRING = re.compile(r"[ \t\r\n]*(?:[,:}\]]|$)")
+_LITERALS = {"null": None, "none": None, "true": True, "false": False}
 
-def find_between_braces(sentence):
-    """gets all the text between the braces"""
-    resp = sentence
-    match = re.search(r'\{(.*)\}', sentence)
+
+class ParseResult:
+    """
+    The typed outcome of parsing an LLM response.
+
+    Attributes:
+        ok (bool): Whether a response object was recovered.
+        data (dict | None): The recovered object.
+        raw (str | None): The raw response.
+        reason (str | None): Why parsing failed: "empty", "no_json_object", "invalid_json" or
+            "not_an_object"; None on success.
+        recovered_from (str | None): How a non-JSON response was recovered: "fenced", "embedded",
+            "tolerant" or "bare_sql"; None when the response was plain JSON.
+    """
+
+    __slots__ = ("ok", "data", "raw", "reason", "recovered_from")
+
+    def __init__(self, data: dict | None = None, raw: str | None = None, reason: str | None = None,
+                 recovered_from: str | None = None):
+        self.ok = data is not None
+        self.data = data
+        self.raw = raw
+        self.reason = reason
+        self.recovered_from = recovered_from
+
+    @property
+    def sql(self) -> str | None:
+        """The generated SQL, if any."""
+        return self.data.get("sql") if self.data else None
+
+    @property
+    def error(self) -> str | None:
+        """The error reported by the model, if any."""
+        return self.data.get("error") if self.data else None
+
+    def __repr__(self):
+        return f"ParseResult(ok={self.ok}, data={self.data!r}, reason={self.reason!r})"
+
+
+class _TolerantParser:
+    """A recursive-descent parser for JSON plus Python-style literals, quotes and trailing commas."""
+
+    def __init__(self, text: str, start: int = 0):
+        self.text = text
+        self.index = start
+
+    def _skip_whitespace(self):
+        while self.index < len(self.text) and self.text[self.index] in " \t\r\n":
+            self.index += 1
+
+    def _error(self, message: str):
+        raise ValueError(f"{message} at position {self.index}")
+
+    def parse_value(self):
+        self._skip_whitespace()
+        if self.index >= len(self.text):
+            self._error("unexpected end of input")
+        char = self.text[self.index]
+        if char == "{":
+            return self._parse_container("}", self._parse_member, {})
+        if char == "[":
+            return self._parse_container("]", self.parse_value, [])
+        if char in ("'", '"'):
+            return self._parse_string(char)
+        match = _SCALAR.match(self.text, self.index)
+        if not match:
+            self._error(f"unexpected character {char!r}")
+        self.index = match.end()
+        token = match.group(0)
+        if token.lower() in _LITERALS:
+            return _LITERALS[token.lower()]
+        if token[0].isalpha() or token[0] == "_":
+            self._error(f"unexpected word {token!r}")
+        return float(token) if any(c in token for c in ".eE") else int(token)
+
+    def _parse_container(self, closing: str, parse_item, container):
+        self.index += 1
+        while True:
+            self._skip_whitespace()
+            if self.index >= len(self.text):
+                self._error("unterminated container")
+            if self.text[self.index] == closing:
+                self.index += 1
+                return container
+            item = parse_item()
+            if isinstance(container, dict):
+                container[item[0]] = item[1]
+            else:
+                container.append(item)
+            self._skip_whitespace()
+            if self.index < len(self.text) and self.text[self.index] == ",":
+                self.index += 1
+            elif self.index < len(self.text) and self.text[self.index] != closing:
+                self._error("expected a comma")
+
+    def _parse_member(self):
+        self._skip_whitespace()
+        char = self.text[self.index]
+        if char in ("'", '"'):
+            key = self._parse_string(char)
+        else:
+            match = _BARE_KEY.match(self.text, self.index)
+            if not match:
+                self._error("expected a key")
+            key, self.index = match.group(0), match.end()
+        self._skip_whitespace()
+        if self.index >= len(self.text) or self.text[self.index] != ":":
+            self._error("expected a colon")
+        self.index += 1
+        return key, self.parse_value()
+
+    def _parse_string(self, quote: str) -> str:
+        self.index += 1
+        chunks = []
+        while self.index < len(self.text):
+            char = self.text[self.index]
+            if char == "\\" and self.index + 1 < len(self.text):
+                escaped = self.text[self.index + 1]
+                if escaped == "u" and _HEX4.fullmatch(self.text[self.index + 2:self.index + 6]):
+                    chunks.append(chr(int(self.text[self.index + 2:self.index + 6], 16)))
+                    self.index += 6
+                    continue
+                chunks.append({"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}.get(escaped, escaped))
+                self.index += 2
+                continue
+            if char == quote:
+                # A quote closes the string only when followed by structure; SQL such as
+                # 'O'Brien' inside a single-quoted value keeps its inner quotes.
+                if _CLOSES_STRING.match(self.text, self.index + 1):
+                    self.index += 1
+                    return "".join(chunks)
+            chunks.append(char)
+            self.index += 1
+        self._error("unterminated string")
+
+
+def _balanced_object(text: str, start: int) -> int:
+    """Return the index of the brace closing the object opened at `start`, or -1."""
+    depth, quote = 0, None
+    index = start
+    while index < len(text):
+        char = text[index]
+        if quote:
+            if char == "\\":
+                index += 1
+            elif char == quote:
+                quote = None
+        elif char == '"':
+            quote = char
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return index
+        index += 1
+    return -1
+
+
+def _as_result(value, raw: str, recovered_from: str | None) -> ParseResult:
+    if not isinstance(value, dict):
+        return ParseResult(raw=raw, reason="not_an_object")
+    return ParseResult(value, raw=raw, recovered_from=recovered_from)
+
+
+def parse_llm_output(response: str | None) -> ParseResult:
+    """
+    Parse an LLM response into a ParseResult.
+
+    The response is tried as plain JSON first. Otherwise the content of a markdown fence, or the
+    first balanced `{...}` object found in the text, is parsed with a tolerant parser accepting
+    single-quoted strings, Python literals and trailing commas. A response that is bare SQL (or
+    a fenced ```sql block) is recovered as {"sql": <text>, "error": None}.
+
+    Args:
+        response (str | None): The raw LLM response.
+
+    Returns:
+        ParseResult: The recovered object, or the reason it could not be recovered.
+    """
+    if isinstance(response, dict):
+        return ParseResult(response, raw=None)
+    if not response or not response.strip():
+        return ParseResult(raw=response, reason="empty")
     try:
-        if match:
-            resp = '{' + match.group(1) + '}'
-            resp = re.sub("\'", '\"', resp)
-            resp = resp.replace("None", "null")
-            resp = loads(resp)
-    except Exception as e:
-        e = str(e)
-    return resp
+        return _as_result(json.loads(response), response, None)
+    except ValueError:
+        pass
+
+    text, recovered_from = response, "embedded"
+    fence = _FENCE.search(response)
+    if fence:
+        language, body = fence.group(1).lower(), fence.group(2).strip()
+        if language == "sql" or (language != "json" and _SQL_START.match(body)):
+            return ParseResult({"sql": body.rstrip(";").strip() or None, "error": None}, raw=response,
+                               recovered_from="bare_sql")
+        text, recovered_from = body, "fenced"
+
+    start = text.find("{")
+    if start == -1:
+        if _SQL_START.match(text):
+            return ParseResult({"sql": text.strip().rstrip(";").strip(), "error": None}, raw=response,
+                               recovered_from="bare_sql")
+        return ParseResult(raw=response, reason="no_json_object")
+    end = _balanced_object(text, start)
+    if end != -1:
+        try:
+            return _as_result(json.loads(text[start:end + 1]), response, recovered_from)
+        except ValueError:
+            pass
+    try:
+        return _as_result(_TolerantParser(text, start).parse_value(), response, "tolerant")
+    except (ValueError, IndexError):
+        return ParseResult(raw=response, reason="invalid_json")
+
+
+def find_between_braces(sentence):
+    """gets the object between the outermost braces, or the sentence unchanged"""
+    result = parse_llm_output(sentence)
+    return result.data if result.ok else sentence
 
 
 def extract_output(response):
     """extracts the output from gpt response"""
-    try:
-        resp = loads(response)
-    except Exception as e:
-        e = str(e)
-        resp = find_between_braces(response)
-    return resp
+    return find_between_braces(response)
+
+
+def quote_identifier(identifier: str, dialect: str = "MySQL") -> str:
+    """
+    Quote a (possibly dotted) table or column name for a SQL dialect.
+
+    Args:
+        identifier (str): The name, e.g. "sales.region".
+        dialect (str): The dialect; MySQL uses backticks, others double quotes. Default is "MySQL".
+
+    Returns:
+        str: The quoted identifier.
+    """
+    quote = "`" if dialect.lower() == "mysql" else '"'
+    return ".".join(f"{quote}{part.replace(quote, quote * 2)}{quote}" for part in identifier.split("."))
@@ -0,0 +1,48 @@
+"""
+Tokens Module
+
+This module estimates prompt sizes in tokens. When `tiktoken` is installed the `cl100k_base`
+encoding is used; otherwise a heuristic of four characters per token is applied, which is
+close enough for budgeting prompts and reporting savings.
+
+Usage Example:
+    from raxo.utils.tokens import estimate_tokens
+
+    estimate_tokens("SELECT SUM(amount) FROM sales")
+"""
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional, and may fail to fetch its encoding offline
+    _ENCODING = None
+
+
+def estimate_tokens(text: str | None) -> int:
+    """
+    Estimate the number of tokens of a text.
+
+    Args:
+        text (str | None): The text to measure.
+
+    Returns:
+        int: The number of tokens, exact with `tiktoken` and approximate otherwise.
+    """
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def estimate_prompt_tokens(prompt: list) -> int:
+    """
+    Estimate the number of tokens of a chat prompt.
+
+    Args:
+        prompt (list): A list of {"role", "content"} messages.
+
+    Returns:
+        int: The summed token estimate of the message contents.
+    """
+    return sum(estimate_tokens(message.get("content")) for message in prompt)
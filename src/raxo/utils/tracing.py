@@ -0,0 +1,319 @@
+"""
+Tracing Module
+
+This module provides lightweight instrumentation for the Raxo pipeline.
+Every stage of a request (embedding, retrieval, prompt build, LLM call, parsing and query execution)
+is wrapped in a Span which records its duration and any attributes attached to it, such as token
+usage, retrieved document counts or cache hits. Finished spans are handed to pluggable hooks.
+
+Classes:
+    Span: A single timed stage of a request.
+    TraceHook: Abstract base class for span consumers.
+    LoggingHook: Writes finished spans to a standard `logging` logger.
+    MetricsHook: Aggregates spans into Prometheus-style counters.
+    OpenTelemetryHook: Mirrors spans into OpenTelemetry (requires `opentelemetry-api`).
+    RootSpanHook: Keeps the last root span finished on each thread.
+    Tracer: Creates spans and dispatches them to the registered hooks.
+
+Usage Example:
+    from raxo.utils.tracing import Tracer, LoggingHook, MetricsHook
+
+    metrics = MetricsHook()
+    tracer = Tracer(hooks=[LoggingHook(), metrics])
+    raxo = Raxo(llm=open_ai, vector_db=chroma, em_function=embed, tracer=tracer)
+    raxo.ask("what are my region sales")
+    print(metrics.render())
+"""
+
+import itertools
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """
+    A single timed stage of a request.
+
+    Attributes:
+        name (str): The stage name, e.g. "embed", "retrieve" or "llm".
+        span_id (int): A process-unique identifier of the span.
+        parent (Span | None): The enclosing span, if any.
+        attributes (dict): Arbitrary values recorded for the stage.
+        start (float): `time.perf_counter()` value at the start of the stage.
+        end (float | None): `time.perf_counter()` value at the end of the stage.
+        error (BaseException | None): The exception raised inside the stage, if any.
+    """
+
+    __slots__ = ("name", "span_id", "parent", "attributes", "start", "end", "error")
+
+    def __init__(self, name: str, parent=None, attributes: dict | None = None):
+        self.name = name
+        self.span_id = next(_span_ids)
+        self.parent = parent
+        self.attributes = attributes or {}
+        self.start = time.perf_counter()
+        self.end = None
+        self.error = None
+
+    @property
+    def duration(self) -> float:
+        """Elapsed seconds, measured up to now if the span is still open."""
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    @property
+    def root(self):
+        """The outermost span this span belongs to."""
+        span = self
+        while span.parent is not None:
+            span = span.parent
+        return span
+
+    def set(self, key: str, value):
+        """Record a single attribute on the span."""
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        """Record several attributes on the span."""
+        self.attributes.update(attributes)
+
+    def incr(self, key: str, amount=1):
+        """Increment a numeric attribute on the span."""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def __repr__(self):
+        return f"Span(name={self.name!r}, duration={self.duration:.6f}, attributes={self.attributes!r})"
+
+
+class TraceHook(ABC):
+    """
+    An abstract base class for consumers of finished spans.
+
+    Hooks are called synchronously on the request thread, so implementations should be cheap
+    and must not raise; exceptions raised by a hook are logged and swallowed by the Tracer.
+    """
+
+    def on_start(self, span: Span):
+        """Called when a span is opened. The default implementation does nothing."""
+
+    @abstractmethod
+    def on_end(self, span: Span):
+        """Called when a span is closed, after its duration and attributes are final."""
+
+
+class LoggingHook(TraceHook):
+    """
+    Writes every finished span to a `logging` logger.
+
+    Args:
+        logger_name (str): The logger to write to. Default is "raxo.trace".
+        level (int): The logging level used for spans. Default is logging.DEBUG.
+    """
+
+    def __init__(self, logger_name: str = "raxo.trace", level: int = logging.DEBUG):
+        self.logger = logging.getLogger(logger_name)
+        self.level = level
+
+    def on_end(self, span: Span):
+        if not self.logger.isEnabledFor(self.level):
+            return
+        self.logger.log(self.level, "span=%s duration_ms=%.3f error=%s attributes=%s",
+                        span.name, span.duration * 1000, type(span.error).__name__ if span.error else None,
+                        span.attributes)
+
+
+class MetricsHook(TraceHook):
+    """
+    Aggregates finished spans into Prometheus-style counters.
+
+    For every span name the hook keeps a call count, an error count and the sum of durations.
+    Numeric span attributes (token counts, document counts, cache hits...) are summed per span name.
+
+    Args:
+        prefix (str): The prefix used for metric names. Default is "raxo".
+    """
+
+    def __init__(self, prefix: str = "raxo"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def on_end(self, span: Span):
+        with self._lock:
+            self._add("span_total", span.name, 1)
+            self._add("span_seconds_sum", span.name, span.duration)
+            if span.error is not None:
+                self._add("span_errors_total", span.name, 1)
+            for key, value in span.attributes.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    self._add(f"{key}_total", span.name, value)
+                elif value is True:
+                    self._add(f"{key}_total", span.name, 1)
+
+    def _add(self, metric: str, span_name: str, value):
+        key = (metric, span_name)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def snapshot(self) -> dict:
+        """
+        Return a copy of the counters.
+
+        Returns:
+            dict: A mapping of (metric, span name) to the accumulated value.
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self):
+        """Clear all counters."""
+        with self._lock:
+            self._counters.clear()
+
+    def render(self) -> str:
+        """
+        Render the counters in the Prometheus text exposition format.
+
+        Returns:
+            str: One `<prefix>_<metric>{span="<name>"} <value>` line per counter.
+        """
+        lines = []
+        for (metric, span_name), value in sorted(self.snapshot().items()):
+            lines.append(f'{self.prefix}_{metric}{{span="{span_name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryHook(TraceHook):
+    """
+    Mirrors Raxo spans into OpenTelemetry spans.
+
+    Requires the `opentelemetry-api` package; the exporter and provider are configured by the
+    application as usual.
+
+    Args:
+        tracer_name (str): The instrumentation name passed to `trace.get_tracer`. Default is "raxo".
+    """
+
+    def __init__(self, tracer_name: str = "raxo"):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError("OpenTelemetryHook requires `opentelemetry-api`, "
+                              "install it with `pip install opentelemetry-api`.") from e
+        self._trace = trace
+        self._tracer = trace.get_tracer(tracer_name)
+        self._lock = threading.Lock()
+        self._open = {}
+
+    def on_start(self, span: Span):
+        context = None
+        with self._lock:
+            parent = self._open.get(span.parent.span_id) if span.parent is not None else None
+        if parent is not None:
+            context = self._trace.set_span_in_context(parent)
+        otel_span = self._tracer.start_span(f"raxo.{span.name}", context=context)
+        with self._lock:
+            self._open[span.span_id] = otel_span
+
+    def on_end(self, span: Span):
+        with self._lock:
+            otel_span = self._open.pop(span.span_id, None)
+        if otel_span is None:
+            return
+        for key, value in span.attributes.items():
+            if isinstance(value, (str, bool, int, float)):
+                otel_span.set_attribute(f"raxo.{key}", value)
+        if span.error is not None:
+            otel_span.record_exception(span.error)
+        otel_span.end()
+
+
+class RootSpanHook(TraceHook):
+    """
+    Keeps the last root span finished on each thread.
+
+    A caller reads the outcome and generated SQL recorded on the span of the request it just made.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def on_end(self, span: Span):
+        if span.parent is None:
+            self._local.span = span
+
+    def take(self) -> Span | None:
+        """Return and clear the last root span finished on the calling thread, if any."""
+        span = getattr(self._local, "span", None)
+        self._local.span = None
+        return span
+
+
+class Tracer:
+    """
+    Creates spans and dispatches them to the registered hooks.
+
+    Spans opened on the same thread are nested automatically, so the stages of one request share
+    a common root span. With no hooks registered the tracer only takes two `perf_counter` readings
+    per stage.
+
+    Args:
+        hooks (list[TraceHook] | None): The hooks to notify. Default is None.
+    """
+
+    def __init__(self, hooks: list | None = None):
+        self.hooks = list(hooks or [])
+        self._local = threading.local()
+
+    def add_hook(self, hook: TraceHook):
+        """Register an additional hook."""
+        self.hooks.append(hook)
+
+    @property
+    def current_span(self) -> Span | None:
+        """The innermost span open on the calling thread, if any."""
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        Open a span for the duration of the `with` block.
+
+        Args:
+            name (str): The stage name.
+            **attributes: Initial attributes of the span.
+
+        Yields:
+            Span: The open span; attributes may be added to it inside the block.
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        span = Span(name, parent=stack[-1] if stack else None, attributes=attributes)
+        stack.append(span)
+        hooks = self.hooks
+        if hooks:
+            self._dispatch("on_start", span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = e
+            raise
+        finally:
+            span.end = time.perf_counter()
+            stack.pop()
+            if hooks:
+                self._dispatch("on_end", span)
+
+    def _dispatch(self, method: str, span: Span):
+        for hook in self.hooks:
+            try:
+                getattr(hook, method)(span)
+            except Exception:
+                logger.exception("Trace hook %r failed in %s", hook, method)
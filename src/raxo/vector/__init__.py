@@ -7,6 +7,7 @@ Currently, it includes support for ChromaDB, with plans to add support for Qdran
 
 Classes:
     ChromaStore: A class to create and manage a ChromaDB client and its collections.
+    SnapshotStore: A read-only store serving an exported snapshot from memory-mapped files.
     (Future classes for Qdrant and other vector databases will be added here.)
 
 ChromaStore Usage Example:
@@ -27,3 +28,4 @@ ChromaStore Usage Example:
 """
 
 from .chroma_db import ChromaStore
+from .snapshot import SnapshotStore
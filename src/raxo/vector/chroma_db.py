@@ -21,16 +21,27 @@ Usage Example:
         n_result_ddl=10,
         n_result_doc=10
     )
-    chroma_store.connect()
-    results = chroma_store.execute_query("SELECT * FROM my_table")
-    chroma_store.disconnect()
+    ddl_id = chroma_store.add_ddl(ddl, embedding, namespace={"tenant": "acme", "database": "sales"})
+    chroma_store.add_question_sql("total sales per region", "SELECT region, SUM(amount) FROM sales GROUP BY region",
+                                  question_embedding)
+    results = chroma_store.get_ddl(question_embedding, namespace={"tenant": "acme"})
+    chroma_store.delete_namespace({"tenant": "acme"})
+
+Many tenants can share one store: every document is written with its namespace as metadata and
+retrieval is filtered on it, so one client, one SQLite directory and one set of collections serve
+all of them.
 """
 
-import chromadb
+import logging
+import threading
 import uuid
-from chromadb.utils import embedding_functions
+
+import chromadb
+from .snapshot import export_snapshot, import_snapshot
 from .vector import Vector
 
+logger = logging.getLogger(__name__)
+
 
 class ChromaStore(Vector):
     """
@@ -40,7 +51,7 @@ class ChromaStore(Vector):
     and documentation results. It allows for either persistent storage using SQLite or in-memory storage.
 
     Attributes:
-        em_function: The embedding function to use for vector embeddings.
+        em_function: The Raxo embedding of the stored documents, kept for reference; embeddings are passed explicitly.
         n_result_sql (int): The number of SQL results to retrieve from the vector database.
         n_result_ddl (int): The number of DDL results to retrieve from the vector database.
         n_result_doc (int): The number of documentation results to retrieve from the vector database.
@@ -58,7 +69,8 @@ class ChromaStore(Vector):
         Args:
             path (str | None): The path for the SQLite database file. Default is "./db".
             persistent (bool | None): Whether to store embeddings in SQLite (True) or keep in-memory (False). Default is True.
-            em_function: The embedding function to use. If None, the default embedding function is used.
+            em_function: The Raxo embedding of the stored documents. Chroma never calls it, embeddings
+                are always passed explicitly. Default is None.
             metadata: Additional metadata required by ChromaDB for the collections. Default is None.
             n_result_sql (int): The number of SQL results to retrieve from the vector database. Default is 10.
             n_result_ddl (int): The number of DDL results to retrieve from the vector database. Default is 10.
@@ -70,67 +82,260 @@ class ChromaStore(Vector):
         self.n_result_sql = n_result_sql
         self.n_result_ddl = n_result_ddl
         self.n_result_doc = n_result_doc
+        self._counts = {}
+        self._count_lock = threading.Lock()
 
-        print("check persistent", persistent)
         if persistent:
-            print("creating persistent client")
+            logger.debug("Creating persistent Chroma client at %s", path)
             self.chroma_client = chromadb.PersistentClient(path=path)
         else:
             self.chroma_client = chromadb.Client()
-        if self.em_function.embed_mode == "openai":
-            self.em_function = embedding_functions.OpenAIEmbeddingFunction(api_key=self.em_function.api_key,
-                                                                           model_name=self.em_function.model)
-        else:
-            self.em_function = embedding_functions.DefaultEmbeddingFunction()
 
+        # Embeddings are always computed by Raxo and passed explicitly, so the collections have no
+        # embedding function: Chroma never calls a provider, and a persisted collection reopens
+        # whatever function it was created with.
         # creating collection for sql queries used for few shot
         self.sql_collection = self.chroma_client.get_or_create_collection(
             name="sql",
-            embedding_function=self.em_function,
+            embedding_function=None,
             metadata=metadata
         )
 
         self.ddl_collection = self.chroma_client.get_or_create_collection(
             name="ddl",
-            embedding_function=self.em_function,
+            embedding_function=None,
             metadata=metadata
         )
 
         self.doc_collection = self.chroma_client.get_or_create_collection(
             name="documentation",
-            embedding_function=self.em_function,
+            embedding_function=None,
             metadata=metadata
         )
 
-    def add_ddl(self, ddl: str, embedding: list) -> str:
-        ddl_id = f"{str(uuid.uuid4())}-ddl"
-        self.ddl_collection.add(
-            documents=ddl,
-            embeddings=embedding,
-            ids=ddl_id
-        )
-        return ddl_id
+    @staticmethod
+    def _namespace_metadata(namespace: dict | None) -> dict | None:
+        if not namespace:
+            return None
+        return {key: value for key, value in namespace.items() if value is not None} or None
+
+    @staticmethod
+    def _where(namespace: dict | None) -> dict | None:
+        """Build a Chroma `where` filter matching every key of a namespace."""
+        metadata = ChromaStore._namespace_metadata(namespace)
+        if not metadata:
+            return None
+        clauses = [{key: value} for key, value in sorted(metadata.items())]
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    @staticmethod
+    def _namespace_key(namespace: dict | None) -> tuple:
+        return tuple(sorted((ChromaStore._namespace_metadata(namespace) or {}).items()))
 
-    def add_documentation(self, doc: str, embedding: list) -> str:
-        doc_id = f"{str(uuid.uuid4())}-doc"
-        self.doc_collection.add(
-            documents=doc,
+    def _add(self, collection, item_id: str, document: str, embedding: list, namespace: dict | None,
+             metadata: dict | None = None) -> str:
+        metadata = {**(self._namespace_metadata(namespace) or {}), **(metadata or {})} or None
+        collection.add(
+            documents=document,
             embeddings=embedding,
-            ids=doc_id
+            metadatas=metadata,
+            ids=item_id
         )
-        return doc_id
+        return item_id
 
-    def get_ddl(self, question_embed: str):
-        print("question asked: ", question_embed)
+    def add_ddl(self, ddl: str, embedding: list, namespace: dict | None = None, original: str | None = None) -> str:
+        """
+        Store a DDL statement with its embedding.
 
-        # Get the count of embeddings in the collection
-        embedding_count = self.ddl_collection.count()
+        Args:
+            ddl (str): The DDL statement.
+            embedding (list): The embedding of the statement.
+            namespace (dict | None): Keys such as {"tenant": ..., "database": ..., "schema": ...} stored as
+                metadata, used to scope retrieval when several tenants share the store. Default is None.
+            original (str | None): The DDL as written, kept in the `original` metadata key for display
+                when `ddl` is its compact form. Default is None.
 
-        # Adjust n_results if it exceeds the available embeddings
-        if self.n_result_ddl > embedding_count:
-            self.n_result_ddl = embedding_count
+        Returns:
+            str: The id of the stored document.
+        """
+        return self._add(self.ddl_collection, f"{str(uuid.uuid4())}-ddl", ddl, embedding, namespace,
+                         metadata={"original": original} if original else None)
+
+    def add_question_sql(self, question: str, sql: str, embedding: list, namespace: dict | None = None) -> str:
+        """
+        Store a question/SQL pair used as a few-shot example.
+
+        The question is the document and its embedding is the question embedding; the SQL is kept
+        as metadata.
 
-        return self.ddl_collection.query(
+        Args:
+            question (str): The natural language question.
+            sql (str): The SQL answering it.
+            embedding (list): The embedding of the question.
+            namespace (dict | None): The namespace the example belongs to, see `add_ddl`. Default is None.
+
+        Returns:
+            str: The id of the stored document.
+        """
+        return self._add(self.sql_collection, f"{str(uuid.uuid4())}-sql", question, embedding, namespace,
+                         metadata={"sql": sql})
+
+    def add_documentation(self, doc: str, embedding: list, namespace: dict | None = None) -> str:
+        """
+        Store documentation with its embedding.
+
+        Args:
+            doc (str): The documentation text.
+            embedding (list): The embedding of the text.
+            namespace (dict | None): The namespace the documentation belongs to, see `add_ddl`. Default is None.
+
+        Returns:
+            str: The id of the stored document.
+        """
+        return self._add(self.doc_collection, f"{str(uuid.uuid4())}-doc", doc, embedding, namespace)
+
+    def count(self, collection=None, namespace: dict | None = None) -> int:
+        """
+        Count the documents of a collection within a namespace.
+
+        The count of a namespace is cached with the size of the whole collection, which Chroma
+        returns without a scan, and taken again once that size changes, including when another
+        process writes to the same store. Retrieval then does not scan the collection on every
+        question.
+
+        Args:
+            collection: The Chroma collection. Default is the DDL collection.
+            namespace (dict | None): The namespace to count in. Default is None, the whole collection.
+
+        Returns:
+            int: The number of documents.
+        """
+        collection = collection or self.ddl_collection
+        total = collection.count()
+        where = self._where(namespace)
+        if where is None:
+            return total
+        cache_key = (collection.name, self._namespace_key(namespace))
+        with self._count_lock:
+            cached = self._counts.get(cache_key)
+        if cached is not None and cached[0] == total:
+            return cached[1]
+        count = len(collection.get(where=where, include=[])["ids"])
+        with self._count_lock:
+            self._counts[cache_key] = (total, count)
+        return count
+
+    def _query(self, collection, question_embed: list, n_results: int, namespace: dict | None = None,
+               include_embeddings: bool = False) -> dict:
+        # Adjust n_results if it exceeds the available embeddings
+        n_results = min(n_results, self.count(collection, namespace))
+        include = ["documents", "metadatas", "distances"] + (["embeddings"] if include_embeddings else [])
+        if n_results == 0:
+            return {"ids": [[]], **{key: [[]] for key in include}}
+        return collection.query(
             query_embeddings=[question_embed],
-            n_results=self.n_result_ddl
+            n_results=n_results,
+            where=self._where(namespace),
+            include=include
         )
+
+    def get_ddl(self, question_embed: list, namespace: dict | None = None, n_results: int | None = None):
+        """
+        Retrieve the DDL statements closest to a question embedding.
+
+        Args:
+            question_embed (list): The embedding of the question.
+            namespace (dict | None): Only search documents of this namespace. Default is None.
+            n_results (int | None): The number of statements, e.g. the candidate pool of an
+                adaptive depth. Default is `n_result_ddl`.
+
+        Returns:
+            dict: The Chroma query result, with `ids`, `documents`, `metadatas` and `distances`.
+        """
+        n_results = self.n_result_ddl if n_results is None else n_results
+        return self._query(self.ddl_collection, question_embed, n_results, namespace)
+
+    def list_ddl(self, namespace: dict | None = None) -> dict:
+        """
+        Return every stored DDL statement, e.g. to rebuild a join graph at startup.
+
+        Args:
+            namespace (dict | None): Only return documents of this namespace. Default is None.
+
+        Returns:
+            dict: The Chroma get result, with flat `ids`, `documents` and `metadatas` lists.
+        """
+        return self.ddl_collection.get(where=self._where(namespace), include=["documents", "metadatas"])
+
+    def get_similar_question_sql(self, question_embed: list, namespace: dict | None = None,
+                                 n_results: int | None = None):
+        """
+        Retrieve the few-shot examples closest to a question embedding.
+
+        Args:
+            question_embed (list): The embedding of the question.
+            namespace (dict | None): Only search examples of this namespace. Default is None.
+            n_results (int | None): The number of candidates. Default is `n_result_sql`.
+
+        Returns:
+            dict: The Chroma query result, including `embeddings` so candidates can be re-ranked.
+                Questions are the documents and the SQL is in the `sql` metadata key.
+        """
+        n_results = self.n_result_sql if n_results is None else n_results
+        return self._query(self.sql_collection, question_embed, n_results, namespace, include_embeddings=True)
+
+    def get_documentation(self, question_embed: list, namespace: dict | None = None):
+        """
+        Retrieve the documentation closest to a question embedding.
+
+        Args:
+            question_embed (list): The embedding of the question.
+            namespace (dict | None): Only search documents of this namespace. Default is None.
+
+        Returns:
+            dict: The Chroma query result, with `ids`, `documents`, `metadatas` and `distances`.
+        """
+        return self._query(self.doc_collection, question_embed, self.n_result_doc, namespace)
+
+    def delete_namespace(self, namespace: dict) -> None:
+        """
+        Delete every document of a namespace, e.g. {"tenant": "acme"} for a whole tenant.
+
+        Args:
+            namespace (dict): The namespace to delete. It must not be empty.
+
+        Raises:
+            ValueError: If the namespace is empty, which would delete every document.
+        """
+        where = self._where(namespace)
+        if where is None:
+            raise ValueError("A non-empty namespace is required, refusing to delete every document.")
+        for collection in (self.sql_collection, self.ddl_collection, self.doc_collection):
+            collection.delete(where=where)
+        with self._count_lock:
+            self._counts.clear()
+
+    def export_snapshot(self, path: str) -> dict:
+        """
+        Write every collection, with its embeddings, to a snapshot directory.
+
+        Args:
+            path (str): The snapshot directory, see `raxo.vector.snapshot`.
+
+        Returns:
+            dict: The number of documents exported per collection.
+        """
+        return export_snapshot(self, path)
+
+    def import_snapshot(self, path: str, namespace: dict | None = None) -> dict:
+        """
+        Load a snapshot into this store without computing any embedding.
+
+        Args:
+            path (str): The snapshot directory.
+            namespace (dict | None): Metadata merged into every imported document. Default is None.
+
+        Returns:
+            dict: The number of documents imported per collection.
+        """
+        return import_snapshot(self, path, namespace=namespace)
@@ -0,0 +1,393 @@
+"""
+Snapshot Module
+
+This module exports trained vector store contents to a compact snapshot and serves them back
+from memory-mapped files. A new replica can answer its first query as soon as the files are
+mapped, without opening ChromaDB's SQLite store, and a trained corpus can be copied between
+environments with zero embedding calls.
+
+A snapshot is a directory holding:
+    manifest.json: The format version, embedding dimensions, and the row range and distance space
+        ("l2", "cosine" or "ip", as Chroma's `hnsw:space`) of each collection.
+    embeddings.f32: All embeddings as packed little-endian float32, one row per document.
+    records.bin: The id, document and metadata of each row as concatenated UTF-8 JSON.
+    offsets.u64: N + 1 little-endian uint64 offsets of the records in records.bin.
+
+Classes:
+    SnapshotWriter: Streams documents into a snapshot directory.
+    SnapshotStore: A read-only Vector store serving a snapshot through mmap.
+
+Functions:
+    export_snapshot: Write the contents of a ChromaStore or InMemoryVectorStore to a snapshot.
+    import_snapshot: Load a snapshot into a ChromaStore, reusing the stored embeddings.
+
+Usage Example:
+    # on the node that trained the corpus
+    export_snapshot(chroma_store, "./snapshot")
+
+    # on a new replica: serve straight from the mapped files...
+    raxo = Raxo(llm=open_ai, vector_db=SnapshotStore("./snapshot"), em_function=embed)
+    # ...or load them into a fresh ChromaStore without re-embedding anything
+    import_snapshot(ChromaStore(path="./db", em_function=embed), "./snapshot")
+"""
+
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from ..utils.exceptions import ReadOnlyStore
+from .vector import Vector
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SNAPSHOT_VERSION = 1
+COLLECTIONS = ("sql", "ddl", "documentation")
+_EXPORT_BATCH = 1000
+_SPACES = ("l2", "cosine", "ip")
+_READ_ONLY = "SnapshotStore is read-only, import the snapshot into a ChromaStore to train it."
+
+
+class SnapshotWriter:
+    """
+    Streams documents into a snapshot directory.
+
+    Documents must be written grouped by collection; the manifest is written by `close`.
+
+    Args:
+        path (str): The snapshot directory, created if needed.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.dimensions = None
+        self.count = 0
+        self.collections = {}
+        self.spaces = {}
+        self._offset = 0
+        self._embeddings = open(os.path.join(path, "embeddings.f32"), "wb")
+        self._records = open(os.path.join(path, "records.bin"), "wb")
+        self._offsets = open(os.path.join(path, "offsets.u64"), "wb")
+        self._offsets.write(struct.pack("<Q", 0))
+
+    def write(self, collection: str, item_id: str, document: str, embedding, metadata: dict | None = None,
+              space: str = "l2"):
+        """
+        Append one document.
+
+        Args:
+            collection (str): The collection name, e.g. "ddl".
+            item_id (str): The document id.
+            document (str): The document text.
+            embedding (list[float]): The document embedding.
+            metadata (dict | None): The document metadata. Default is None.
+            space (str): The distance space of the collection: "l2", "cosine" or "ip". Default is "l2".
+
+        Raises:
+            ValueError: If the embedding size differs from earlier ones, the collections are
+                interleaved or the space is unknown.
+        """
+        if space not in _SPACES:
+            raise ValueError(f"Unknown distance space {space!r}, expected one of {_SPACES}")
+        vector = array("f", embedding)
+        if self.dimensions is None:
+            self.dimensions = len(vector)
+        elif len(vector) != self.dimensions:
+            raise ValueError(f"Embedding of {item_id} has {len(vector)} dimensions, expected {self.dimensions}")
+        if collection not in self.collections:
+            self.collections[collection] = [self.count, self.count]
+            self.spaces[collection] = space
+        elif self.collections[collection][1] != self.count:
+            raise ValueError("Documents must be written grouped by collection")
+        if sys.byteorder != "little":
+            vector.byteswap()
+        self._embeddings.write(vector.tobytes())
+        record = json.dumps({"id": item_id, "document": document, "metadata": metadata},
+                            separators=(",", ":")).encode("utf-8")
+        self._records.write(record)
+        self._offset += len(record)
+        self._offsets.write(struct.pack("<Q", self._offset))
+        self.count += 1
+        self.collections[collection][1] = self.count
+
+    def close(self):
+        """Flush the data files and write the manifest."""
+        for file in (self._embeddings, self._records, self._offsets):
+            file.close()
+        manifest = {"version": SNAPSHOT_VERSION, "dimensions": self.dimensions or 0, "count": self.count,
+                    "collections": self.collections, "spaces": self.spaces}
+        with open(os.path.join(self.path, "manifest.json"), "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _iter_chroma(collection):
+    offset = 0
+    while True:
+        batch = collection.get(include=["embeddings", "documents", "metadatas"], limit=_EXPORT_BATCH, offset=offset)
+        if not batch["ids"]:
+            return
+        yield from zip(batch["ids"], batch["documents"], batch["embeddings"], batch["metadatas"])
+        offset += len(batch["ids"])
+
+
+def export_snapshot(store, path: str) -> dict:
+    """
+    Write the contents of a vector store to a snapshot directory.
+
+    Args:
+        store: A ChromaStore, or any store with an InMemoryVectorStore-style `collections` dict.
+        path (str): The snapshot directory.
+
+    Returns:
+        dict: The number of documents exported per collection.
+    """
+    exported = {}
+    with SnapshotWriter(path) as writer:
+        for name in COLLECTIONS:
+            space = "l2"
+            if hasattr(store, "ddl_collection"):
+                collection = {"sql": store.sql_collection, "ddl": store.ddl_collection,
+                              "documentation": store.doc_collection}[name]
+                items = _iter_chroma(collection)
+                space = (collection.metadata or {}).get("hnsw:space", "l2")
+            else:
+                items = ((item_id, document, embedding, metadata)
+                         for item_id, (document, embedding, metadata) in list(store.collections[name].items()))
+            exported[name] = 0
+            for item_id, document, embedding, metadata in items:
+                writer.write(name, item_id, document, embedding, metadata, space=space)
+                exported[name] += 1
+    return exported
+
+
+def import_snapshot(store, path: str, namespace: dict | None = None, batch_size: int = _EXPORT_BATCH) -> dict:
+    """
+    Load a snapshot into a ChromaStore, reusing the stored embeddings.
+
+    Documents keep their ids and are upserted, so importing twice is harmless.
+
+    Args:
+        store: The ChromaStore to load into.
+        path (str): The snapshot directory.
+        namespace (dict | None): Metadata merged into every document, e.g. to import a corpus for
+            another tenant. Default is None.
+        batch_size (int): The number of documents upserted per call. Default is 1000.
+
+    Returns:
+        dict: The number of documents imported per collection.
+    """
+    snapshot = SnapshotStore(path)
+    collections = {"sql": store.sql_collection, "ddl": store.ddl_collection, "documentation": store.doc_collection}
+    imported = {}
+    try:
+        for name, (start, end) in snapshot.collections.items():
+            for batch_start in range(start, end, batch_size):
+                rows = range(batch_start, min(batch_start + batch_size, end))
+                # Chroma rejects empty metadata entries, so rows with and without metadata are upserted apart
+                groups = {True: [], False: []}
+                for row in rows:
+                    record = snapshot.record(row)
+                    record["metadata"] = {**(record["metadata"] or {}), **(namespace or {})} or None
+                    groups[record["metadata"] is not None].append((row, record))
+                for has_metadata, group in groups.items():
+                    if not group:
+                        continue
+                    collections[name].upsert(
+                        ids=[record["id"] for _, record in group],
+                        documents=[record["document"] for _, record in group],
+                        embeddings=[snapshot.embedding(row) for row, _ in group],
+                        metadatas=[record["metadata"] for _, record in group] if has_metadata else None
+                    )
+            imported[name] = end - start
+    finally:
+        snapshot.close()
+    if hasattr(store, "_counts"):
+        with store._count_lock:
+            store._counts.clear()
+    return imported
+
+
+class SnapshotStore(Vector):
+    """
+    A read-only vector store serving a snapshot through memory-mapped files.
+
+    Only the pages touched by a query are read from disk. Distances are computed in the space the
+    collection was exported with, as ChromaDB defines them: squared L2, 1 - cosine similarity or
+    1 - inner product. Snapshots without a recorded space use squared L2, ChromaDB's default.
+    Distances are computed with numpy when it is installed.
+
+    Attributes:
+        dimensions (int): The embedding size.
+        collections (dict): The [start, end) row range of each collection.
+        spaces (dict): The distance space of each collection.
+    """
+
+    def __init__(self, path: str, n_result_sql=5, n_result_ddl=5, n_result_doc=5):
+        """
+        Initialize an instance of the SnapshotStore class.
+
+        Args:
+            path (str): The snapshot directory.
+            n_result_sql (int): The number of SQL results to retrieve. Default is 5.
+            n_result_ddl (int): The number of DDL results to retrieve. Default is 5.
+            n_result_doc (int): The number of documentation results to retrieve. Default is 5.
+
+        Raises:
+            ValueError: If the snapshot was written by an unsupported format version.
+        """
+        Vector.__init__(self)
+        with open(os.path.join(path, "manifest.json"), encoding="utf-8") as file:
+            manifest = json.load(file)
+        if manifest["version"] != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {manifest['version']}")
+        self.path = path
+        self.dimensions = manifest["dimensions"]
+        self.count = manifest["count"]
+        self.collections = {name: tuple(bounds) for name, bounds in manifest["collections"].items()}
+        self.spaces = {name: manifest.get("spaces", {}).get(name, "l2") for name in self.collections}
+        self.n_result_sql = n_result_sql
+        self.n_result_ddl = n_result_ddl
+        self.n_result_doc = n_result_doc
+        self._files = []
+        self._maps = {}
+        for name in ("embeddings.f32", "records.bin", "offsets.u64"):
+            file = open(os.path.join(path, name), "rb")
+            self._files.append(file)
+            self._maps[name] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(file.name) else b""
+        if np is not None and self.count:
+            self._matrix = np.frombuffer(self._maps["embeddings.f32"], dtype="<f4").reshape(self.count, self.dimensions)
+        else:
+            if sys.byteorder != "little":
+                raise RuntimeError("Reading snapshots on big-endian machines requires numpy")
+            self._matrix = None
+            self._vectors = memoryview(self._maps["embeddings.f32"]).cast("f") if self.count else None
+
+    def close(self):
+        """Unmap and close the snapshot files."""
+        self._matrix = None
+        self._vectors = None
+        for mapped in self._maps.values():
+            if isinstance(mapped, mmap.mmap):
+                try:
+                    mapped.close()
+                except BufferError:
+                    pass  # still referenced by an array handed out to a caller
+        for file in self._files:
+            file.close()
+
+    def record(self, row: int) -> dict:
+        """Decode the id, document and metadata of a row."""
+        start, end = struct.unpack_from("<QQ", self._maps["offsets.u64"], row * 8)
+        return json.loads(self._maps["records.bin"][start:end])
+
+    def embedding(self, row: int) -> list:
+        """Return the embedding of a row."""
+        if self._matrix is not None:
+            return self._matrix[row].tolist()
+        return list(self._vectors[row * self.dimensions:(row + 1) * self.dimensions])
+
+    def _distances(self, start: int, end: int, question_embed, space: str = "l2"):
+        if self._matrix is not None:
+            block = self._matrix[start:end]
+            query = np.asarray(question_embed, dtype=np.float32)
+            if space == "l2":
+                difference = block - query
+                return np.einsum("ij,ij->i", difference, difference).tolist()
+            products = block @ query
+            if space == "cosine":
+                norms = np.linalg.norm(block, axis=1) * np.linalg.norm(query)
+                products = products / np.where(norms == 0, 1.0, norms)
+            return (1.0 - products).tolist()
+        distances = []
+        dimensions = self.dimensions
+        query_norm = sum(value * value for value in question_embed) ** 0.5
+        for row in range(start, end):
+            vector = self._vectors[row * dimensions:(row + 1) * dimensions]
+            if space == "l2":
+                distances.append(sum((a - b) * (a - b) for a, b in zip(vector, question_embed)))
+                continue
+            product = sum(a * b for a, b in zip(vector, question_embed))
+            if space == "cosine":
+                norm = sum(value * value for value in vector) ** 0.5 * query_norm
+                product = product / norm if norm else product
+            distances.append(1.0 - product)
+        return distances
+
+    def query(self, collection: str, question_embed, n_results: int, namespace: dict | None = None,
+              include_embeddings: bool = False) -> dict:
+        """
+        Find the documents of a collection closest to an embedding.
+
+        Args:
+            collection (str): The collection name.
+            question_embed (list[float]): The query embedding.
+            n_results (int): The number of documents to return.
+            namespace (dict | None): Only return documents whose metadata matches. Default is None.
+            include_embeddings (bool): Whether to add the `embeddings` of the documents. Default is False.
+
+        Returns:
+            dict: A Chroma-shaped result with `ids`, `documents`, `metadatas` and `distances`.
+        """
+        start, end = self.collections.get(collection, (0, 0))
+        ranked = heapq.nsmallest(n_results if not namespace else end - start,
+                                 zip(self._distances(start, end, question_embed, self.spaces.get(collection, "l2")),
+                                     range(start, end)))
+        result = {"ids": [[]], "documents": [[]], "metadatas": [[]], "distances": [[]]}
+        if include_embeddings:
+            result["embeddings"] = [[]]
+        for distance, row in ranked:
+            record = self.record(row)
+            if namespace and any((record["metadata"] or {}).get(key) != value
+                                 for key, value in namespace.items() if value is not None):
+                continue
+            result["ids"][0].append(record["id"])
+            result["documents"][0].append(record["document"])
+            result["metadatas"][0].append(record["metadata"])
+            result["distances"][0].append(distance)
+            if include_embeddings:
+                result["embeddings"][0].append(self.embedding(row))
+            if len(result["ids"][0]) == n_results:
+                break
+        return result
+
+    def add_ddl(self, ddl, embedding, namespace=None, original=None):
+        raise ReadOnlyStore(_READ_ONLY)
+
+    def add_documentation(self, doc, embedding, namespace=None):
+        raise ReadOnlyStore(_READ_ONLY)
+
+    def get_ddl(self, question_embed, namespace: dict | None = None, n_results: int | None = None) -> dict:
+        n_results = self.n_result_ddl if n_results is None else n_results
+        return self.query("ddl", question_embed, n_results, namespace)
+
+    def list_ddl(self, namespace: dict | None = None) -> dict:
+        start, end = self.collections.get("ddl", (0, 0))
+        records = [self.record(row) for row in range(start, end)]
+        records = [record for record in records if not namespace or all(
+            (record["metadata"] or {}).get(key) == value for key, value in namespace.items() if value is not None)]
+        return {"ids": [record["id"] for record in records], "documents": [record["document"] for record in records],
+                "metadatas": [record["metadata"] for record in records]}
+
+    def add_question_sql(self, question, sql, embedding, namespace=None):
+        raise ReadOnlyStore(_READ_ONLY)
+
+    def get_similar_question_sql(self, question_embed, namespace: dict | None = None,
+                                 n_results: int | None = None) -> dict:
+        n_results = self.n_result_sql if n_results is None else n_results
+        return self.query("sql", question_embed, n_results, namespace, include_embeddings=True)
+
+    def get_documentation(self, question_embed, namespace: dict | None = None) -> dict:
+        return self.query("documentation", question_embed, self.n_result_doc, namespace)
@@ -0,0 +1,40 @@
+"""Regression tests for `raxo.batch.BatchRunner`."""
+
+import json
+
+from raxo.batch import BatchRunner
+from raxo.benchmarks.scenarios import build_raxo
+from raxo.testing.fakes import FakeLlm, SQLiteDatabase
+
+
+def test_results_are_written_as_a_bounded_page(tmp_path):
+    database = SQLiteDatabase()
+    database.connect()
+    database.execute_script("CREATE TABLE numbers (n INT); " +
+                            " ".join(f"INSERT INTO numbers VALUES ({n});" for n in range(5)))
+    raxo = build_raxo(database=database, execute_query=True)
+    raxo.llm = FakeLlm(responder=lambda prompt: '{"sql": "SELECT n FROM numbers ORDER BY n", "error": null}')
+    questions, output = tmp_path / "questions.jsonl", tmp_path / "results.jsonl"
+    questions.write_text(json.dumps({"question": "list the numbers"}) + "\n")
+
+    BatchRunner(raxo, max_result_rows=2, progress_interval=60).run(str(questions), str(output))
+    record = json.loads(output.read_text())
+    assert record["result"] == [[0], [1]]
+    assert record["row_count"] == 5 and record["truncated"]
+
+
+def test_fallback_answers_are_retried_on_resume(tmp_path):
+    raxo = build_raxo()
+    raxo.llm = FakeLlm(responder=lambda prompt: "I am not sure what you mean.")
+    questions, output = tmp_path / "questions.jsonl", tmp_path / "results.jsonl"
+    questions.write_text(json.dumps({"question": "list the numbers"}) + "\n")
+
+    assert BatchRunner(raxo, progress_interval=60).run(str(questions), str(output))["failed"] == 1
+    record = json.loads(output.read_text())
+    assert record["error"].startswith("no_sql: something went wrong")
+    assert raxo.tracer.hooks == []
+
+    raxo.llm = FakeLlm(responder=lambda prompt: '{"sql": "SELECT n FROM numbers", "error": null}')
+    summary = BatchRunner(raxo, progress_interval=60).run(str(questions), str(output))
+    assert summary["processed"] == 1 and summary["failed"] == 0
+    assert json.loads(output.read_text().splitlines()[-1])["result"] == "SELECT n FROM numbers"
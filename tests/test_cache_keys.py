@@ -0,0 +1,39 @@
+"""Regression tests for the canonical cache keys of `raxo.utils.normalize`."""
+
+from raxo.benchmarks.scenarios import build_raxo
+from raxo.testing.fakes import FakeLlm
+from raxo.utils.normalize import canonicalize
+
+DDL = "CREATE TABLE orders (id INT, amount DECIMAL(10, 2))"
+
+
+def test_operators_and_units_keep_distinct_keys():
+    keys = [canonicalize(question).key for question in (
+        "orders with amount >= 100", "orders with amount > 100", "orders with amount != 100",
+        "orders with amount = 100", "orders with amount <= 100", "orders with amount < 100",
+        "growth over 10%", "growth over 10", "revenue above $100", "revenue above 100")]
+    assert len(set(keys)) == len(keys)
+
+
+def test_operator_change_is_not_served_from_cache():
+    def responder(prompt):
+        question = prompt[-1]["content"]
+        operator = "!=" if "!=" in question else "="
+        return f'{{"sql": "SELECT * FROM orders WHERE amount {operator} 100", "error": null}}'
+
+    llm = FakeLlm(responder=responder)
+    raxo = build_raxo(cache_size=1024)
+    raxo.llm = llm
+    raxo.train(ddl=DDL)
+
+    assert raxo.ask("orders with amount = 100") == "SELECT * FROM orders WHERE amount = 100"
+    assert raxo.ask("orders with amount != 100") == "SELECT * FROM orders WHERE amount != 100"
+    assert llm.calls == 2
+
+
+def test_commas_only_group_thousands():
+    separate, single, grouped = (canonicalize(question) for question in (
+        "customers 1,2", "customers 12", "customers 1,200"))
+    assert separate.key != single.key and single.key == grouped.key
+    assert separate.values == (1, 2) and single.values == (12,) and grouped.values == (1200,)
+    assert canonicalize("customers 1,2345").values == (1, 2345)
@@ -0,0 +1,30 @@
+"""Regression tests for `raxo.vector.chroma_db.ChromaStore`."""
+
+import warnings
+
+from raxo.testing.fakes import FakeEmbedding
+from raxo.vector.chroma_db import ChromaStore
+
+DDL = "CREATE TABLE orders (id INT, amount DECIMAL(10, 2))"
+
+
+def test_persistent_store_reopens_without_embedding_function_conflicts(tmp_path):
+    embedding = FakeEmbedding()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        store = ChromaStore(path=str(tmp_path), em_function=embedding)
+        store.add_ddl(DDL, embedding.create_embedding(DDL))
+        reopened = ChromaStore(path=str(tmp_path), em_function=embedding)
+    assert reopened.get_ddl(embedding.create_embedding(DDL))["documents"] == [[DDL]]
+
+
+def test_counts_follow_writes_from_another_store(tmp_path):
+    embedding = FakeEmbedding()
+    reader = ChromaStore(path=str(tmp_path), em_function=embedding)
+    namespace = {"tenant": "acme"}
+    assert reader.count(namespace=namespace) == 0
+
+    writer = ChromaStore(path=str(tmp_path), em_function=embedding)
+    writer.add_ddl(DDL, embedding.create_embedding(DDL), namespace=namespace)
+    assert reader.count(namespace=namespace) == 1
+    assert reader.get_ddl(embedding.create_embedding(DDL), namespace=namespace)["documents"] == [[DDL]]
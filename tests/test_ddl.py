@@ -0,0 +1,38 @@
+"""Tests for quoted identifiers and multi-word types in `raxo.utils.ddl`."""
+
+from raxo.utils.ddl import compact_ddl, parse_create_table
+
+MYSQL = ("CREATE TABLE `order items` (`first name` VARCHAR(20) NOT NULL, `it``s` INT, "
+         "amount DOUBLE PRECISION, `key` INT, PRIMARY KEY (`first name`))")
+POSTGRES = ('CREATE TABLE "order items" ("order date" DATE NOT NULL, "say ""hi""" TEXT, '
+            "created TIMESTAMP(3) WITH TIME ZONE, updated TIMESTAMP WITHOUT TIME ZONE DEFAULT now(), "
+            'ratio DOUBLE PRECISION, label CHARACTER VARYING(30), "customer id" INT REFERENCES "all customers"("id"))')
+
+
+def test_mysql_quoted_names_with_spaces():
+    table = parse_create_table(MYSQL)
+    assert table["name"] == "order items"
+    assert [column["name"] for column in table["columns"]] == ["first name", "it`s", "amount", "key"]
+    assert table["primary_key"] == ["first name"] and not table["columns"][0]["nullable"]
+    assert compact_ddl(MYSQL) == ("CREATE TABLE `order items` (`first name` VARCHAR, `it``s` INT, "
+                                  "amount DOUBLE PRECISION, `key` INT, PRIMARY KEY (`first name`))")
+
+
+def test_postgres_quoted_names_and_multi_word_types():
+    table = parse_create_table(POSTGRES)
+    assert [(column["name"], column["type"]) for column in table["columns"]] == [
+        ("order date", "DATE"), ('say "hi"', "TEXT"), ("created", "TIMESTAMP(3) WITH TIME ZONE"),
+        ("updated", "TIMESTAMP WITHOUT TIME ZONE"), ("ratio", "DOUBLE PRECISION"),
+        ("label", "CHARACTER VARYING(30)"), ("customer id", "INT")]
+    assert table["foreign_keys"] == [{"columns": ["customer id"], "table": "all customers", "referenced_columns": ["id"]}]
+    assert compact_ddl(POSTGRES, "Postgres") == (
+        'CREATE TABLE "order items" ("order date" DATE, "say ""hi""" TEXT, created TIMESTAMP WITH TIME ZONE, '
+        "updated TIMESTAMP WITHOUT TIME ZONE, ratio DOUBLE PRECISION, label CHARACTER VARYING, "
+        '"customer id" INT, FOREIGN KEY ("customer id") REFERENCES "all customers"(id))')
+
+
+def test_compacted_ddl_parses_back_to_the_same_columns():
+    for ddl, dialect in ((MYSQL, "MySQL"), (POSTGRES, "Postgres")):
+        original = parse_create_table(ddl)
+        compacted = parse_create_table(compact_ddl(ddl, dialect))
+        assert [column["name"] for column in compacted["columns"]] == [column["name"] for column in original["columns"]]
@@ -0,0 +1,50 @@
+"""Tests for MMR example selection."""
+
+import pytest
+
+from raxo.core import examples as examples_module
+from raxo.core.examples import ExampleSelector, mmr
+
+QUERY = [1.0, 0.0, 0.0]
+# Two near-duplicates of the query and one relevant but different example
+CANDIDATES = [[1.0, 0.0, 0.0], [0.99, 0.01, 0.0], [0.7, 0.7, 0.0]]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(examples_module, "np", None)
+    elif examples_module.np is None:
+        pytest.skip("numpy is not installed")
+    return request.param
+
+
+def test_mmr_prefers_diverse_candidates(backend):
+    assert mmr(QUERY, CANDIDATES, k=2, diversity=0.0) == [0, 1]
+    assert mmr(QUERY, CANDIDATES, k=2, diversity=0.7) == [0, 2]
+
+
+def test_mmr_limits_k_to_the_candidates(backend):
+    assert sorted(mmr(QUERY, CANDIDATES, k=10)) == [0, 1, 2]
+    assert mmr(QUERY, [], k=3) == []
+
+
+def _candidates(questions, sqls):
+    return {
+        "documents": [questions],
+        "embeddings": [CANDIDATES[: len(questions)]],
+        "metadatas": [[{"sql": sql} for sql in sqls]],
+    }
+
+
+def test_selector_renders_sql_only_examples_without_a_question():
+    picked = ExampleSelector(k=1).select(QUERY, _candidates(["SELECT 1"], ["SELECT 1"]))
+    assert picked == [{"question": None, "sql": "SELECT 1"}]
+
+
+def test_selector_stops_at_the_token_budget():
+    candidates = _candidates(["how many orders", "orders count", "top customers"], ["SELECT " + "x, " * 40 + "1"] * 3)
+    assert len(ExampleSelector(k=3, token_budget=None).select(QUERY, candidates)) == 3
+    budgeted = ExampleSelector(k=3, token_budget=60).select(QUERY, candidates)
+    assert len(budgeted) == 1 and budgeted[0]["question"] == "how many orders"
+    assert ExampleSelector(k=3, token_budget=1).select(QUERY, candidates) == []
@@ -0,0 +1,22 @@
+"""Regression tests for the follow-up questions of `raxo.core.base.Raxo`."""
+
+import threading
+
+from raxo.benchmarks.scenarios import build_raxo
+from raxo.testing.fakes import FakeLlm
+
+
+def test_uncached_follow_ups_run_on_the_calling_thread():
+    threads = []
+
+    def responder(prompt):
+        threads.append(threading.current_thread())
+        return "1. Which region sells most?"
+
+    raxo = build_raxo()
+    raxo.llm = FakeLlm(responder=responder)
+    raxo.get_follow_up_questions("total sales", tables=["CREATE TABLE sales (amount INT)"])
+    raxo.get_follow_up_questions("total sales", tables=["CREATE TABLE sales (amount INT)"])
+    raxo.get_follow_up_questions("total sales", tables=["CREATE TABLE orders (amount INT)"])
+    # Cached per tables, and never handed to the follow-up workers
+    assert threads == [threading.current_thread()] * 2
@@ -0,0 +1,38 @@
+"""Regression tests for `raxo.core.join_graph.JoinGraph` as used by Raxo."""
+
+from raxo.benchmarks.scenarios import build_raxo
+from raxo.core import JoinGraph, Raxo
+
+DDL = ["CREATE TABLE customers (id INT PRIMARY KEY, name VARCHAR(50))",
+       "CREATE TABLE orders (id INT PRIMARY KEY, customer_id INT REFERENCES customers(id))"]
+
+
+def test_join_graph_is_loaded_from_stored_ddl():
+    trained = build_raxo()
+    trained.train_many(ddl=DDL)
+    trained.with_namespace({"tenant": "acme"}).train(ddl=DDL[0])
+
+    graph = JoinGraph()
+    raxo = Raxo(llm=trained.llm, vector_db=trained.vector_db, em_function=trained.em_function, join_graph=graph)
+    assert raxo.load_join_graph() == 3
+    assert graph.path("customers", "orders") == ["customers", "orders"]
+    assert graph.stats({"tenant": "acme"})["tables"] == 1
+
+
+def test_single_train_precomputes_join_paths():
+    graph = JoinGraph()
+    raxo = build_raxo(join_graph=graph)
+    for ddl in DDL:
+        raxo.train(ddl=ddl)
+    assert graph.stats()["cached_paths"] == 2
+
+
+def test_questions_see_the_tables_of_narrower_namespaces():
+    graph = JoinGraph()
+    graph.add_ddl(DDL[0], namespace={"tenant": "acme", "database": "crm"})
+    graph.add_ddl(DDL[1], namespace={"tenant": "acme", "database": "sales"})
+
+    assert graph.path("customers", "orders", namespace={"tenant": "acme"}) == ["customers", "orders"]
+    assert graph.stats({"tenant": "acme"})["tables"] == 2
+    assert graph.path("customers", "orders", namespace={"tenant": "acme", "database": "crm"}) is None
+    assert graph.path("customers", "orders", namespace={"tenant": "globex"}) is None
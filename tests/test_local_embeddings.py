@@ -0,0 +1,86 @@
+"""Tests for the batching of `LocalEmbeddings`, with the ONNX model replaced by a fake encoder."""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from raxo.embeddings import local_embedding
+from raxo.embeddings.local_embedding import LocalEmbeddings, _Encoder
+
+
+class FakeEncoder:
+    """Embeds a text as [len(text)] and records the texts of each run."""
+
+    runs = []
+    gate = None
+    running = threading.Event()
+
+    def __init__(self, **config):
+        self.config = config
+
+    def encode(self, texts, batch_size):
+        FakeEncoder.running.set()
+        if FakeEncoder.gate is not None:
+            FakeEncoder.gate.wait(timeout=5)
+        FakeEncoder.runs.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+@pytest.fixture
+def embed(monkeypatch):
+    FakeEncoder.runs, FakeEncoder.gate, FakeEncoder.running = [], None, threading.Event()
+    monkeypatch.setattr(local_embedding, "_Encoder", FakeEncoder)
+    embedding = LocalEmbeddings("/models/fake", batch_size=8)
+    yield embedding
+    FakeEncoder.gate = None
+    embedding.close()
+
+
+def test_batches_are_length_sorted_and_bounded():
+    encoder = object.__new__(_Encoder)
+    encoder.max_batch_tokens = 12
+    encodings = [SimpleNamespace(ids=[0] * length) for length in (5, 1, 3, 1, 2, 6)]
+    batches = list(encoder.batches(encodings, batch_size=3))
+    assert sorted(index for batch in batches for index in batch) == list(range(6))
+    for batch in batches:
+        lengths = [len(encodings[index].ids) for index in batch]
+        assert lengths == sorted(lengths) and len(batch) <= 3
+        assert len(batch) * lengths[-1] <= 12 or len(batch) == 1
+    assert batches[0] == [1, 3, 4]
+
+
+def test_create_embeddings_keeps_the_input_order(embed):
+    assert embed.create_embeddings(["abc", "a", "ab"]) == [[3.0], [1.0], [2.0]]
+    assert embed.create_embeddings([]) == []
+    assert embed.stats["texts"] == 3
+
+
+def test_concurrent_calls_are_coalesced(embed):
+    FakeEncoder.gate = threading.Event()
+    texts = ["x" * length for length in range(1, 7)]
+    results = {}
+
+    def call(text):
+        results[text] = embed.create_embedding(text)
+
+    threads = [threading.Thread(target=call, args=(text,)) for text in texts]
+    threads[0].start()
+    assert FakeEncoder.running.wait(timeout=5)
+    for thread in threads[1:]:
+        thread.start()
+    # The first run is held until every other call is queued, so they join a single batch
+    while embed._queue.qsize() < len(texts) - 1:
+        threading.Event().wait(0.01)
+    FakeEncoder.gate.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert results == {text: [float(len(text))] for text in texts}
+    assert embed.stats == {"texts": 6, "batches": len(FakeEncoder.runs), "bulk_texts": 0}
+    assert len(FakeEncoder.runs) == 2
+
+
+def test_close_stops_the_batcher(embed):
+    assert embed.create_embedding("ab") == [2.0]
+    embed.close()
+    assert embed._batcher is None
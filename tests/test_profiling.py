@@ -0,0 +1,64 @@
+"""Tests for `raxo.utils.profiling.ProfilingHook`."""
+
+import pstats
+import time
+
+import pytest
+
+from raxo.utils.profiling import ProfilingHook
+from raxo.utils.tracing import Tracer
+
+
+def busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+def _ask(tracer, profile=True):
+    with tracer.span("ask", profile=profile):
+        busy_loop(0.1)
+
+
+def test_sample_mode_writes_collapsed_stacks(tmp_path):
+    profiler = ProfilingHook(output_dir=str(tmp_path), mode="sample", interval=0.001)
+    tracer = Tracer(hooks=[profiler])
+    _ask(tracer)
+    _ask(tracer, profile=False)
+    assert profiler.profiled == 1
+
+    (written,) = tmp_path.glob("ask-*.collapsed")
+    lines = written.read_text().splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("busy_loop" in line for line in lines)
+    assert profiler.hot_functions(5)[0]["function"].endswith("busy_loop")
+    with pytest.raises(ValueError):
+        profiler.write_stats(str(tmp_path / "all.prof"))
+
+    profiler.write_collapsed(str(tmp_path / "all.collapsed"))
+    assert (tmp_path / "all.collapsed").read_text().splitlines() == lines
+
+
+def test_cprofile_mode_writes_pstats(tmp_path):
+    profiler = ProfilingHook(output_dir=str(tmp_path), mode="cprofile", min_duration=0.05)
+    tracer = Tracer(hooks=[profiler])
+    _ask(tracer)
+    with tracer.span("ask", profile=True):
+        pass  # profiled but faster than min_duration, so not written
+    if profiler.skipped:
+        pytest.skip("another cProfile is active in this process")
+    assert profiler.profiled == 2
+
+    (written,) = tmp_path.glob("ask-*.prof")
+    assert any(name == "busy_loop" for _, _, name in pstats.Stats(str(written)).stats)
+    hot = {row["function"].split(" ")[0]: row for row in profiler.hot_functions(50)}
+    assert hot["busy_loop"]["calls"] == 1
+    profiler.write_stats(str(tmp_path / "all.prof"))
+    assert (tmp_path / "all.prof").exists()
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        ProfilingHook(mode="perf")
@@ -0,0 +1,47 @@
+"""Tests for `raxo.core.prompt_builder.PromptBuilder`."""
+
+from raxo.core import PromptBuilder
+from raxo.utils.prompts import NLQ_SYSTEM_PROMPT
+
+ORDERS = "CREATE TABLE orders (id INT, customer_id INT)"
+CUSTOMERS = "CREATE TABLE customers (id INT, name VARCHAR(50))"
+CALENDAR = "CREATE TABLE calendar (day DATE)"
+
+
+def test_retrieval_order_does_not_change_the_prompt():
+    builder = PromptBuilder()
+    first = builder.build("orders per customer", [ORDERS, CUSTOMERS], "MySQL")
+    second = builder.build("orders per customer", [CUSTOMERS, ORDERS, ORDERS], "MySQL")
+    assert first == second
+
+
+def test_prefix_does_not_change_with_the_question():
+    builder = PromptBuilder(pinned_schema=[CALENDAR])
+    first = builder.build("orders per day", [ORDERS], "MySQL")
+    second = builder.build("customers per day", [CUSTOMERS], "MySQL")
+    prefix = builder.static_prefix("MySQL")
+    assert first[0]["content"].startswith(prefix) and second[0]["content"].startswith(prefix)
+    # The pinned table extends the shared prefix, ahead of the retrieved ones
+    shared = prefix + first[0]["content"][len(prefix):].split(ORDERS)[0]
+    assert CALENDAR in shared and second[0]["content"].startswith(shared)
+    assert first[-1] == {"role": "user", "content": "orders per day"}
+
+
+def test_examples_and_values_follow_the_schema():
+    builder = PromptBuilder()
+    prompt = builder.build("sales in emea", [ORDERS], "MySQL", values="orders.region: 'EMEA'",
+                           examples=[{"question": "orders in apac", "sql": "SELECT * FROM orders"}])
+    system = prompt[0]["content"]
+    assert system.index(ORDERS) < system.index("'EMEA'") < system.index("SELECT * FROM orders")
+
+
+def test_describe_reports_the_static_prefix():
+    builder = PromptBuilder()
+    prompt = builder.build("orders per customer", [ORDERS], "MySQL")
+    description = builder.describe(prompt, "MySQL")
+    assert 0 < description["static_prefix_tokens"] < description["prompt_tokens_estimate"]
+
+
+def test_single_template_prompt_matches_the_builder_layout():
+    prompt = NLQ_SYSTEM_PROMPT.format(database="MySQL", table=ORDERS)
+    assert prompt.startswith(PromptBuilder().static_prefix("MySQL")) and prompt.rstrip().endswith(ORDERS)
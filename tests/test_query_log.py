@@ -0,0 +1,75 @@
+"""Tests for the query log and its replay."""
+
+import sqlite3
+
+from raxo.benchmarks.scenarios import build_raxo
+from raxo.replay import Replayer
+from raxo.testing.fakes import FakeLlm
+from raxo.utils.query_log import QueryLog, read_query_log
+from raxo.utils.tracing import Tracer
+
+DDL = "CREATE TABLE orders (id INT, amount DECIMAL(10, 2))"
+
+
+def _log_requests(path, count, **kwargs):
+    query_log = QueryLog(str(path), flush_interval=0.05, **kwargs)
+    tracer = Tracer(hooks=[query_log])
+    for index in range(count):
+        with tracer.span("ask") as span:
+            span.set_attributes(question=f"question {index}", sql=f"SELECT {index}")
+            with tracer.span("retrieve") as retrieve:
+                retrieve.set_attributes(ids=["orders"])
+        with tracer.span("llm"):
+            pass  # not a request kind, never recorded
+    query_log.close()
+    return query_log
+
+
+def test_jsonl_log_rotates_and_reads_back_in_order(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    query_log = _log_requests(path, 40, max_bytes=1024, backup_count=2)
+    assert query_log.stats() == {"written": 40, "dropped": 0, "queued": 0}
+    assert (tmp_path / "queries.jsonl.2").exists() and not (tmp_path / "queries.jsonl.3").exists()
+    records = list(read_query_log(str(path)))
+    # The oldest records were rotated out; the kept ones are in order
+    questions = [int(record["question"].split()[-1]) for record in records]
+    assert 0 < len(records) < 40 and questions == list(range(40 - len(records), 40))
+    assert records[-1]["kind"] == "ask" and records[-1]["outcome"] == "ok"
+    assert records[-1]["ids"] == ["orders"] and "retrieve" in records[-1]["stages"]
+
+
+def test_truncated_jsonl_line_is_skipped(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    _log_requests(path, 3)
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"kind": "ask", "quest')
+    assert len(list(read_query_log(str(path)))) == 3
+
+
+def test_sqlite_log_keeps_the_newest_records(tmp_path):
+    path = tmp_path / "queries.sqlite"
+    _log_requests(path, 10, max_records=4)
+    assert [record["sql"] for record in read_query_log(str(path))] == [f"SELECT {index}" for index in range(6, 10)]
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT COUNT(*) FROM queries").fetchone() == (4,)
+    connection.close()
+
+
+def test_replayer_reports_outcomes_and_sql_matches(tmp_path):
+    raxo = build_raxo(cache_size=1024)
+    raxo.llm = FakeLlm(responder=lambda prompt: '{"sql": "SELECT COUNT(*) FROM orders", "error": null}')
+    raxo.train(ddl=DDL)
+    records = [
+        {"ts": 100.0, "kind": "ask", "question": "how many orders", "sql": "SELECT COUNT(*) FROM orders", "duration_ms": 20},
+        {"ts": 100.01, "kind": "ask", "question": "how many orders", "sql": "SELECT 1", "duration_ms": 30},
+        {"ts": 100.02, "kind": "train", "ddl": DDL},
+        {"ts": 100.03, "kind": "ask", "question": None},
+    ]
+    report = Replayer(raxo, speed=0, concurrency=1).run(records)
+    assert report["requests"] == 2
+    assert report["outcomes"] == {"ok": 2}
+    assert report["sql_match_ratio"] == 0.5
+    assert report["cache_hit_ratio"]["sql"] == 0.5
+    assert report["recorded"]["count"] == 2
+    assert Replayer(raxo).run([]) == {"requests": 0}
+    assert raxo.tracer.hooks == []
@@ -0,0 +1,84 @@
+"""Tests for `raxo.utils.result_set.ResultSet`."""
+
+import datetime
+import json
+import sqlite3
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from raxo.utils.exceptions import ResultTooLarge
+from raxo.utils.result_set import ResultSet, json_default
+
+ROWS = [(index, f"name {index}", index * 1.5 if index % 3 else None) for index in range(500)]
+
+
+@pytest.fixture
+def cursor():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE t (id INTEGER, name TEXT, score REAL)")
+    connection.executemany("INSERT INTO t VALUES (?, ?, ?)", ROWS)
+    cursor = connection.execute("SELECT id, name, score FROM t ORDER BY id")
+    yield cursor
+    connection.close()
+
+
+def test_small_results_stay_in_memory(cursor):
+    result = ResultSet.fetch(cursor, fetch_size=64, spill_threshold=None)
+    assert not result.spilled and result == ROWS
+    assert result.columns == ["id", "name", "score"]
+
+
+def test_spilled_results_read_back_like_a_list(cursor, tmp_path):
+    result = ResultSet.fetch(cursor, fetch_size=64, spill_threshold=4096, spill_dir=str(tmp_path))
+    assert result.spilled and result._rows == []
+    assert len(result) == 500 and result == ROWS and list(result) == ROWS
+    assert result[0] == ROWS[0] and result[-1] == ROWS[-1] and result[130] == ROWS[130]
+    assert result[60:70] == ROWS[60:70] and result.page(495, 100) == ROWS[495:]
+    assert json.loads(json.dumps({"rows": result}, default=json_default))["rows"][1] == list(ROWS[1])
+    with pytest.raises(IndexError):
+        result[500]
+
+
+def test_close_releases_the_spill_file(cursor):
+    with ResultSet.fetch(cursor, fetch_size=64, spill_threshold=4096) as result:
+        spill_file = result._file
+        assert result[10] == ROWS[10]
+    assert spill_file.closed
+    with pytest.raises(ValueError):
+        result[300]
+
+
+def test_results_past_max_bytes_raise(cursor):
+    with pytest.raises(ResultTooLarge) as error:
+        ResultSet.fetch(cursor, fetch_size=64, spill_threshold=4096, max_bytes=16384, query="SELECT * FROM t")
+    assert error.value.query == "SELECT * FROM t"
+
+
+def test_statements_without_rows():
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE t (id INTEGER)")
+    result = ResultSet.fetch(connection.execute("INSERT INTO t VALUES (1)"))
+    assert len(result) == 0 and result.columns == [] and result == []
+    connection.close()
+
+
+def test_spilled_values_keep_their_types(tmp_path):
+    class Cursor:
+        description = [("amount",), ("at",), ("on",), ("span",), ("id",), ("blob",), ("note",)]
+
+        def __init__(self, rows):
+            self.rows = rows
+
+        def fetchmany(self, size):
+            batch, self.rows = self.rows[:size], self.rows[size:]
+            return batch
+
+    rows = [(Decimal("12.50"), datetime.datetime(2024, 5, 1, 8, 30, tzinfo=datetime.timezone.utc),
+             datetime.date(2024, 5, 1), datetime.timedelta(hours=1, microseconds=5),
+             uuid.UUID(int=index), bytes([index % 256, 0, 255]), f"line {index}\n{{\"__raxo__\": 1}}")
+            for index in range(200)]
+    result = ResultSet.fetch(Cursor(list(rows)), fetch_size=64, spill_threshold=4096, spill_dir=str(tmp_path))
+    assert result.spilled and result == rows
+    assert type(result[150][0]) is Decimal and result[150][1].tzinfo == datetime.timezone.utc
@@ -0,0 +1,25 @@
+"""Regression tests for `raxo.core.retrieval_depth.AdaptiveTopK`."""
+
+from raxo.core import AdaptiveTopK
+
+
+def test_relevant_tables_ahead_of_the_background_are_kept():
+    depth = AdaptiveTopK(min_k=1, max_k=5)
+    distances = [0.1, 0.11, 0.12] + [0.9 + index / 100 for index in range(17)]
+    assert depth.cutoff(distances) == 3
+
+
+def test_small_pools_keep_max_k():
+    depth = AdaptiveTopK(min_k=1, max_k=10)
+    assert depth.cutoff([0.1, 0.11, 0.12]) == 3
+    assert depth.cutoff([0.1, 0.11, 0.12, 0.9, 0.95]) == 5
+
+
+def test_select_only_trims_per_document_lists():
+    depth = AdaptiveTopK(min_k=1, max_k=1)
+    result = {"ids": [["a", "b"]], "documents": [["A", "B"]], "metadatas": [[{}, {}]], "distances": [[0.1, 0.9]],
+              "embeddings": None, "included": ["metadatas", "documents", "distances"]}
+    selected = depth.select(result)
+    assert selected["ids"] == [["a"]] and selected["distances"] == [[0.1]]
+    assert selected["included"] == ["metadatas", "documents", "distances"]
+    assert selected["embeddings"] is None
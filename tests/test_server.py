@@ -0,0 +1,53 @@
+"""Regression tests for the HTTP handling of `raxo.server.RaxoServer`."""
+
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+from raxo.benchmarks.scenarios import build_raxo
+from raxo.server import RaxoServer
+
+
+@pytest.fixture
+def server():
+    server = RaxoServer(build_raxo(), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.ready.wait(5)
+    yield server
+    server.shutdown(drain_timeout=1)
+    thread.join(5)
+
+
+def _post(connection, path, body):
+    connection.request("POST", path, body=json.dumps(body), headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_unknown_route_keeps_the_connection_usable(server):
+    connection = http.client.HTTPConnection(*server.address, timeout=5)
+    assert _post(connection, "/missing", {"ddl": "CREATE TABLE t (id INT)"})[0] == 404
+    assert _post(connection, "/train", {"ddl": "CREATE TABLE t (id INT)"})[0] == 200
+    connection.close()
+
+
+def test_negative_content_length_is_rejected(server):
+    with socket.create_connection(server.address, timeout=5) as client:
+        client.sendall(b"POST /ask HTTP/1.1\r\nHost: test\r\nContent-Length: -1\r\n\r\n")
+        response = client.makefile("rb").read()
+    assert response.startswith(b"HTTP/1.1 400")
+
+
+def test_pipeline_errors_are_server_errors(server):
+    def fail(*args, **kwargs):
+        raise ValueError("bug")
+
+    server.raxo.ask = fail
+    connection = http.client.HTTPConnection(*server.address, timeout=5)
+    assert _post(connection, "/ask", {"question": "how many orders"})[0] == 500
+    assert _post(connection, "/ask", {"question": "how many orders", "follow_ups": "many"})[0] == 400
+    connection.close()
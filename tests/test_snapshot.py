@@ -0,0 +1,32 @@
+"""Regression tests for `raxo.vector.snapshot`."""
+
+import pytest
+
+from raxo.utils.exceptions import ReadOnlyStore
+from raxo.vector.snapshot import SnapshotStore, SnapshotWriter
+
+
+def _write(path, space):
+    with SnapshotWriter(str(path)) as writer:
+        writer.write("ddl", "near", "CREATE TABLE near (id INT)", [10.0, 1.0], space=space)
+        writer.write("ddl", "aligned", "CREATE TABLE aligned (id INT)", [0.1, 0.0], space=space)
+    return SnapshotStore(str(path))
+
+
+def test_distances_use_the_recorded_space(tmp_path):
+    cosine = _write(tmp_path / "cosine", "cosine")
+    l2 = _write(tmp_path / "l2", "l2")
+    # Closest to "near" in L2, but pointing exactly like "aligned"
+    question = [10.0, 0.0]
+    assert cosine.get_ddl(question, n_results=1)["ids"] == [["aligned"]]
+    assert cosine.get_ddl(question, n_results=1)["distances"][0][0] == pytest.approx(0.0, abs=1e-6)
+    assert l2.get_ddl(question, n_results=1)["ids"] == [["near"]]
+    cosine.close()
+    l2.close()
+
+
+def test_writes_raise_read_only_store(tmp_path):
+    store = _write(tmp_path / "snapshot", "l2")
+    with pytest.raises(ReadOnlyStore):
+        store.add_ddl("CREATE TABLE t (id INT)", [0.0, 0.0])
+    store.close()
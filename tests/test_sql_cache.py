@@ -0,0 +1,57 @@
+"""Regression tests for the SQL cache of `raxo.core.base.Raxo`."""
+
+import json
+
+from raxo.benchmarks.scenarios import build_raxo
+from raxo.testing.fakes import FakeLlm, SQLiteDatabase
+
+DDL = "CREATE TABLE orders (id INT, amount INT)"
+
+
+def _build(responder):
+    database = SQLiteDatabase()
+    database.connect()
+    database.execute_script(f"{DDL}; INSERT INTO orders VALUES (1, 5);")
+    llm = FakeLlm(responder=responder)
+    raxo = build_raxo(database=database, execute_query=True, cache_size=1024)
+    raxo.llm = llm
+    raxo.train(ddl=DDL)
+    return raxo, llm
+
+
+def test_repaired_sql_is_cached():
+    def responder(prompt):
+        table = "orders" if "no such table" in prompt[-1]["content"] else "order_typo"
+        return json.dumps({"sql": f"SELECT COUNT(*) FROM {table}", "error": None})
+
+    raxo, llm = _build(responder)
+    for _ in range(3):
+        assert raxo.ask("how many orders") == [(1,)]
+    # One generation and one repair, then the repaired SQL is served from the cache
+    assert llm.calls == 2
+    assert raxo.repair_stats["failures"] == 1
+
+
+def test_failing_sql_is_not_cached():
+    raxo, llm = _build(lambda prompt: json.dumps({"sql": "SELECT * FROM missing", "error": None}))
+    raxo.repair_attempts = 0
+    raxo.ask("how many orders")
+    raxo.ask("how many orders")
+    assert llm.calls == 2
+    assert len(raxo.sql_cache) == 0
+
+
+def test_training_keeps_other_namespaces_cached():
+    raxo, llm = _build(lambda prompt: json.dumps({"sql": "SELECT COUNT(*) FROM orders", "error": None}))
+    acme, globex = raxo.with_namespace({"tenant": "acme"}), raxo.with_namespace({"tenant": "globex"})
+    acme.train(ddl=DDL)
+    globex.train(ddl=DDL)
+    acme.ask("how many orders")
+    globex.ask("how many orders")
+    assert llm.calls == 2
+
+    acme.train(documentation="Orders include cancelled ones")
+    acme.ask("how many orders")
+    globex.ask("how many orders")
+    # Only the trained tenant regenerates its SQL
+    assert llm.calls == 3
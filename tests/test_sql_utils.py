@@ -0,0 +1,38 @@
+"""Tests for `raxo.utils.sql_utils.parse_llm_output`."""
+
+from raxo.utils.sql_utils import parse_llm_output
+
+
+def test_plain_json():
+    result = parse_llm_output('{"sql": "SELECT 1", "error": null}')
+    assert result.ok and result.sql == "SELECT 1" and result.recovered_from is None
+
+
+def test_fenced_json():
+    result = parse_llm_output('Here you go:\n```json\n{"sql": "SELECT * FROM orders", "error": null}\n```')
+    assert result.sql == "SELECT * FROM orders" and result.recovered_from == "fenced"
+
+
+def test_fenced_and_bare_sql():
+    fenced = parse_llm_output("```sql\nSELECT COUNT(*) FROM orders;\n```")
+    bare = parse_llm_output("SELECT COUNT(*) FROM orders;")
+    assert fenced.sql == bare.sql == "SELECT COUNT(*) FROM orders"
+    assert fenced.recovered_from == bare.recovered_from == "bare_sql"
+
+
+def test_json_surrounded_by_prose():
+    result = parse_llm_output('Sure! {"sql": "SELECT name FROM t WHERE a = \'{x}\'", "error": null} Hope it helps.')
+    assert result.sql == "SELECT name FROM t WHERE a = '{x}'" and result.recovered_from == "embedded"
+
+
+def test_python_style_literals():
+    result = parse_llm_output("{'sql': 'SELECT * FROM t WHERE name = 'O'Brien'', 'error': None,}")
+    assert result.sql == "SELECT * FROM t WHERE name = 'O'Brien'" and result.error is None
+    assert result.recovered_from == "tolerant"
+
+
+def test_truncated_and_empty_responses_fail_with_a_reason():
+    assert parse_llm_output('{"sql": "SELECT * FROM ord').reason == "invalid_json"
+    assert parse_llm_output("   ").reason == "empty"
+    assert parse_llm_output("I cannot answer that.").reason == "no_json_object"
+    assert parse_llm_output("[1, 2]").reason == "not_an_object"
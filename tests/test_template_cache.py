@@ -0,0 +1,32 @@
+"""Regression tests for `raxo.core.template_cache`."""
+
+import json
+
+from raxo.benchmarks.scenarios import build_raxo
+from raxo.core.template_cache import SQLTemplate
+from raxo.testing.fakes import FakeLlm, SQLiteDatabase
+from raxo.utils.normalize import canonicalize
+
+
+def test_slot_bound_to_several_literals_is_rejected():
+    canonical = canonicalize("top orders of customer 5")
+    assert SQLTemplate.from_sql("SELECT * FROM orders WHERE customer_id = 5 LIMIT 5", canonical) is None
+    assert SQLTemplate.from_sql("SELECT * FROM orders WHERE customer_id = 5", canonical) is not None
+
+
+def test_failing_template_is_discarded():
+    database = SQLiteDatabase()
+    database.connect()
+    database.execute_script("CREATE TABLE orders (id INT, customer_id INT)")
+    llm = FakeLlm(responder=lambda prompt: json.dumps(
+        {"sql": "SELECT COUNT(*) FROM orders WHERE customer_id = " + prompt[-1]["content"].split()[-1],
+         "error": None}))
+    raxo = build_raxo(database=database, execute_query=True, cache_size=1024)
+    raxo.llm = llm
+    raxo.train(ddl="CREATE TABLE orders (id INT, customer_id INT)")
+
+    assert raxo.ask("orders of customer 5") == [(0,)]
+    assert raxo.template_cache.stats()["size"] == 1
+    database.execute_script("DROP TABLE orders")
+    raxo.ask("orders of customer 7")
+    assert raxo.template_cache.stats()["size"] == 0
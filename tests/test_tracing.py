@@ -0,0 +1,94 @@
+"""Tests for `raxo.utils.tracing`."""
+
+import threading
+
+import pytest
+
+from raxo.utils.tracing import MetricsHook, TraceHook, Tracer
+
+
+class _RecordingHook(TraceHook):
+    def __init__(self):
+        self.events = []
+
+    def on_start(self, span):
+        self.events.append(("start", span.name))
+
+    def on_end(self, span):
+        self.events.append(("end", span.name))
+
+
+def test_spans_nest_under_their_parent():
+    tracer = Tracer()
+    with tracer.span("ask") as root:
+        with tracer.span("embed") as child:
+            with tracer.span("http") as grandchild:
+                assert tracer.current_span is grandchild
+        assert tracer.current_span is root
+    assert tracer.current_span is None
+    assert root.parent is None and child.parent is root and grandchild.parent is child
+    assert grandchild.root is root
+    assert root.end is not None and root.duration >= child.duration >= grandchild.duration
+
+
+def test_threads_keep_separate_span_stacks():
+    tracer = Tracer()
+    ready, release = threading.Event(), threading.Event()
+    seen = {}
+
+    def worker():
+        with tracer.span("worker") as span:
+            seen["parent"] = span.parent
+            ready.set()
+            release.wait(5)
+
+    with tracer.span("main") as main:
+        thread = threading.Thread(target=worker)
+        thread.start()
+        ready.wait(5)
+        assert tracer.current_span is main
+        release.set()
+        thread.join(5)
+    assert seen["parent"] is None
+
+
+def test_hooks_see_starts_and_ends_in_order():
+    hook = _RecordingHook()
+    tracer = Tracer(hooks=[hook])
+    with tracer.span("ask"):
+        with tracer.span("embed"):
+            pass
+        with tracer.span("llm"):
+            pass
+    assert hook.events == [("start", "ask"), ("start", "embed"), ("end", "embed"), ("start", "llm"),
+                           ("end", "llm"), ("end", "ask")]
+
+
+def test_exceptions_are_recorded_and_reraised():
+    metrics = MetricsHook()
+    tracer = Tracer(hooks=[metrics])
+    with pytest.raises(ValueError):
+        with tracer.span("execute") as span:
+            raise ValueError("no such table")
+    assert isinstance(span.error, ValueError) and span.end is not None
+    assert tracer.current_span is None
+    assert metrics.snapshot()[("span_errors_total", "execute")] == 1
+
+
+def test_failing_hooks_do_not_break_the_request():
+    class Broken(TraceHook):
+        def on_end(self, span):
+            raise RuntimeError("hook bug")
+
+    tracer = Tracer(hooks=[Broken()])
+    with tracer.span("ask", question="q") as span:
+        span.incr("tokens", 3)
+    assert span.attributes == {"question": "q", "tokens": 3}
+
+
+def test_no_hooks_skips_dispatch(monkeypatch):
+    tracer = Tracer()
+    monkeypatch.setattr(tracer, "_dispatch", lambda *args: pytest.fail("dispatched without hooks"))
+    with tracer.span("ask") as span:
+        span.set("cache_hit", True)
+    assert span.attributes == {"cache_hit": True}
@@ -0,0 +1,47 @@
+"""Regression tests for `raxo.core.value_index.ColumnValueIndex` as used by Raxo."""
+
+from raxo.benchmarks.scenarios import build_raxo
+from raxo.core import ColumnValueIndex, JoinGraph
+from raxo.testing.fakes import SQLiteDatabase
+
+DDL = ("CREATE TABLE orders (id INT PRIMARY KEY, region VARCHAR(10), note VARCHAR(4000), "
+       "customer_id INT REFERENCES customers(id))")
+
+
+def test_compacted_ddl_is_harvested_as_written():
+    database = SQLiteDatabase()
+    database.connect()
+    database.execute_script(f"{DDL}; INSERT INTO orders VALUES (1, 'EMEA', 'left at the door', 7);")
+    graph = JoinGraph()
+    raxo = build_raxo(database=database, value_index=ColumnValueIndex(), join_graph=graph, compact_ddl=True)
+    raxo.train(ddl=DDL)
+
+    # VARCHAR(4000) is compacted to VARCHAR, which must not make the column look categorical
+    assert [key[-1] for key in raxo.value_index.columns] == ["region"]
+    assert graph.stats()["declared"] == 1
+
+
+def test_values_do_not_leak_between_namespaces():
+    database = SQLiteDatabase()
+    database.connect()
+    database.execute_script(f"{DDL}; INSERT INTO orders VALUES (1, 'EMEA', NULL, 7);")
+    raxo = build_raxo(database=database, value_index=ColumnValueIndex())
+    raxo.with_namespace({"tenant": "acme"}).train(ddl=DDL)
+
+    assert [match["value"] for match in raxo.value_index.match("orders in emea", namespace={"tenant": "acme"})] \
+        == ["EMEA"]
+    assert raxo.value_index.match("orders in emea", namespace={"tenant": "globex"}) == []
+
+
+def test_values_are_matched_from_narrower_namespaces():
+    index = ColumnValueIndex()
+    index.add_values("orders", "region", ["EMEA"], namespace={"tenant": "acme", "database": "sales"})
+    index.add_values("orders", "region", ["APAC"], namespace={"tenant": "acme"})
+
+    assert [match["value"] for match in index.match("orders in emea", namespace={"tenant": "acme"})] == ["EMEA"]
+    assert [match["value"] for match in index.match("orders in apac or emea")] == ["APAC", "EMEA"]
+    assert index.match("orders in apac", namespace={"tenant": "acme", "database": "sales"}) == []
+    assert index.match("orders in emea", namespace={"tenant": "globex"}) == []
+
+    index.remove_table("orders", namespace={"tenant": "acme", "database": "sales"})
+    assert index.match("orders in emea", namespace={"tenant": "acme"}) == []